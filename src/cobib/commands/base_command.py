@@ -9,7 +9,7 @@ import os
 import shlex
 import sys
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type
+from typing import Iterator, List, Optional, Type
 
 from rich.console import Console, ConsoleRenderable
 from rich.prompt import Prompt, PromptBase, PromptType
@@ -17,6 +17,8 @@ from textual.app import App
 from textual.widget import Widget
 
 from cobib.config import Event, config
+from cobib.database import Database
+from cobib.database.shards import Shards
 from cobib.ui.components import ArgumentParser as ArgumentParser
 from cobib.utils.rel_path import RelPath
 
@@ -146,6 +148,18 @@ class Command(ABC):
         """
         return []
 
+    def stream_porcelain(self) -> Iterator[str]:
+        """Renders the command results in "porcelain" mode line by line.
+
+        This method is used by the command-line interface when the `--porcelain` argument has been
+        provided. By default, it yields the lines returned by `render_porcelain`. Commands which
+        produce many lines may overwrite it in order to yield the lines while producing them.
+
+        Yields:
+            The lines of output.
+        """
+        yield from self.render_porcelain()
+
     def render_rich(self) -> Optional[ConsoleRenderable]:
         """Renders the command results as a `rich` object.
 
@@ -177,6 +191,10 @@ class Command(ABC):
 
         This method uses the parsed arguments (`largs`) to include command execution information in
         the generated commit message.
+        Only the database file gets staged. For sharded databases (see `cobib.database.shards`),
+        only the shard files which were written by `cobib.database.Database.save` get staged.
+        During a `cobib.database.Database.transaction`, the commit is deferred until the end of the
+        transaction.
 
         Args:
             force: whether to ignore the configuration setting. This option is mainly used by the
@@ -206,12 +224,39 @@ class Command(ABC):
 
         msg = Event.PreGitCommit.fire(msg, args) or msg
 
+        if Database.defer_commit(msg):
+            return
+
+        LOGGER.debug("Auto-commit to git from %s command.", self.name)
+        self.git_commit(msg)
+
+    @staticmethod
+    def git_commit(msg: str) -> None:
+        """Commits the changes of the database to git.
+
+        This is used by `Command.git` and by `cobib.database.Database.transaction` (which combines
+        multiple deferred commits into a single one). It does not check whether the git-integration
+        is enabled. Any journaled changes get compacted into the database file first (see
+        `cobib.database.journal`).
+
+        Args:
+            msg: the commit message.
+        """
+        # any journaled changes must be part of the commit
+        Database.compact()
+
+        file = RelPath(config.database.file).path
+        root = file.parent
+
+        # for sharded databases, only the changed shard files need to be staged
+        written = Database.pop_written_files()
+        staged = written if Shards.is_sharded(file) and written else [file]
+
         commands = [
             f"cd {root}",
-            f"git add -- {file}",
+            f"git add -- {' '.join(shlex.quote(str(path)) for path in staged)}",
             f"git commit --no-gpg-sign --quiet --message {shlex.quote(msg)}",
         ]
-        LOGGER.debug("Auto-commit to git from %s command.", self.name)
         os.system("; ".join(commands))
 
         Event.PostGitCommit.fire(root, file)
@@ -20,6 +20,13 @@ cobib init --git
 If you have not run the first command yet, you can directly initialize the database *and* the
 git-integration by only running the second command.
 
+If `cobib.config.config.DatabaseConfig.file` points to a directory, you can initialize a sharded
+database (see `cobib.database.shards`) instead, whose entries are bucketed by a hash of their label
+or by their year:
+```
+cobib init --shards hash
+```
+
 .. warning::
    You can**not** run this command from the TUI, because the database must have already been
    initialized *before* you can start the TUI in the first place.
@@ -39,6 +46,7 @@ from textual.app import App
 from typing_extensions import override
 
 from cobib.config import Event, config
+from cobib.database.shards import BUCKETS, Shards
 from cobib.utils.rel_path import RelPath
 
 from .base_command import ArgumentParser, Command
@@ -53,6 +61,8 @@ class InitCommand(Command):
     This command can parse the following arguments:
 
         * `-g`, `--git`: initializes the git-integration.
+        * `-s`, `--shards`: initializes a sharded database using the given bucket (`hash` or
+          `year`).
     """
 
     name = "init"
@@ -78,6 +88,12 @@ class InitCommand(Command):
     def init_argparser(cls) -> None:
         parser = ArgumentParser(prog="init", description="Init subcommand parser.")
         parser.add_argument("-g", "--git", action="store_true", help="initialize git repository")
+        parser.add_argument(
+            "-s",
+            "--shards",
+            choices=BUCKETS,
+            help="initialize a sharded database bucketed by label hash or by year",
+        )
         cls.argparser = parser
 
     @override
@@ -110,8 +126,13 @@ class InitCommand(Command):
             LOGGER.debug('Creating path for database file: "%s"', self.root)
             self.root.mkdir(parents=True, exist_ok=True)
 
-            LOGGER.debug('Creating empty database file: "%s"', self.file)
-            open(self.file, "w", encoding="utf-8").close()  # pylint: disable=consider-using-with
+            if self.largs.shards is not None:
+                LOGGER.debug('Creating empty sharded database: "%s"', self.file)
+                Shards.create(self.file, self.largs.shards)
+            else:
+                LOGGER.debug('Creating empty database file: "%s"', self.file)
+                # pylint: disable=consider-using-with
+                open(self.file, "w", encoding="utf-8").close()
 
         if self.largs.git:
             if not config.database.git:
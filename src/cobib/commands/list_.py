@@ -22,6 +22,32 @@ cobib list --sort year
 ```
 (In the TUI, this is available via the `s` key, by default.)
 
+You can also sort by multiple fields, where each subsequent field is used to break the ties of the
+previous ones. Prefixing a field with a `-` sorts it in descending order:
+```
+cobib list --sort year,author,-title
+```
+Note, that a single descending field must be passed like `--sort=-title` such that it does not get
+mistaken for an option.
+
+Numeric field values (like `year` or `volume`) are sorted numerically, all other values are sorted
+case-insensitively. Entries which lack a field are listed first.
+
+You can restrict the output to a page of the (filtered and sorted) entries:
+```
+cobib list --sort year --reverse --limit 20
+cobib list --sort year --reverse --limit 20 --offset 20
+```
+When a limit is given, only the first entries are selected (via a heap, when sorting) rather than
+sorting all of them. In porcelain mode, the `--json` option lists one JSON object per entry (rather
+than `::`-separated columns):
+```
+cobib --porcelain list --json --limit 20
+```
+When neither sorting nor reversing the entries, the porcelain lines are printed while the matching
+entries are being accessed, such that these are not collected by the command. Note, that a filter
+still computes the set of all matching labels upfront.
+
 
 ### Filters
 
@@ -63,6 +89,8 @@ There are some aspects to take note of here:
 1. By default, multiple filters are combined with logical `AND`s. You can specify `--or` to
    overwrite this to logical `OR`s. This will apply to all filters of the specified command.
 2. All entries are treated as `str`. Thus, `++year 20` will match anything *containing* `20`.
+3. Fields which share their name with one of the options of this command (for example `limit` or
+   `json`) do not get any filter arguments since these would collide with the option.
 
 As of version v3.2.0, the filter arguments are evaluated as regex patterns allowing you to do things
 like the following:
@@ -71,6 +99,17 @@ cobib list ++label "\D+_\d+"
 ```
 This will list all entries whose labels are formatted as `"<non-digit characters>_<digits>"`.
 
+Filter values of the form `start..end` are **not** treated as regex patterns but as inclusive
+numeric ranges, either bound of which may be omitted:
+```
+cobib list ++year 2015..2020
+cobib list --year ..2010
+```
+The first command lists all entries published between 2015 and 2020 while the second one excludes
+all entries published before (and including) 2010. Entries whose field is not numeric never lie
+within a range. Since `search`, `modify` and `export` use the same filters, this works for them,
+too.
+
 As of version v4.0.0, you can make the filter matching case-**in**sensitive via the
 `cobib.config.config.ListCommandConfig.ignore_case` setting which defaults to being `False`.
 Besides this setting, you can always overwrite its value on the command line with the
@@ -93,10 +132,24 @@ cobib list --no-ignore-case ++author rossmannek
 from __future__ import annotations
 
 import argparse
+import json
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 from copy import copy
-from typing import Any, Dict, List, Optional, Set, Tuple, Type
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
 
 from rich.console import Console, ConsoleRenderable
 from rich.prompt import PromptBase, PromptType
@@ -107,6 +160,7 @@ from typing_extensions import override
 
 from cobib.config import Event, config
 from cobib.database import Database, Entry
+from cobib.database.filter_plan import FilterPlan
 from cobib.ui.components import ListView
 
 from .base_command import ArgumentParser, Command
@@ -134,13 +188,43 @@ class ListCommand(Command):
           overwrites the `cobib.config.config.ListCommandConfig.ignore_case` setting.
         * `-x`, `--or`: if specified, multiple filters will be combined with logical OR rather than
           the default logical AND.
+        * `--limit`: the maximum number of entries to list.
+        * `--offset`: the number of (filtered and sorted) entries to skip before listing any.
+        * `--json`: if specified, the porcelain output contains one JSON object per entry instead of
+          `::`-separated columns.
         * in addition to the options above, [Filter keyword arguments](#filters) are registered at
-          runtime based on the fields available in the database. Please refer that section or the
-          output of `cobib list --help` for more information.
+          runtime based on the fields available in the database (see
+          `cobib.database.Database.fields`). Please refer that section or the output of
+          `cobib list --help` for more information.
     """
 
     name = "list"
 
+    _argparser_fields: FrozenSet[str] = frozenset()
+    """The fields for which filter arguments were registered in the current `argparser`."""
+
+    _reserved_fields: FrozenSet[str] = frozenset(
+        {
+            "help",
+            "sort",
+            "reverse",
+            "ignore-case",
+            "ignore_case",
+            "no-ignore-case",
+            "or",
+            "OR",
+            "limit",
+            "offset",
+            "json",
+        }
+    )
+    """The names (and destinations) of the options which are not filters. Fields with any of these
+    names do not get any filter arguments registered since these would collide with the options."""
+
+    _argparser_schema_version: int = -1
+    """The `cobib.database.Database.schema_version` against which the current `argparser` was last
+    validated."""
+
     @override
     def __init__(
         self,
@@ -150,19 +234,44 @@ class ListCommand(Command):
     ) -> None:
         super().__init__(*args, console=console, prompt=prompt)
 
-        self.entries: List[Entry] = []
-        """A list of entries, filtered and sorted according to the provided command arguments."""
+        self._entries: List[Entry] = []
+
+        self._pending_labels: Optional[Iterator[str]] = None
+        """The labels of the entries which `execute` did not access yet (see `stream_porcelain`)."""
 
         self.columns: List[str] = []
         """A list of (key) columns to be included when rendering the results."""
 
+        self.filter_plan: Optional[FilterPlan] = None
+        """The compiled filter (see `cobib.database.filter_plan.FilterPlan`). This is only available
+        once `filter_entries` has been called."""
+
+    @property
+    def entries(self) -> List[Entry]:
+        """A list of entries, filtered and sorted according to the provided command arguments."""
+        if self._pending_labels is not None:
+            bib = Database()
+            self._entries.extend(bib[label] for label in self._pending_labels)
+            self._pending_labels = None
+        return self._entries
+
+    @entries.setter
+    def entries(self, entries: List[Entry]) -> None:
+        self._pending_labels = None
+        self._entries = entries
+
     @override
     @classmethod
     def init_argparser(cls) -> None:
         parser = ArgumentParser(
             prog="list", description="List subcommand parser.", prefix_chars="+-"
         )
-        parser.add_argument("-s", "--sort", help="specify column along which to sort the list")
+        parser.add_argument(
+            "-s",
+            "--sort",
+            help="specify the comma-separated columns along which to sort the list (prefix a "
+            "column with '-' to sort it in descending order)",
+        )
         parser.add_argument(
             "-r", "--reverse", action="store_true", help="reverses the listing order"
         )
@@ -189,11 +298,23 @@ class ListCommand(Command):
             action="store_true",
             help="concatenate filters with OR instead of AND",
         )
-        unique_keys: Set[str] = {"label"}
+        parser.add_argument("--limit", type=int, help="the maximum number of entries to list")
+        parser.add_argument(
+            "--offset", type=int, default=0, help="the number of entries to skip before listing"
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="list one JSON object per entry in porcelain mode"
+        )
         LOGGER.debug("Gathering possible filter arguments.")
-        for entry in Database().values():
-            unique_keys.update(entry.data.keys())
-        for key in sorted(unique_keys):
+        fields = Database().fields
+        for key in sorted(fields | {"label"}):
+            if key in cls._reserved_fields:
+                LOGGER.warning(
+                    "Not registering the filter arguments of the '%s' field because they would "
+                    "collide with the options of the list command.",
+                    key,
+                )
+                continue
             parser.add_argument(
                 "++" + key, type=str, action="append", help="include elements with matching " + key
             )
@@ -202,6 +323,22 @@ class ListCommand(Command):
             )
 
         cls.argparser = parser
+        cls._argparser_fields = fields
+        cls._argparser_schema_version = Database().schema_version
+
+    @override
+    @classmethod
+    def _get_argparser(cls) -> ArgumentParser:
+        # the filter arguments need to be refreshed whenever new fields occur in the database but
+        # the fields only need to be compared when the schema changed
+        bib = Database()
+        if hasattr(cls, "argparser") and cls._argparser_schema_version != bib.schema_version:
+            if cls._argparser_fields != bib.fields:
+                LOGGER.debug("Refreshing the filter arguments.")
+                cls.init_argparser()
+            else:
+                cls._argparser_schema_version = bib.schema_version
+        return super()._get_argparser()
 
     @override
     @classmethod
@@ -216,17 +353,31 @@ class ListCommand(Command):
 
         Event.PreListCommand.fire(self)
 
-        filtered_entries, filtered_keys = self.filter_entries()
-
-        self.entries = self._sort_entries(filtered_entries, self.largs.sort, self.largs.reverse)
+        filtered_keys = self._compile_filter()
+
+        offset = max(self.largs.offset, 0)
+        limit = None if self.largs.limit is None else offset + max(self.largs.limit, 0)
+        if self.largs.sort is None and not self.largs.reverse:
+            # the entries only get accessed once they are needed (see `stream_porcelain`)
+            self.entries = []
+            self._pending_labels = islice(self._matching_labels(), offset, limit)
+        else:
+            labels = self._sort_labels(
+                self._matching_labels(), self.largs.sort, self.largs.reverse, limit=limit
+            )[offset:]
+            # only the listed entries get accessed
+            bib = Database()
+            self.entries = [bib[label] for label in labels]
 
         # construct list of columns to be displayed
         self.columns = copy(config.commands.list_.default_columns)
         LOGGER.debug("Listing the default columns: %s", str(self.columns))
-        # display the column along which was sorted
-        if self.largs.sort and self.largs.sort not in self.columns:
-            LOGGER.debug("Appending the column which is sorted by: %s", str(self.largs.sort))
-            self.columns.append(self.largs.sort)
+        # display the columns along which was sorted
+        if self.largs.sort:
+            for field, _ in self._parse_sort(self.largs.sort):
+                if field not in self.columns:
+                    LOGGER.debug("Appending the column which is sorted by: %s", field)
+                    self.columns.append(field)
         # also display the keys which were used to filter
         LOGGER.debug("Extendings the columns which are filtered by: %s", str(filtered_keys))
         self.columns.extend(col for col in filtered_keys if col not in self.columns)
@@ -237,8 +388,10 @@ class ListCommand(Command):
         """The filtering method.
 
         This method implements the actual filtering routine. Based on the arguments provided to this
-        command, this method will iterate the database and return those entries which match the
-        specified filter.
+        command, this method will return those entries of the database which match the specified
+        filter. The filter is compiled into a `filter_plan` once which gets evaluated on the
+        `cobib.database.Database.field_index` and yields the same results as
+        `cobib.database.Entry.matches`.
 
         Returns:
             A pair indicating the matching entries. The first object is the list of matching entries
@@ -246,13 +399,26 @@ class ListCommand(Command):
             filtered on. This can be used (for example) to include these keys during the result
             rendering.
         """
+        filtered_keys = self._compile_filter()
+        bib = Database()
+        for label in self._matching_labels():
+            LOGGER.debug('Entry "%s" matches the filter.', label)
+            self.entries.append(bib[label])
+        return self.entries, filtered_keys
+
+    def _compile_filter(self) -> Set[str]:
+        """Compiles the `filter_plan` from the arguments provided to this command.
+
+        Returns:
+            The set of keys which are filtered on.
+        """
         LOGGER.debug("Constructing filter.")
 
         filtered_keys: Set[str] = set()
         _filter: Dict[Tuple[str, bool], List[Any]] = defaultdict(list)
 
         for key, val in self.largs.__dict__.items():
-            if key in ["OR", "sort", "reverse", "ignore_case"] or val is None:
+            if key in self._reserved_fields or val is None:
                 # ignore special arguments
                 continue
 
@@ -283,57 +449,191 @@ class ListCommand(Command):
             "The entry matching will be performed case %ssensitive", "in" if ignore_case else ""
         )
 
-        for key, entry in Database().items():
-            if entry.matches(_filter, self.largs.OR, ignore_case):
-                LOGGER.debug('Entry "%s" matches the filter.', key)
-                self.entries.append(entry)
+        self.filter_plan = FilterPlan(_filter, self.largs.OR, ignore_case)
 
-        return self.entries, filtered_keys
+        return filtered_keys
+
+    def _matching_labels(self) -> Iterator[str]:
+        """Yields the labels of the entries which match the `filter_plan` in the database order.
+
+        Yields:
+            The matching labels.
+        """
+        assert self.filter_plan is not None
+        bib = Database()
+        if not self.filter_plan.clauses:
+            yield from bib.keys()
+            return
+        matching = bib.field_index.filter(self.filter_plan)
+        LOGGER.debug("%d entries match the filter.", len(matching))
+        for label in bib.keys():
+            if label in matching:
+                yield label
 
     @staticmethod
-    def _sort_entries(
-        entries: List[Entry], sort: Optional[str] = None, reverse: bool = False
-    ) -> List[Entry]:
+    def _sort_labels(
+        labels: Iterable[str],
+        sort: Optional[str] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[str]:
         """The sorting method.
 
-        This method sorts the provided entries according to the requested key and order.
+        This method sorts the labels of the provided entries according to the requested keys and
+        order. The sorting is performed on the ranks of the field values which are cached by the
+        `cobib.database.Database.field_index` (see `cobib.database.field_index.FieldIndex.sort`).
+
+        When a `limit` is given, only that many labels are retained while consuming the provided
+        ones. In particular, the first labels are selected via a heap rather than by sorting all of
+        them.
 
         Args:
-            entries: the list of entries to be sorted.
-            sort: the optional key by which to sort.
+            labels: the labels of the entries to be sorted. These must be part of the `Database`.
+            sort: the optional comma-separated fields by which to sort. A field prefixed with a `-`
+                gets sorted in descending order.
             reverse: whether or not to sort in reverse order.
+            limit: the optional maximum number of labels to return.
 
         Returns:
-            The sorted list of entries.
+            The sorted list of labels.
         """
         if reverse:
             LOGGER.debug("Reversing the entry order.")
 
         if sort is None:
             if reverse:
-                return entries[::-1]
-            return entries
+                # only the last labels need to be retained
+                return list(deque(labels, maxlen=limit))[::-1]
+            return list(islice(labels, limit))
 
         LOGGER.debug("Sorting entries by key '%s'.", sort)
 
-        sorted_entries: List[Entry] = sorted(
-            entries, reverse=reverse, key=lambda entry: entry.stringify().get(str(sort), "")
-        )
+        keys = ListCommand._parse_sort(sort)
+        return Database().field_index.sort(labels, keys, reverse=reverse, limit=limit)
+
+    @staticmethod
+    def _parse_sort(sort: str) -> List[Tuple[str, bool]]:
+        """Parses the value of the `--sort` argument.
+
+        Args:
+            sort: the comma-separated fields by which to sort, each optionally prefixed with a `-`.
 
-        return sorted_entries
+        Returns:
+            The pairs of fields and whether to sort by them in descending order.
+        """
+        keys: List[Tuple[str, bool]] = []
+        for field in sort.split(","):
+            field = field.strip()
+            if field.startswith("-"):
+                keys.append((field[1:], True))
+            elif field:
+                keys.append((field, False))
+        return keys
+
+    def patch_labels(
+        self, labels: Sequence[str], changes: Dict[str, Optional[str]]
+    ) -> Optional[List[str]]:
+        """Applies changes of the database to labels which were listed previously.
+
+        This avoids filtering and sorting the entire database anew when only a few entries have
+        changed since the labels were listed by a command with the same arguments as this one. The
+        changed entries get removed and those which (still) match the filter get inserted at the
+        positions at which `execute` would list them.
+
+        Args:
+            labels: the labels listed previously by a command with the same arguments.
+            changes: the changes of the database since then (see
+                `cobib.database.Database.pop_changes`).
+
+        Returns:
+            The updated list of labels or `None` if the labels cannot be patched. This is the case
+            when `--limit` or `--offset` are used because entries may need to move into or out of
+            the listed range. It is also the case when any hooks are subscribed to the
+            `cobib.config.event.Event.PreListCommand` or `cobib.config.event.Event.PostListCommand`
+            events, because these would not fire.
+        """
+        if self.largs.limit is not None or self.largs.offset:
+            return None
+        if Event.PreListCommand in config.events or Event.PostListCommand in config.events:
+            return None
+
+        self._compile_filter()
+        assert self.filter_plan is not None
+        bib = Database()
+        changed = [
+            label
+            for label in dict.fromkeys(changes.values())
+            if label is not None and label in bib.keys()
+        ]
+        stale = set(changes) | set(changed)
+        patched = [label for label in labels if label not in stale]
+        matching = [
+            label
+            for label in changed
+            if not self.filter_plan.clauses or self.filter_plan.matches(bib[label])
+        ]
+        LOGGER.debug("Patching %d changed entries into the listed ones.", len(changed))
+        if not matching:
+            return patched
+
+        # the position in the database breaks the ties of the sort order
+        positions = {label: idx for idx, label in enumerate(bib.keys())}
+        sort_keys = self._parse_sort(self.largs.sort) if self.largs.sort else None
+        reverse = self.largs.reverse
+
+        def key(label: str) -> Tuple[Any, ...]:
+            position = positions[label]
+            if sort_keys is None:
+                return (-position if reverse else position,)
+            rank = bib.field_index.rank(label, sort_keys)
+            # the reversed sort order retains the order of ties (see `sorted`)
+            return (tuple(-r for r in rank) if reverse else rank, position)
+
+        for label in matching:
+            label_key = key(label)
+            low, high = 0, len(patched)
+            while low < high:
+                mid = (low + high) // 2
+                if key(patched[mid]) < label_key:
+                    low = mid + 1
+                else:
+                    high = mid
+            patched.insert(low, label)
+        return patched
 
     @override
     def render_porcelain(self) -> List[str]:
-        output: List[str] = []
+        return list(self.stream_porcelain())
 
-        output.append("::".join(self.columns))
+    @override
+    def stream_porcelain(self) -> Iterator[str]:
+        """Renders the command results in "porcelain" mode line by line.
 
-        for entry in self.entries:
-            stringified: Dict[str, str] = entry.stringify()
+        When neither `--sort` nor `--reverse` were requested, the entries get accessed only while
+        their lines are being yielded and they are not collected in `entries`. Thus, the listed
+        entries are no longer available afterwards in this case.
 
-            output.append("::".join(stringified.get(col, "") for col in self.columns))
+        Yields:
+            The lines of output.
+        """
+        if not self.largs.json:
+            yield "::".join(self.columns)
+
+        entries: Iterable[Entry]
+        if self._pending_labels is None:
+            entries = self.entries
+        else:
+            labels, self._pending_labels = self._pending_labels, None
+            bib = Database()
+            entries = (bib[label] for label in labels)
+
+        for entry in entries:
+            stringified: Dict[str, str] = entry.stringify()
 
-        return output
+            if self.largs.json:
+                yield json.dumps({col: stringified.get(col, "") for col in self.columns})
+            else:
+                yield "::".join(stringified.get(col, "") for col in self.columns)
 
     @override
     def render_rich(self) -> ConsoleRenderable:
@@ -351,16 +651,11 @@ class ListCommand(Command):
 
     @override
     def render_textual(self) -> ListView:
-        textual_table = ListView()
-
-        for col in self.columns:
-            textual_table.add_column(col, width=None)
+        columns = list(self.columns)
 
-        for entry in self.entries:
-            stringified: Dict[str, str] = entry.stringify(markup=True)
-
-            textual_table.add_row(
-                *(Text.from_markup(stringified.get(col, "")) for col in self.columns)
-            )
+        def render_row(label: str) -> List[Text]:
+            stringified: Dict[str, str] = Database()[label].stringify(markup=True)
+            return [Text.from_markup(stringified.get(col, "")) for col in columns]
 
-        return textual_table
+        # the rows only get rendered once they are scrolled into view
+        return ListView([entry.label for entry in self.entries], columns, render_row)
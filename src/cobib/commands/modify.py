@@ -264,7 +264,7 @@ class ModifyCommand(Command):
                 entry = bib[label]
                 local_value = evaluate_as_f_string(value, {"label": label, **entry.data.copy()})
 
-                if hasattr(entry, field):
+                if field in Entry.PROPERTIES:
                     prev_value = getattr(entry, field, None)
                 else:
                     prev_value = entry.data.get(field, None)
@@ -308,7 +308,7 @@ class ModifyCommand(Command):
                     )
                     continue
 
-                if hasattr(entry, field):
+                if field in Entry.PROPERTIES:
                     if self.largs.dry:
                         LOGGER.info(
                             "%s: changing field '%s' from %s to %s",
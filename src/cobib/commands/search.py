@@ -31,6 +31,43 @@ cobib search --context 4 Einstein
 You can also permanently change the default value via the
 `cobib.config.config.SearchCommandConfig.context` setting.
 
+The associated files of multiple entries get searched concurrently. You can limit the number of
+entries which are searched at the same time via the `--jobs` option (`-j` for short):
+```
+cobib search --jobs 1 Einstein
+```
+Its default value is configured via the `cobib.config.config.SearchCommandConfig.jobs` setting.
+The results are always reported in the order of the entries, irrespective of this setting.
+
+### Ranked search
+
+By default, the results are reported in the order of your database. With the `--ranked` argument,
+the entries are instead ordered by their relevance to the query:
+```
+cobib search --ranked quantum error correction
+```
+In this mode, the query is split into words which are looked up in an index of the fields configured
+via `cobib.config.config.SearchCommandConfig.ranked_fields` (see `cobib.database.search_index`). The
+entries get scored using [Okapi BM25](https://en.wikipedia.org/wiki/Okapi_BM25) and only the top
+entries are reported. Their number can be changed via the `--limit` option and its default value is
+configured via the `cobib.config.config.SearchCommandConfig.ranked_limit` setting. A ranked search
+is always case *in*sensitive and reports the lines containing any of the query words as its matches.
+
+### Fuzzy search
+
+With the `--fuzzy` argument, the query is interpreted as approximate words rather than regex
+patterns. This finds entries even if you misspell a name:
+```
+cobib search --fuzzy Einstien
+```
+In this mode, the words of the query are compared to the words of the fields configured via
+`cobib.config.config.SearchCommandConfig.fuzzy_fields` based on the character trigrams they share
+(see `cobib.database.trigram_index`). The entries are ordered by their similarity to the query and
+only those whose similarity reaches a threshold are reported. You can change this threshold via the
+`--threshold` option and its default value is configured via the
+`cobib.config.config.SearchCommandConfig.fuzzy_threshold` setting. A fuzzy search reports the lines
+containing any of the matched words as its matches.
+
 Finally, you can also combine the search with coBib's filtering mechanism to narrow your search down
 to a subset of your database:
 ```
@@ -47,6 +84,16 @@ You can configure the tool which is used to perform this search via the
 
 If you do not want to search through associated files, you can specify the `--skip-files` argument.
 
+If you configure `cobib.config.config.SearchCommandConfig.text_cache`, the text of associated files
+gets extracted once and cached (see `cobib.utils.text_cache`). Cached texts are invalidated
+automatically whenever the original file changes. Should you ever need to, you can extract the texts
+anew via the `--rebuild-text-cache` argument. In this case, the query may be omitted:
+```
+cobib search --rebuild-text-cache
+```
+Without any filters, this also removes the cached texts of files which are no longer associated with
+any entry.
+
 ### TUI
 
 You can also trigger this command from the `cobib.ui.tui.TUI`.
@@ -60,7 +107,10 @@ from __future__ import annotations
 
 import argparse
 import logging
-from typing import List, Type
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Type
 
 from rich.console import Console, ConsoleRenderable
 from rich.prompt import PromptBase, PromptType
@@ -71,8 +121,11 @@ from typing_extensions import override
 
 from cobib import __version__
 from cobib.config import Event, config
-from cobib.database import Entry
+from cobib.database import Database, Entry
 from cobib.ui.components import SearchView
+from cobib.utils.grep import grep_files
+from cobib.utils.rel_path import RelPath
+from cobib.utils.text_cache import TextCache
 
 from .base_command import ArgumentParser, Command
 from .list_ import ListCommand
@@ -98,6 +151,21 @@ class SearchCommand(Command):
           the `-C` option of `grep`. You can configure the default value via the
           `cobib.config.config.SearchCommandConfig.context` setting.
         * `--skip-files`: if specified, associated files will **not** be searched.
+        * `-j`, `--jobs`: the maximum number of entries whose associated files get searched
+          concurrently. You can configure the default value via the
+          `cobib.config.config.SearchCommandConfig.jobs` setting.
+        * `--ranked`: if specified, the entries are ordered by their relevance to the query (see
+          `cobib.database.search_index`) and only the top entries are reported.
+        * `--limit`: the maximum number of entries reported by a ranked search. You can configure
+          the default value via the `cobib.config.config.SearchCommandConfig.ranked_limit` setting.
+        * `--fuzzy`: if specified, the entries are found by the similarity of their words to the
+          query (see `cobib.database.trigram_index`). This cannot be combined with `--ranked`.
+        * `--threshold`: the minimum similarity of the entries reported by a fuzzy search. You can
+          configure the default value via the
+          `cobib.config.config.SearchCommandConfig.fuzzy_threshold` setting.
+        * `--rebuild-text-cache`: if specified, the cached texts of the associated files get
+          extracted anew before searching (see `cobib.utils.text_cache`). The query may be omitted
+          in this case.
         * in addition to the above, you can add `filters` to narrow the search down to a subset of
           your database. For more information refer to `cobib.commands.list_`.
     """
@@ -125,11 +193,15 @@ class SearchCommand(Command):
         self.hits: int = 0
         """The number of search hits detected by this command."""
 
+        self.scores: List[float] = []
+        """The relevance scores (or similarities) of the entries found by a ranked (or fuzzy)
+        search. This list is empty for any other search."""
+
     @override
     @classmethod
     def init_argparser(cls) -> None:
         parser = ArgumentParser(prog="search", description="Search subcommand parser.")
-        parser.add_argument("query", type=str, nargs="+", help="text to search for")
+        parser.add_argument("query", type=str, nargs="*", help="text to search for")
         ignore_case_group = parser.add_mutually_exclusive_group()
         ignore_case_group.add_argument(
             "-i",
@@ -159,6 +231,41 @@ class SearchCommand(Command):
             default=None,
             help="do NOT search through associated files",
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=config.commands.search.jobs,
+            help="maximum number of entries whose associated files get searched concurrently",
+        )
+        mode_group = parser.add_mutually_exclusive_group()
+        mode_group.add_argument(
+            "--ranked",
+            action="store_true",
+            help="order the entries by their relevance to the query",
+        )
+        mode_group.add_argument(
+            "--fuzzy",
+            action="store_true",
+            help="find the entries whose words are similar to the query",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=config.commands.search.ranked_limit,
+            help="maximum number of entries reported by a ranked search",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=config.commands.search.fuzzy_threshold,
+            help="minimum similarity of the entries reported by a fuzzy search",
+        )
+        parser.add_argument(
+            "--rebuild-text-cache",
+            action="store_true",
+            help="extract the cached texts of the associated files anew",
+        )
         parser.add_argument(
             "filter",
             nargs="*",
@@ -185,6 +292,9 @@ class SearchCommand(Command):
                 search_args.append(arg)
 
         largs = super()._parse_args(tuple(search_args))
+        if not largs.query and not largs.rebuild_text_cache:
+            LOGGER.error("Error: the following arguments are required: query")
+            sys.exit(1)
         largs.filter = filter_args
         return largs
 
@@ -196,26 +306,179 @@ class SearchCommand(Command):
 
         self.entries, _ = ListCommand(*self.largs.filter).filter_entries()
 
-        ignore_case = config.commands.search.ignore_case
-        if self.largs.ignore_case is not None:
-            ignore_case = self.largs.ignore_case
+        if self.largs.rebuild_text_cache:
+            self._rebuild_text_cache()
+
+        if not self.largs.query:
+            self.entries = []
+
+        scores: Dict[str, float] = {}
+        if self.largs.ranked and self.largs.query:
+            self._rank_entries(scores)
+        elif self.largs.fuzzy and self.largs.query:
+            self._fuzzy_entries(scores)
+
+        ignore_case = self._ignore_case()
         LOGGER.debug("The search will be performed case %ssensitive", "in" if ignore_case else "")
 
-        for entry in self.entries.copy():
-            matches = entry.search(
-                self.largs.query, self.largs.context, ignore_case, self.largs.skip_files
+        file_matches = None
+        if not self.largs.skip_files:
+            file_matches = self._grep_files()
+
+        def search(entry: Entry) -> List[List[str]]:
+            return entry.search(
+                self.largs.query,
+                self.largs.context,
+                ignore_case,
+                self.largs.skip_files,
+                file_matches=file_matches,
             )
-            if not matches:
-                self.entries.remove(entry)
+
+        jobs = 1
+        if not self.largs.skip_files and file_matches is None:
+            jobs = min(self.largs.jobs, sum(1 for entry in self.entries if entry.file))
+        if jobs > 1:
+            # the associated files are searched by subprocesses which run concurrently while their
+            # threads wait for them; `map` retains the order of the entries
+            LOGGER.debug("Searching the entries using %d threads.", jobs)
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(search, self.entries))
+        else:
+            results = [search(entry) for entry in self.entries]
+
+        entries, self.entries = self.entries, []
+        for entry, matches in zip(entries, results):
+            # ranked and fuzzy entries are retained even if their words only occur in a different
+            # form
+            if not matches and entry.label not in scores:
                 continue
 
+            self.entries.append(entry)
             self.matches.append(matches)
             self.hits += len(matches)
+            if entry.label in scores:
+                self.scores.append(scores[entry.label])
 
             LOGGER.debug('Entry "%s" includes %d hits.', entry.label, len(matches))
 
         Event.PostSearchCommand.fire(self)
 
+    def _ignore_case(self) -> bool:
+        """Returns whether the search is performed case-insensitive.
+
+        Returns:
+            The value of the command-line arguments, falling back to the configuration.
+        """
+        if self.largs.ignore_case is not None:
+            return bool(self.largs.ignore_case)
+        return config.commands.search.ignore_case
+
+    def _rank_entries(self, scores: Dict[str, float]) -> None:
+        """Replaces the searched entries with the most relevant ones (see `--ranked`).
+
+        The query gets replaced by its words such that the matching lines get reported as usual.
+
+        Args:
+            scores: the dictionary which to populate with the scores of the ranked entries.
+        """
+        bib = Database()
+        labels = {entry.label for entry in self.entries} if self.largs.filter else None
+        ranked = bib.search_index.search(self.largs.query, self.largs.limit, labels)
+        LOGGER.debug("The ranked search found %d relevant entries.", len(ranked))
+        scores.update(ranked)
+        self.entries = [bib[label] for label, _ in ranked]
+        self.largs.query = list(
+            dict.fromkeys(
+                token for query in self.largs.query for token in bib.search_index.tokenize(query)
+            )
+        )
+        self.largs.ignore_case = True
+
+    def _fuzzy_entries(self, scores: Dict[str, float]) -> None:
+        """Replaces the searched entries with the ones similar to the query (see `--fuzzy`).
+
+        The query gets replaced by the matched words such that the matching lines get reported as
+        usual.
+
+        Args:
+            scores: the dictionary which to populate with the similarities of the found entries.
+        """
+        bib = Database()
+        labels = {entry.label for entry in self.entries} if self.largs.filter else None
+        similar, words = bib.trigram_index.search(self.largs.query, self.largs.threshold, labels)
+        LOGGER.debug("The fuzzy search found %d similar entries.", len(similar))
+        scores.update(similar)
+        self.entries = [bib[label] for label, _ in similar]
+        self.largs.query = sorted(words)
+        self.largs.ignore_case = True
+
+    def _title(self, idx: int) -> str:
+        """Returns the markup of the title of the search results of an entry.
+
+        Args:
+            idx: the index of the entry in `entries`.
+
+        Returns:
+            The label of the entry followed by its number of matches and its relevance score.
+        """
+        entry, matches = self.entries[idx], self.matches[idx]
+        title = f"[search.label]{entry.markup_label()}[/search.label] - {len(matches)} match" + (
+            "es" if len(matches) != 1 else ""
+        )
+        if self.scores:
+            title += f" (score: {self.scores[idx]:.2f})"
+        return title
+
+    def _grep_files(self) -> Optional[Dict[str, Dict[Path, List[List[str]]]]]:
+        """Searches the associated files of all entries at once (see `cobib.utils.grep`).
+
+        Returns:
+            The matches keyed by the query and the resolved path of the associated file or `None`
+            if the files need to be searched separately for every entry.
+        """
+        paths = []
+        for entry in self.entries:
+            for file_ in entry.file:
+                path = RelPath(file_).path
+                if path.exists():
+                    paths.append(path)
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return None
+
+        searchable = paths
+        text_cache = TextCache.from_config()
+        if text_cache is not None:
+            with ThreadPoolExecutor(max_workers=max(1, self.largs.jobs)) as executor:
+                searchable = [
+                    cached or path
+                    for path, cached in zip(paths, executor.map(text_cache.get, paths))
+                ]
+
+        matches = grep_files(searchable, self.largs.query, self.largs.context, self.largs.jobs)
+        if matches is None:
+            return None
+        return {
+            query: {path: query_matches.get(text, []) for path, text in zip(paths, searchable)}
+            for query, query_matches in matches.items()
+        }
+
+    def _rebuild_text_cache(self) -> None:
+        """Extracts the cached texts of the files associated with the searched entries anew."""
+        text_cache = TextCache.from_config()
+        if text_cache is None:
+            LOGGER.warning("Not rebuilding the text cache because it is disabled.")
+            return
+        paths = []
+        for entry in self.entries:
+            for file_ in entry.file:
+                path = RelPath(file_).path
+                if path.exists():
+                    paths.append(path)
+        # only an unfiltered search knows about all of the associated files
+        rebuilt = text_cache.rebuild(paths, prune=not self.largs.filter)
+        LOGGER.info("Rebuilt the cached text of %d associated files.", len(rebuilt))
+
     @override
     def render_porcelain(self) -> List[str]:
         output = []
@@ -231,18 +494,11 @@ class SearchCommand(Command):
 
     @override
     def render_rich(self) -> ConsoleRenderable:
-        ignore_case = config.commands.search.ignore_case
-        if self.largs.ignore_case is not None:
-            ignore_case = self.largs.ignore_case
+        ignore_case = self._ignore_case()
 
         tree = Tree(".", hide_root=True)
-        for entry, matches in zip(self.entries, self.matches):
-            subtree = tree.add(
-                Text.from_markup(
-                    f"[search.label]{entry.markup_label()}[/search.label] - {len(matches)} match"
-                    + ("es" if len(matches) > 1 else "")
-                )
-            )
+        for entry_idx, matches in enumerate(self.matches):
+            subtree = tree.add(Text.from_markup(self._title(entry_idx)))
 
             for idx, match in enumerate(matches):
                 matchtree = subtree.add(str(idx + 1))
@@ -259,17 +515,12 @@ class SearchCommand(Command):
 
     @override
     def render_textual(self) -> SearchView:
-        ignore_case = config.commands.search.ignore_case
-        if self.largs.ignore_case is not None:
-            ignore_case = self.largs.ignore_case
+        ignore_case = self._ignore_case()
 
         tree = SearchView(".")
-        for entry, matches in zip(self.entries, self.matches):
+        for entry_idx, matches in enumerate(self.matches):
             subtree = tree.root.add(
-                Text.from_markup(
-                    f"[search.label]{entry.markup_label()}[/search.label] - {len(matches)} match"
-                    + ("es" if len(matches) > 1 else "")
-                ),
+                Text.from_markup(self._title(entry_idx)),
                 # TODO: make configurable
                 expand=False,
             )
@@ -1,4 +1,4 @@
-# pylint: disable=unnecessary-lambda,missing-docstring
+# pylint: disable=unnecessary-lambda,missing-docstring,too-many-lines
 """coBib's configuration.
 
 This file contains both, the actual implementation of the `Config` classes, as well as the runtime
@@ -19,7 +19,7 @@ from abc import abstractmethod
 from dataclasses import MISSING, dataclass, field, fields
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable, NamedTuple, Optional, TextIO, Union
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, NamedTuple, Optional, TextIO, Union
 
 from rich.style import Style
 from rich.theme import Theme
@@ -38,6 +38,26 @@ LOGGER = logging.getLogger(__name__)
 class _ConfigBase:
     """Base class for configuration section dataclasses."""
 
+    revision: ClassVar[int] = 0
+    """The number of modifications of any configuration setting. This allows other components to
+    cache values which are derived from the configuration (see for example
+    `cobib.database.Entry.stringify`).
+
+    .. note::
+       Modifying a list-valued setting in-place cannot be tracked. Assign a new value instead.
+    """
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Sets a setting and increases the `revision` counter.
+
+        Dictionary-valued settings get converted into a `_TrackedDict` such that their in-place
+        modifications increase the `revision` counter, too.
+        """
+        if isinstance(value, dict) and not isinstance(value, _TrackedDict):
+            value = _TrackedDict(value)
+        _ConfigBase.revision += 1
+        super().__setattr__(name, value)
+
     @staticmethod
     def _assert(expression: bool, error: str) -> None:
         """Asserts the expression is True.
@@ -62,12 +82,55 @@ class _ConfigBase:
 
     def defaults(self) -> None:
         """Resets the configuration to the default settings."""
-        # pylint: disable=no-member
-        for name, field_ in self.__dataclass_fields__.items():
+        for field_ in fields(self):
             if field_.default != MISSING:
-                setattr(self, name, field_.default)
+                setattr(self, field_.name, field_.default)
             else:
-                setattr(self, name, field_.default_factory())  # type: ignore[misc]
+                setattr(self, field_.name, field_.default_factory())  # type: ignore[misc]
+
+
+class _TrackedDict(Dict[Any, Any]):
+    """A dictionary-valued setting whose modifications increase the `_ConfigBase.revision`."""
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Sets an item like `dict` does."""
+        _ConfigBase.revision += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        """Deletes an item like `dict` does."""
+        _ConfigBase.revision += 1
+        super().__delitem__(key)
+
+    def __ior__(self, other: Any) -> _TrackedDict:
+        """Updates the dictionary in-place like `dict` does."""
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Removes all items like `dict` does."""
+        _ConfigBase.revision += 1
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        """Removes an item like `dict` does."""
+        _ConfigBase.revision += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Any:
+        """Removes the last item like `dict` does."""
+        _ConfigBase.revision += 1
+        return super().popitem()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        """Inserts an item if it is missing like `dict` does."""
+        _ConfigBase.revision += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Updates the dictionary like `dict` does."""
+        _ConfigBase.revision += 1
+        super().update(*args, **kwargs)
 
 
 class TagMarkup(NamedTuple):
@@ -410,6 +473,12 @@ class SearchCommandConfig(_ConfigBase):
     context: int = 1
     """Specifies the default number of context line to provide for each search query match. This is
     similar to the `-C` option of `grep`."""
+    fuzzy_fields: list[str] = field(default_factory=lambda: ["label", "title", "author"])
+    """Specifies the fields which get indexed for fuzzy searches (`cobib search --fuzzy`). See also
+    `cobib.database.trigram_index`."""
+    fuzzy_threshold: float = 0.3
+    """Specifies the default minimum similarity (between `0` and `1`) of the words and entries
+    reported by a fuzzy search."""
     grep: str = "grep"
     """Specifies the grep tool used for searching through your database and associated files. The
     default tool (`grep`) will not provide results for attached PDFs but other tools such as
@@ -419,6 +488,29 @@ class SearchCommandConfig(_ConfigBase):
     extended regex patterns even without specifying `-E`."""
     ignore_case: bool = False
     """Specifies whether searches should be performed case-insensitive."""
+    jobs: int = 8
+    """Specifies the maximum number of entries whose associated files get searched concurrently.
+    Each of these runs its own `grep` process. Set this to `1` to search them sequentially."""
+    ranked_fields: list[str] = field(
+        default_factory=lambda: ["title", "abstract", "author", "keywords", "note"]
+    )
+    """Specifies the fields which get indexed for ranked searches (`cobib search --ranked`). See
+    also `cobib.database.search_index`."""
+    ranked_limit: int = 10
+    """Specifies the default number of entries reported by a ranked search (i.e. the top-k entries
+    ordered by their relevance to the query)."""
+    text_cache: str | None = None
+    """Specifies the directory in which the text extracted from associated files is cached (for
+    example `~/.local/share/cobib/text_cache`). The `grep` tool then searches this text instead of
+    decoding the original files during every search. By default, this is `None` which disables the
+    cache such that the original files get searched directly. See also `cobib.utils.text_cache`."""
+    text_extractors: dict[str, list[str]] = field(
+        default_factory=lambda: {".pdf": ["pdftotext", "-q", "{}", "-"]}
+    )
+    """Specifies the commands which extract the text of associated files for the `text_cache`,
+    keyed by the (lower-case) file suffix. Every `{}` argument gets replaced by the path of the file
+    and the text is read from the standard output of the command. Files with any other suffix are
+    searched directly."""
 
     @property
     def highlights(self) -> SearchHighlightConfig:
@@ -440,6 +532,15 @@ class SearchCommandConfig(_ConfigBase):
             isinstance(self.context, int) and self.context >= 0,
             "config.commands.search.context should be a non-negative integer.",
         )
+        self._assert(
+            isinstance(self.fuzzy_fields, list)
+            and all(isinstance(name, str) for name in self.fuzzy_fields),
+            "config.commands.search.fuzzy_fields should be a list of strings.",
+        )
+        self._assert(
+            isinstance(self.fuzzy_threshold, (int, float)) and 0 < self.fuzzy_threshold <= 1,
+            "config.commands.search.fuzzy_threshold should be a number between 0 and 1.",
+        )
         self._assert(
             isinstance(self.grep, str),
             "config.commands.search.grep should be a string.",
@@ -452,6 +553,32 @@ class SearchCommandConfig(_ConfigBase):
             isinstance(self.ignore_case, bool),
             "config.commands.search.ignore_case should be a boolean.",
         )
+        self._assert(
+            isinstance(self.jobs, int) and self.jobs > 0,
+            "config.commands.search.jobs should be a positive integer.",
+        )
+        self._assert(
+            isinstance(self.ranked_fields, list)
+            and all(isinstance(name, str) for name in self.ranked_fields),
+            "config.commands.search.ranked_fields should be a list of strings.",
+        )
+        self._assert(
+            isinstance(self.ranked_limit, int) and self.ranked_limit > 0,
+            "config.commands.search.ranked_limit should be a positive integer.",
+        )
+        self._assert(
+            self.text_cache is None or isinstance(self.text_cache, str),
+            "config.commands.search.text_cache should be a string or `None`.",
+        )
+        self._assert(
+            isinstance(self.text_extractors, dict)
+            and all(
+                isinstance(suffix, str) and isinstance(command, list) and command
+                for suffix, command in self.text_extractors.items()
+            ),
+            "config.commands.search.text_extractors should be a dictionary mapping file suffixes "
+            "to non-empty lists of command arguments.",
+        )
 
 
 @dataclass
@@ -602,9 +729,17 @@ class EntryStringifyConfig(_ConfigBase):
 class DatabaseConfig(_ConfigBase):
     """The `config.database` section."""
 
+    cache: str | None = None
+    """Specifies the path to an optional binary snapshot of the parsed database. When this is set,
+    coBib will load the database from this snapshot as long as it matches the current state of the
+    database file, skipping the expensive YAML parsing. The snapshot gets refreshed automatically
+    whenever the database is saved. Set this to `None` to disable this functionality entirely.
+    See also `cobib.database.snapshot`."""
     file: str | Path = "~/.local/share/cobib/literature.yaml"
     """Specifies the path to the database YAML file. You can use `~` to represent your `$HOME`
-    directory."""
+    directory. This may also point to a directory of shard files (see `cobib.database.shards`). If
+    the file ends in `.db`, `.sqlite` or `.sqlite3`, the database is stored in SQLite instead (see
+    `cobib.database.backends`)."""
     format: DatabaseFormatConfig = field(default_factory=lambda: DatabaseFormatConfig())
     """The nested section for database formatting settings."""
     git: bool = False
@@ -615,14 +750,31 @@ class DatabaseConfig(_ConfigBase):
     .. warning::
        Before enabling this setting you must ensure that you have set up git properly by setting
        your name and email address."""
+    journal: bool = False
+    """Specifies whether saving the database only appends the changed entries to a journal file next
+    to the database file. This makes saving cheap and crash-safe. The journal gets compacted into
+    the database file before every automatic git commit, when coBib exits and when the database gets
+    read (in case coBib did not exit cleanly before). See also `cobib.database.journal`."""
+    lazy: bool = False
+    """Specifies whether the database file should be read lazily. When enabled,
+    `cobib.database.Database.read` only scans the database file for the boundaries and labels of its
+    entries. Each entry then gets parsed the first time it is accessed. This is ignored while any
+    `cobib.config.event.Event.PreYAMLParse` or `cobib.config.event.Event.PostYAMLParse` hooks are
+    registered and it takes precedence over the `cache` setting."""
     stringify: EntryStringifyConfig = field(default_factory=lambda: EntryStringifyConfig())
     """The nested section for database string-formatting settings."""
 
     @override
     def validate(self) -> None:
         LOGGER.debug("Validating the DATABASE configuration section.")
+        self._assert(
+            self.cache is None or isinstance(self.cache, str),
+            "config.database.cache should be a string or `None`.",
+        )
         self._assert(isinstance(self.file, str), "config.database.file should be a string.")
         self._assert(isinstance(self.git, bool), "config.database.git should be a boolean.")
+        self._assert(isinstance(self.journal, bool), "config.database.journal should be a boolean.")
+        self._assert(isinstance(self.lazy, bool), "config.database.lazy should be a boolean.")
         self.format.validate()
         self.stringify.validate()
 
@@ -647,6 +799,10 @@ class BibtexParserConfig(_ConfigBase):
 class YAMLParserConfig(_ConfigBase):
     """The `config.parsers.yaml` section."""
 
+    parallel_threshold: int | None = 5000
+    """Specifies the number of entries above which the database file gets parsed by multiple
+    processes in parallel. This only takes effect when more than one CPU is available. Set this to
+    `None` to always parse the database file sequentially."""
     use_c_lib_yaml: bool = True
     """Specifies whether the C-based implementation of the YAML parser (called `LibYAML`) shall be
     used, *significantly* increasing the performance of the parsing.
@@ -659,6 +815,11 @@ class YAMLParserConfig(_ConfigBase):
     @override
     def validate(self) -> None:
         LOGGER.debug("Validating the PARSERS.YAML configuration section.")
+        self._assert(
+            self.parallel_threshold is None
+            or (isinstance(self.parallel_threshold, int) and self.parallel_threshold > 0),
+            "config.parsers.yaml.parallel_threshold should be a positive integer or `None`.",
+        )
         self._assert(
             isinstance(self.use_c_lib_yaml, bool),
             "config.parsers.yaml.use_c_lib_yaml should be a boolean.",
@@ -69,6 +69,12 @@ config.commands.open.fields = ["file", "url"]
 # You can specify the default number of context lines to be provided for each search query match.
 # This is similar to the `-C` option of `grep`.
 config.commands.search.context = 1
+# You can specify the fields which get indexed for fuzzy searches (`cobib search --fuzzy`).
+config.commands.search.fuzzy_fields = ["label", "title", "author"]
+# You can specify the default minimum similarity (between 0 and 1) of the words and entries reported
+# by a fuzzy search.
+config.commands.search.fuzzy_threshold = 0.3
+
 # You can specify a custom grep tool which will be used to search through your database and any
 # associated files. The default tool (`grep`) will not provide results for attached PDFs but other
 # tools such as [ripgrep-all](https://github.com/phiresky/ripgrep-all) will.
@@ -81,12 +87,35 @@ config.commands.search.grep_args = []
 # You can specify whether searches should be performed case-insensitive.
 config.commands.search.ignore_case = False
 
+# You can specify the maximum number of entries whose associated files get searched concurrently.
+# Each of these runs its own grep process. Set this to `1` to search them sequentially.
+config.commands.search.jobs = 8
+
+# You can specify the fields which get indexed for ranked searches (`cobib search --ranked`).
+config.commands.search.ranked_fields = ["title", "abstract", "author", "keywords", "note"]
+# You can specify the default number of entries reported by a ranked search.
+config.commands.search.ranked_limit = 10
+
+# You can specify the directory in which the text extracted from associated files is cached (for
+# example "~/.local/share/cobib/text_cache"). Your grep tool then searches this text instead of
+# decoding the original files (e.g. PDFs) during every search. By default, this is `None` which
+# disables the cache and searches the original files directly.
+config.commands.search.text_cache = None
+# You can specify the commands which extract the text of associated files for the cache above, keyed
+# by the (lower-case) file suffix. Every `{}` argument gets replaced by the path of the file and the
+# text is read from the standard output of the command. Files with any other suffix are searched
+# directly.
+config.commands.search.text_extractors = {".pdf": ["pdftotext", "-q", "{}", "-"]}
+
 
 # DATABASE
 # These settings affect the database in general.
 
 # You can specify the path to the database YAML file. You can use a `~` to represent your `$HOME`
-# directory.
+# directory. This may also point to a directory of shard files, which you can initialize via
+# `cobib init --shards {hash,year}`. If the file ends in `.db`, `.sqlite` or `.sqlite3`, the
+# database is stored in SQLite instead. You can convert an existing database via
+# `cobib _convert_database <target>`.
 config.database.file = "~/.local/share/cobib/literature.yaml"
 
 # coBib can integrate with `git` in order to automatically track the history of your database.
@@ -96,6 +125,24 @@ config.database.file = "~/.local/share/cobib/literature.yaml"
 # your name and email address.
 config.database.git = False
 
+# You can specify the path to a binary snapshot of your parsed database. When this is set, coBib
+# will load your database from this snapshot as long as it matches the current state of the
+# database file, skipping the expensive YAML parsing. The snapshot gets refreshed automatically
+# whenever the database is saved. Setting this to `None` disables this functionality.
+config.database.cache = None
+
+# When this setting is enabled, coBib only scans the database file for the boundaries and labels of
+# its entries upon startup. Each entry is then parsed the first time it is actually accessed. This
+# speeds up commands which only need a few entries (like `show`, `open` or `edit`) on large
+# databases. This is ignored while any `PreYAMLParse` or `PostYAMLParse` hooks are registered.
+config.database.lazy = False
+
+# When this setting is enabled, saving the database only appends the changed entries to a journal
+# file next to your database file. This makes saving cheap and crash-safe. The journal gets
+# compacted into the database file before every automatic git commit, when coBib exits and when the
+# database is read (in case coBib did not exit cleanly before).
+config.database.journal = False
+
 # DATABASE.FORMAT
 # You can also specify some aspects about the format of the database.
 
@@ -140,6 +187,11 @@ config.database.stringify.list_separator.url = ", "
 # You can specify whether the bibtex-parser should ignore non-standard bibtex entry types.
 config.parsers.bibtex.ignore_non_standard_types = False
 
+# You can specify the number of entries above which coBib parses the database file using multiple
+# processes in parallel. This only takes effect when more than one CPU is available. Setting this to
+# `None` disables parallel parsing.
+config.parsers.yaml.parallel_threshold = 5000
+
 # You can specify that the C-based implementation of the YAML parser (called `LibYAML`) shall be
 # used, *significantly* increasing the performance of the parsing. Note, that this requires manual
 # installation of the C-based parser:
@@ -0,0 +1,37 @@
+"""coBib's storage backends.
+
+The `cobib.database.Database` delegates the reading and writing of its entries to a storage backend.
+The backend gets chosen based on the path configured by `cobib.config.config.DatabaseConfig.file`
+(see `get_backend`):
+* `cobib.database.backends.sqlite.SQLiteBackend`: for files ending in `.db`, `.sqlite` or
+  `.sqlite3`.
+* `cobib.database.backends.yaml.YAMLBackend`: for everything else. This is the default.
+
+The abstract interface which should be implemented is defined by the
+`cobib.database.backends.base_backend`.
+"""
+
+from pathlib import Path
+
+from .base_backend import Backend as Backend
+from .base_backend import LazyEntry as LazyEntry
+from .sqlite import SQLiteBackend as SQLiteBackend
+from .yaml import YAMLBackend as YAMLBackend
+
+BACKENDS = [SQLiteBackend, YAMLBackend]
+"""The available backends in the order in which they are checked by `get_backend`."""
+
+
+def get_backend(path: Path) -> Backend:
+    """Returns the storage backend responsible for the given path.
+
+    Args:
+        path: the path to the storage location of the database.
+
+    Returns:
+        A new instance of the first backend in `BACKENDS` which handles the given path.
+    """
+    for backend in BACKENDS:
+        if backend.handles(path):
+            return backend(path)
+    return YAMLBackend(path)  # pragma: no cover
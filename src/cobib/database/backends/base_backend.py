@@ -0,0 +1,117 @@
+"""coBib's storage Backend interface."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import cobib.database
+
+
+class LazyEntry(ABC):
+    """The interface of placeholders for entries which have not been loaded yet.
+
+    A backend may return instances of this class from `Backend.read` instead of actual
+    `cobib.database.Entry` instances. The `cobib.database.Database` replaces them with the result of
+    `LazyEntry.parse` upon their first access.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def parse(self) -> cobib.database.Entry:
+        """Loads the actual entry.
+
+        Returns:
+            The actual entry.
+        """
+
+
+class Backend(ABC):
+    """The storage Backend interface.
+
+    This interface should be implemented by all concrete storage backends. A backend is responsible
+    for reading and writing the entries of the `cobib.database.Database` from and to the location
+    configured by `cobib.config.config.DatabaseConfig.file`.
+
+    Every backend stores each entry in the YAML format written by `cobib.parsers.YAMLParser`. This
+    makes the conversion between different backends lossless (see `Backend.iter_documents` and
+    `Backend.write_documents`).
+    """
+
+    name = "base"
+    """The name of the backend."""
+
+    def __init__(self, path: Path) -> None:
+        """Initializes the backend.
+
+        Args:
+            path: the path to the storage location of the database.
+        """
+        self.path: Path = path
+        """The path to the storage location of the database."""
+
+    @classmethod
+    @abstractmethod
+    def handles(cls, path: Path) -> bool:
+        """Returns whether this backend is responsible for the given storage location.
+
+        Args:
+            path: the path to the storage location of the database.
+
+        Returns:
+            Whether this backend should be used for the given path.
+        """
+
+    @abstractmethod
+    def read(self) -> Dict[str, Any]:
+        """Reads all entries.
+
+        Returns:
+            The ordered dictionary mapping labels to their `cobib.database.Entry` or `LazyEntry`.
+
+        Raises:
+            FileNotFoundError: if the storage location does not exist.
+            ValueError: if the storage location is invalid.
+        """
+
+    @abstractmethod
+    def save(
+        self,
+        changes: Dict[str, Optional[cobib.database.Entry]],
+        entries: Dict[str, cobib.database.Entry],
+    ) -> List[Path]:
+        """Writes the changed entries.
+
+        Entries which are not part of `changes` must remain untouched, including their order.
+
+        Args:
+            changes: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted). A changed entry whose previous
+                label is unknown to the backend is a new entry and gets appended.
+            entries: all entries of the database after applying the changes.
+
+        Returns:
+            The list of files which were written.
+        """
+
+    @abstractmethod
+    def iter_documents(self) -> Iterator[Tuple[str, str]]:
+        """Iterates the raw YAML documents of all stored entries in order.
+
+        Returns:
+            An iterator over pairs of labels and YAML documents.
+
+        Raises:
+            FileNotFoundError: if the storage location does not exist.
+        """
+
+    @abstractmethod
+    def write_documents(self, documents: Iterable[Tuple[str, str]]) -> None:
+        """Replaces the entire contents of the storage location with the given YAML documents.
+
+        Args:
+            documents: pairs of labels and YAML documents, in order.
+        """
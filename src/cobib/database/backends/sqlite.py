@@ -0,0 +1,239 @@
+"""coBib's SQLite storage backend.
+
+This backend stores the database in an [SQLite](https://www.sqlite.org/) file. It gets used
+whenever `cobib.config.config.DatabaseConfig.file` ends in one of `SQLiteBackend.suffixes`.
+
+Every entry is stored in a single row of the `entries` table, which holds its label and its YAML
+document (as written by `cobib.parsers.YAMLParser`). The order of the entries is given by the
+primary key of the rows. Thus:
+* reading the database only loads the labels of all entries. The actual entries get loaded and
+  parsed upon their first access (unless `cobib.config.event.Event.PostYAMLParse` hooks are
+  registered, in which case all entries are parsed up front).
+* saving the database only writes the changed rows within a single transaction.
+* the conversion to and from the YAML backend is lossless (see `cobib.utils.shell_helper`).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from typing_extensions import override
+
+from cobib.config import Event, config
+
+from .base_backend import Backend, LazyEntry
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_SCHEMA_VERSION = 1
+"""@private the version of the database schema, stored as the `user_version` of the file."""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL UNIQUE,
+    document TEXT NOT NULL
+)
+"""
+"""@private the database schema."""
+
+
+class SQLiteRow(LazyEntry):
+    """A placeholder for an entry whose row has not been loaded yet."""
+
+    __slots__ = ("backend", "row")
+
+    def __init__(self, backend: SQLiteBackend, row: int) -> None:
+        """Initializes the placeholder.
+
+        Args:
+            backend: the backend from which to load the entry.
+            row: the primary key of the entry's row.
+        """
+        self.backend = backend
+        self.row = row
+
+    @override
+    def parse(self) -> cobib.database.Entry:
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        return YAMLParser().parse_document(self.backend.load(self.row))
+
+
+class SQLiteBackend(Backend):
+    """The SQLite storage backend."""
+
+    name = "sqlite"
+
+    suffixes = (".db", ".sqlite", ".sqlite3")
+    """The file suffixes for which this backend gets used."""
+
+    def __init__(self, path: Path) -> None:  # pylint: disable=C0116
+        # noqa: D107
+        super().__init__(path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @override
+    @classmethod
+    def handles(cls, path: Path) -> bool:
+        return path.suffix.lower() in cls.suffixes
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        """Opens a connection to an SQLite file and ensures its schema.
+
+        Args:
+            path: the path to the SQLite file.
+
+        Returns:
+            The open connection.
+
+        Raises:
+            ValueError: if the file was created by a newer version of coBib.
+        """
+        connection = sqlite3.connect(path, check_same_thread=False)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > _SCHEMA_VERSION:
+            connection.close()
+            raise ValueError(f"The SQLite database {path} uses an unsupported schema ({version}).")
+        connection.execute(_SCHEMA)
+        connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.commit()
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection to the SQLite file.
+
+        Raises:
+            FileNotFoundError: if the SQLite file does not exist.
+        """
+        if self._connection is None:
+            if not self.path.exists():
+                raise FileNotFoundError(self.path)
+            self._connection = self._connect(self.path)
+        return self._connection
+
+    def load(self, row: int) -> str:
+        """Loads the YAML document of a single entry.
+
+        Args:
+            row: the primary key of the entry's row.
+
+        Returns:
+            The YAML document of the entry.
+        """
+        LOGGER.debug("Loading row %d from %s.", row, self.path)
+        result = self.connection.execute("SELECT document FROM entries WHERE id = ?", (row,))
+        return str(result.fetchone()[0])
+
+    @override
+    def read(self) -> Dict[str, Any]:
+        rows = self.connection.execute("SELECT id, label FROM entries ORDER BY id").fetchall()
+        LOGGER.debug("Read %d labels from %s.", len(rows), self.path)
+
+        entries: Dict[str, Any] = OrderedDict((label, SQLiteRow(self, row)) for row, label in rows)
+
+        if Event.PostYAMLParse in config.events:
+            LOGGER.debug("Loading all entries due to registered YAML parsing hooks.")
+            for label, lazy in entries.items():
+                entries[label] = lazy.parse()
+            Event.PostYAMLParse.fire(entries)
+
+        return entries
+
+    @override
+    def save(
+        self,
+        changes: Dict[str, Optional[cobib.database.Entry]],
+        entries: Dict[str, cobib.database.Entry],
+    ) -> List[Path]:
+        """Writes the changed entries.
+
+        All changes are applied within a single transaction. Changed entries keep the primary key of
+        their previous row (and with it their position), while new entries are appended.
+
+        Args:
+            changes: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+            entries: all entries of the database after applying the changes.
+
+        Returns:
+            The list containing the SQLite file.
+        """
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        yml = YAMLParser()
+
+        if not self.path.exists():
+            self._connection = self._connect(self.path)
+
+        with self.connection as connection:
+            # remove all previous rows first, such that renames cannot conflict with each other
+            rows: Dict[str, Optional[int]] = {}
+            for label in changes:
+                result = connection.execute("SELECT id FROM entries WHERE label = ?", (label,))
+                row = result.fetchone()
+                rows[label] = None if row is None else int(row[0])
+                connection.execute("DELETE FROM entries WHERE label = ?", (label,))
+
+            # a renamed entry keeps the row of its previous label
+            targets: Dict[str, Tuple[Optional[int], cobib.database.Entry]] = OrderedDict()
+            for label, entry in changes.items():
+                if not entry:
+                    LOGGER.debug('Deleting entry "%s".', label)
+                    continue
+                row = rows[label]
+                if entry.label in targets and row is None:
+                    row = targets[entry.label][0]
+                targets[entry.label] = (row, entry)
+
+            for label, (row, entry) in targets.items():
+                LOGGER.debug('Writing entry "%s".', label)
+                connection.execute(
+                    "INSERT INTO entries (id, label, document) VALUES (?, ?, ?)",
+                    (row, label, entry.save(parser=yml)),
+                )
+
+        return [self.path]
+
+    @override
+    def iter_documents(self) -> Iterator[Tuple[str, str]]:
+        result = self.connection.execute("SELECT label, document FROM entries ORDER BY id")
+        for label, document in result:
+            yield str(label), str(document)
+
+    @override
+    def write_documents(self, documents: Iterable[Tuple[str, str]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.")
+        os.close(tmp_fd)
+        try:
+            connection = self._connect(Path(tmp_name))
+            with connection:
+                # duplicate labels are resolved like the YAMLParser does: the last one wins
+                connection.executemany(
+                    "INSERT INTO entries (label, document) VALUES (?, ?) "
+                    "ON CONFLICT (label) DO UPDATE SET document = excluded.document",
+                    documents,
+                )
+            connection.close()
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        os.replace(tmp_name, self.path)
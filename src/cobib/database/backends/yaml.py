@@ -0,0 +1,301 @@
+"""coBib's YAML storage backend.
+
+This is the default backend which stores the database in a plain-text YAML file. Each entry is
+stored as a separate YAML document. Alternatively, the database may be split into multiple shard
+files inside of a directory (see `cobib.database.shards`).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from typing_extensions import override
+
+from cobib.config import Event, config
+
+from ..offset_index import OffsetIndex
+from ..shards import Shards
+from ..snapshot import Snapshot
+from .base_backend import Backend, LazyEntry
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+
+class YAMLDocument(LazyEntry):
+    """A placeholder for an entry whose YAML document has not been parsed yet."""
+
+    __slots__ = ("document",)
+
+    def __init__(self, document: bytes) -> None:
+        """Initializes the placeholder.
+
+        Args:
+            document: the raw YAML document of the entry.
+        """
+        self.document = document
+
+    @override
+    def parse(self) -> cobib.database.Entry:
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        return YAMLParser().parse_document(self.document.decode("utf-8"))
+
+
+class YAMLBackend(Backend):
+    """The YAML storage backend."""
+
+    name = "yaml"
+
+    def __init__(self, path: Path) -> None:  # pylint: disable=C0116
+        # noqa: D107
+        super().__init__(path)
+
+        self._offsets: Optional[OffsetIndex] = None
+        self._shards: Optional[Shards] = Shards(path) if Shards.is_sharded(path) else None
+        self._origins: Optional[Dict[str, Path]] = None
+
+    @property
+    def origins(self) -> Dict[str, Path]:
+        """The dictionary mapping every label to the shard file which contains it.
+
+        This is only used for sharded databases and gets populated by `read`. If the database has
+        not been read before, the shard files are scanned for their labels instead.
+        """
+        if self._origins is None:
+            self._origins = {}
+            if self._shards is not None:
+                for path in self._shards.paths():
+                    for label in OffsetIndex.scan(path).documents:
+                        self._origins[label] = path
+                self._origins = self._shards.order(self._origins)
+        return self._origins
+
+    @override
+    @classmethod
+    def handles(cls, path: Path) -> bool:
+        return True
+
+    @override
+    def read(self) -> Dict[str, Any]:
+        """Reads the database file.
+
+        This uses `cobib.parsers.YAMLParser` to parse the data.
+        If the configured path is a directory, all of its shard files are read instead (see
+        `cobib.database.shards`).
+        If `cobib.config.config.DatabaseConfig.lazy` is enabled, the database file only gets scanned
+        for the labels of its entries, which are then parsed upon their first access.
+        Otherwise, if `cobib.config.config.DatabaseConfig.cache` is configured, the entries are
+        loaded from the `cobib.database.snapshot.Snapshot` instead, as long as it matches the
+        database file.
+
+        Returns:
+            The ordered dictionary mapping labels to their `cobib.database.Entry` or `YAMLDocument`.
+
+        Raises:
+            FileNotFoundError: if the database file does not exist.
+            ValueError: if the manifest of a sharded database is invalid.
+        """
+        if self._shards is not None:
+            sharded, self._origins = self._shards.read()
+            return sharded
+
+        lazy = self._read_lazily() if self._lazy_enabled() else None
+        if lazy is not None:
+            return lazy
+
+        entries = Snapshot.load(self.path) if Snapshot.enabled() else None
+        if entries is None:
+            # pylint: disable=import-outside-toplevel
+            from cobib.parsers.yaml import YAMLParser
+
+            entries = YAMLParser().parse(self.path)
+            if Snapshot.enabled():
+                Snapshot.dump(self.path, entries)
+        self._offsets = OffsetIndex.scan(self.path)
+        return entries
+
+    @staticmethod
+    def _lazy_enabled() -> bool:
+        """Returns whether the database file should be read lazily.
+
+        Returns:
+            Whether lazy reading is configured and no YAML-parsing hooks are subscribed.
+        """
+        if not config.database.lazy:
+            return False
+        if Event.PreYAMLParse in config.events or Event.PostYAMLParse in config.events:
+            LOGGER.debug("Reading the database eagerly due to registered YAML parsing hooks.")
+            return False
+        return True
+
+    def _read_lazily(self) -> Optional[Dict[str, Any]]:
+        """Scans the database file for its entries without parsing them.
+
+        This also constructs the offset index of the database file from the same scan.
+
+        Returns:
+            The ordered dictionary mapping labels to placeholders which get parsed upon their first
+            access, or `None` if the label of some document could not be determined. In the latter
+            case, the database file needs to be parsed eagerly.
+        """
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        with open(self.path, "rb") as stream:
+            raw = stream.read()
+
+        entries: Dict[str, Any] = OrderedDict()
+        documents: Dict[str, Tuple[int, int]] = OrderedDict()
+        for label, start, end in OffsetIndex.iter_documents(raw):
+            if label is None:
+                LOGGER.info("Could not determine the label of the document at offset %d.", start)
+                return None
+            if label in entries:
+                YAMLParser.warn_duplicate_label(label)
+                # like the YAMLParser, the last occurrence takes precedence
+                documents.pop(label)
+            documents[label] = (start, end)
+            entries[label] = YAMLDocument(raw[start:end])
+
+        LOGGER.debug("Scanned %d entries for lazy parsing.", len(entries))
+        self._offsets = OffsetIndex(self.path, documents)
+        return entries
+
+    @override
+    def save(
+        self,
+        changes: Dict[str, Optional[cobib.database.Entry]],
+        entries: Dict[str, cobib.database.Entry],
+    ) -> List[Path]:
+        """Writes the changed entries.
+
+        This preserves the order of the entries in the database file by overwriting changed entries
+        in-place and appending new entries to the end of the file.
+
+        The method of determining whether an entry was added, changed or removed is the following:
+        1. we look up the byte range of every changed label in the offset index of the database
+           file. If the database file was modified since it got indexed, it gets re-scanned first.
+        2. if the label is indexed, we use `Entry.save` and a `cobib.parsers.YAMLParser` to replace
+           the previous document of the changed entry. If the entry no longer exists, its document
+           gets removed.
+        3. Finally, all labels which are not indexed are newly added entries and can simply be
+           appended to the file.
+
+        Only the changed entries get serialized by
+        `cobib.database.offset_index.OffsetIndex.write_entries`. All other byte ranges of the
+        database file get spliced through unchanged into a temporary file, which then atomically
+        replaces the database file.
+
+        If `cobib.config.config.DatabaseConfig.cache` is configured, the changes get appended to the
+        `cobib.database.snapshot.Snapshot` afterwards. If the snapshot did not match the database
+        file beforehand, it gets rewritten entirely instead.
+
+        For sharded databases, this is delegated to `cobib.database.shards.Shards.save`, which only
+        rewrites the shard files containing changed entries.
+
+        Args:
+            changes: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+            entries: all entries of the database after applying the changes.
+
+        Returns:
+            The list of files which were written.
+        """
+        if self._shards is not None:
+            origins = self.origins
+            return self._shards.save(
+                {label: (origins.get(label, None), entry) for label, entry in changes.items()},
+                origins,
+            )
+
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        offsets = self._offsets
+        if offsets is None or not offsets.is_valid(self.path):
+            LOGGER.debug("The offset index is outdated. Re-scanning the database file.")
+            offsets = OffsetIndex.scan(self.path)
+
+        snapshot = Snapshot.enabled()
+        current = snapshot and Snapshot.is_current(self.path)
+
+        offsets.write_entries(changes, YAMLParser())
+        self._offsets = offsets
+
+        if current:
+            Snapshot.append(self.path, changes, entries)
+        elif snapshot:
+            Snapshot.dump(self.path, entries)
+
+        return [self.path]
+
+    def _paths(self) -> List[Path]:
+        """Returns the paths of all files of this database.
+
+        Returns:
+            The list of the shard files of a sharded database, or of the single database file.
+        """
+        return self._shards.paths() if self._shards is not None else [self.path]
+
+    @override
+    def iter_documents(self) -> Iterator[Tuple[str, str]]:
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        for path in self._paths():
+            with open(path, "rb") as stream:
+                raw = stream.read()
+            for label, start, end in OffsetIndex.iter_documents(raw):
+                document = raw[start:end].decode("utf-8")
+                if label is None:
+                    label = str(list(YAMLParser.load_string(document))[0])
+                yield label, document
+
+    @override
+    def write_documents(self, documents: Iterable[Tuple[str, str]]) -> None:
+        if self._shards is None:
+            _write_atomically(self.path, "".join(document for _, document in documents))
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        yml = YAMLParser()
+        per_shard: Dict[Path, List[str]] = OrderedDict()
+        labels: List[str] = []
+        for label, document in documents:
+            shard = self._shards.shard_of(yml.parse_document(document))
+            per_shard.setdefault(shard, []).append(document)
+            labels.append(label)
+        for path in self._shards.paths():
+            if path not in per_shard:
+                os.remove(path)
+        for path, shard_documents in per_shard.items():
+            _write_atomically(path, "".join(shard_documents))
+        self._shards.write_order(labels)
+        self._origins = None
+
+
+def _write_atomically(path: Path, text: str) -> None:
+    """Writes a file by atomically replacing it with a temporary file.
+
+    Args:
+        path: the path to the file.
+        text: the new contents of the file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as stream:
+        stream.write(text)
+    os.replace(stream.name, path)
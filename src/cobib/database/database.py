@@ -2,26 +2,72 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
 import logging
-import re
 import sys
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Dict, List, Optional, cast
+from collections.abc import ItemsView, ValuesView
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterator, List, Optional, cast
 
 from cobib.config import config
 from cobib.utils.rel_path import RelPath
 
+from .backends import Backend, LazyEntry, get_backend
+from .entry import EntryData
+from .field_index import FieldIndex
+from .journal import Journal, Mutation
+from .schema import Schema
+from .search_index import SearchIndex
+from .trigram_index import TrigramIndex
+
 if TYPE_CHECKING:
     import cobib.database
 
 LOGGER = logging.getLogger(__name__)
 """@private module logger."""
 
+_MAX_CHANGES = 1024
+"""@private the number of changes after which `Database.pop_changes` reports a complete change."""
+
+
+class _Transaction:
+    """@private the state of an ongoing `Database.transaction`."""
+
+    __slots__ = ("order", "unsaved", "journaled", "backup", "data", "commits")
+
+    def __init__(  # pylint: disable=C0116
+        self,
+        order: List[str],
+        unsaved: Dict[str, Optional[str]],
+        journaled: Dict[str, Optional[str]],
+    ) -> None:
+        # noqa: D107
+        self.order = order
+        """The order of the labels at the start of the transaction."""
+        self.unsaved = unsaved
+        """A copy of `Database._unsaved_entries` at the start of the transaction."""
+        self.journaled = journaled
+        """A copy of `Database._journaled_entries` at the start of the transaction."""
+        self.backup: Dict[str, Any] = {}
+        """The original entries of all labels which were accessed during the transaction. Parsed
+        entries are backed up as the triple of the entry, its label and its `EntryData`."""
+        self.data: Dict[int, Optional[Dict[str, Any]]] = {}
+        """The original contents of the `EntryData` of the backed up entries, keyed by their `id`.
+        These only get copied upon the first modification of the data and are `None` until then."""
+        self.commits: List[str] = []
+        """The messages of all git commits which were deferred during the transaction."""
+
 
 # TODO: once Python 3.9 becomes the default, OrderedDict can be properly sub-typed
-class Database(OrderedDict):  # type: ignore
+class Database(OrderedDict):  # type: ignore  # pylint: disable=too-many-public-methods
     """coBib's Database class is a runtime interface to the plain-test YAML file.
 
+    The actual reading and writing of the entries is delegated to a storage backend (see
+    `cobib.database.backends`), which gets chosen based on the configured database file.
+
     This class is a *singleton*.
     Thus, accessing `cobib.database.Database` will always yield the identical instance at runtime.
     This ensures data consistency during all operations on the database.
@@ -36,6 +82,50 @@ class Database(OrderedDict):  # type: ignore
     Otherwise it is set to the label of the changed entry (which may be different from the previous
     label, indicating a renaming of the entry)."""
 
+    _backend: Optional[Backend] = None
+    """The storage backend from which the database was read. This gets populated by
+    `Database.read` and is re-used by `Database.save`."""
+
+    _field_index: FieldIndex = FieldIndex()
+    """The index of the stringified field values of all entries. This gets built upon its first use
+    (see `Database.field_index`) and is kept up-to-date by `Database.update`, `Database.pop` and
+    `Database.rename`."""
+
+    _schema: Schema = Schema()
+    """The set of fields which occur in the database. This gets populated upon its first use (see
+    `Database.fields`), is kept up-to-date by `Database.update` and gets persisted by
+    `Database.save`."""
+
+    _search_index: SearchIndex = SearchIndex()
+    """The ranked search index of all entries. This gets populated upon its first use (see
+    `Database.search_index`), is kept up-to-date by `Database.update`, `Database.pop` and
+    `Database.rename` and gets persisted by `Database.save`."""
+
+    _trigram_index: TrigramIndex = TrigramIndex()
+    """The fuzzy search index of all entries. This gets built upon its first use (see
+    `Database.trigram_index`) and is kept up-to-date by `Database.update`, `Database.pop` and
+    `Database.rename`."""
+
+    _journaled_entries: Dict[str, Optional[str]] = {}
+    """A dictionary of changed entries which have been written to the journal (see
+    `cobib.database.journal`) but not yet been compacted into the database file. Its structure is
+    identical to `Database._unsaved_entries`."""
+
+    _compact_at_exit: bool = False
+    """Whether `Database.compact` has been registered to run when the Python process exits."""
+
+    _transaction: Optional[_Transaction] = None
+    """The state of the ongoing `Database.transaction`, if any."""
+
+    _written_files: Dict[Path, None] = {}
+    """The ordered set of files which have been written by `Database.save` but not yet been
+    retrieved via `Database.pop_written_files`."""
+
+    _changes: Optional[Dict[str, Optional[str]]] = {}
+    """The changes of the entries which have not yet been retrieved via `Database.pop_changes`. Its
+    structure is identical to `Database._unsaved_entries` but it does not get cleared by
+    `Database.save`. It is `None` when the entire database may have changed."""
+
     def __new__(cls) -> Database:
         """Singleton constructor.
 
@@ -49,6 +139,71 @@ class Database(OrderedDict):  # type: ignore
             cls.read()
         return cls._instance
 
+    def __getitem__(self, label: str) -> cobib.database.Entry:
+        """Returns the entry pointed to by the given label.
+
+        When the storage backend read the database lazily (for example, when
+        `cobib.config.config.DatabaseConfig.lazy` is enabled), this loads the entry upon its first
+        access.
+
+        Args:
+            label: the label of the entry.
+
+        Returns:
+            The entry pointed to by the given label.
+        """
+        self._backup(label)
+        entry = super().__getitem__(label)
+        if isinstance(entry, LazyEntry):
+            LOGGER.debug("Lazily loading entry %s.", label)
+            entry = entry.parse()
+            super().__setitem__(label, entry)
+        return cast("cobib.database.Entry", entry)
+
+    def get(self, label: str, default: Any = None) -> Any:
+        """Returns the entry pointed to by the given label or a default value.
+
+        This wraps `Database.__getitem__` in order to respect lazily parsed entries.
+
+        Args:
+            label: the label of the entry.
+            default: the value to return if the label does not exist.
+
+        Returns:
+            The entry pointed to by the given label or the default value.
+        """
+        return self[label] if label in self else default
+
+    def __delitem__(self, label: str) -> None:
+        """Removes the entry of a label like `OrderedDict` does, backing it up during a transaction.
+
+        Args:
+            label: the label of the entry.
+        """
+        self._backup(label)
+        super().__delitem__(label)
+
+    def popitem(self, last: bool = True) -> Any:
+        """Removes an entry like `OrderedDict.popitem` does, backing it up during a transaction.
+
+        Args:
+            last: whether to remove the last or the first entry.
+
+        Returns:
+            The pair of the label and the removed entry.
+        """
+        if self:
+            self._backup(next(reversed(self.keys())) if last else next(iter(self.keys())))
+        return super().popitem(last)
+
+    def values(self) -> ValuesView[cobib.database.Entry]:  # type: ignore[override]
+        """Returns a view of all entries, parsing any lazily read ones upon iteration."""
+        return ValuesView(self)
+
+    def items(self) -> ItemsView[str, cobib.database.Entry]:  # type: ignore[override]
+        """Returns a view of all labels and entries, parsing any lazily read ones upon iteration."""
+        return ItemsView(self)
+
     def update(self, new_entries: Dict[str, cobib.database.Entry]) -> None:  # type: ignore
         """Updates the database with the given dictionary of entries.
 
@@ -62,8 +217,32 @@ class Database(OrderedDict):  # type: ignore
         """
         for label in new_entries.keys():
             LOGGER.debug("Updating entry %s", label)
+            self._backup(label)
             Database._unsaved_entries[label] = label
+            Database._record_change(label, label)
         super().update(new_entries)
+        if Database._field_index.built:
+            for label, entry in new_entries.items():
+                if isinstance(entry, LazyEntry):
+                    Database._field_index.clear()
+                    break
+                Database._field_index.add(label, entry)
+        if Database._schema.loaded:
+            for entry in new_entries.values():
+                if not isinstance(entry, LazyEntry):
+                    Database._schema.add(entry)
+        if Database._search_index.loaded:
+            for label, entry in new_entries.items():
+                if isinstance(entry, LazyEntry):
+                    Database._search_index.clear()
+                    break
+                Database._search_index.add(label, entry)
+        if Database._trigram_index.built:
+            for label, entry in new_entries.items():
+                if isinstance(entry, LazyEntry):
+                    Database._trigram_index.clear()
+                    break
+                Database._trigram_index.add(label, entry)
 
     def pop(self, label: str) -> cobib.database.Entry:  # type: ignore
         """Pops the entry pointed to by the given label.
@@ -78,10 +257,17 @@ class Database(OrderedDict):  # type: ignore
         Returns:
             The entry pointed to by the given label.
         """
-        entry: cobib.database.Entry = super().pop(label)
+        self._backup(label)
+        entry = super().pop(label)
+        if isinstance(entry, LazyEntry):
+            entry = entry.parse()
+        Database._field_index.remove(label)
+        Database._search_index.remove(label)
+        Database._trigram_index.remove(label)
         LOGGER.debug("Removing entry: %s", label)
         Database._unsaved_entries[label] = None
-        return entry
+        Database._record_change(label, None)
+        return cast("cobib.database.Entry", entry)
 
     def rename(self, old_label: str, new_label: str) -> None:
         """Renames an entry label.
@@ -95,11 +281,146 @@ class Database(OrderedDict):  # type: ignore
         """
         LOGGER.debug("Renaming entry '%s' to '%s'.", old_label, new_label)
         Database._unsaved_entries[old_label] = new_label
+        Database._record_change(old_label, new_label)
         if new_label != old_label:
             # NOTE: this is not technically needed but the rename method is exploited during
             # database linting with "fake" renames in order to register entries for re-writing
             # during saving
+            self._backup(old_label)
             super().pop(old_label)
+            Database._field_index.remove(old_label)
+            Database._search_index.remove(old_label)
+            Database._trigram_index.remove(old_label)
+
+    def clear(self) -> None:
+        """Removes all entries.
+
+        This function wraps `OrderedDict.clear` and also clears the `Database.field_index`, the
+        `Database.fields`, the `Database.search_index` and the `Database.trigram_index`.
+        """
+        if Database._transaction is not None:
+            for label in self.keys():
+                self._backup(label)
+        super().clear()
+        Database._field_index.clear()
+        Database._schema.clear()
+        Database._search_index.clear()
+        Database._trigram_index.clear()
+
+    @property
+    def field_index(self) -> FieldIndex:
+        """The index of the stringified field values of all entries.
+
+        This gets built upon its first access, parsing any lazily read entries in the process. Refer
+        to `cobib.database.field_index` for more details.
+        """
+        if not Database._field_index.built:
+            Database._field_index.build(self.items())
+        return Database._field_index
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """The set of fields which occur in the database.
+
+        Upon its first access, this gets loaded from coBib's cache. Only if no valid schema is
+        cached, all entries get scanned (parsing any lazily read ones in the process). Refer to
+        `cobib.database.schema` for more details.
+        """
+        if not Database._schema.loaded:
+            file = RelPath(config.database.file).path
+            if not Database._load_schema(file):
+                Database._schema.build(self.values())
+                Database._schema.dump(file)
+        return Database._schema.fields
+
+    @property
+    def schema_version(self) -> int:
+        """The version of the schema, which changes whenever `Database.fields` (may) change.
+
+        Unlike `Database.fields`, this never loads the schema.
+        """
+        return Database._schema.version
+
+    @classmethod
+    def _load_schema(cls, file: Path) -> bool:
+        """Loads the cached schema of the database file and adds all pending changes to it.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            Whether a valid schema was loaded.
+        """
+        if not cls._schema.load(file):
+            return False
+        # the changes which have not been written to the database file yet
+        _instance = cast(Database, cls._instance)
+        for label in {**cls._journaled_entries, **cls._unsaved_entries}.values():
+            entry = None if label is None else super(Database, _instance).get(label, None)
+            if entry is not None and not isinstance(entry, LazyEntry):
+                cls._schema.add(entry)
+        return True
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """The ranked search index of all entries.
+
+        Upon its first access, this gets loaded from the index file next to the database file. Only
+        if no valid index exists, it gets built from all entries (parsing any lazily read ones in
+        the process) and persisted. Refer to `cobib.database.search_index` for more details.
+        """
+        if not Database._search_index.loaded:
+            file = RelPath(config.database.file).path
+            if not Database._load_search_index(file):
+                Database._search_index.build(self.items())
+                Database._search_index.dump(file)
+        return Database._search_index
+
+    @property
+    def trigram_index(self) -> TrigramIndex:
+        """The fuzzy search index of all entries.
+
+        This gets built upon its first access, parsing any lazily read entries in the process. Refer
+        to `cobib.database.trigram_index` for more details.
+        """
+        if not Database._trigram_index.built:
+            Database._trigram_index.build(self.items())
+        return Database._trigram_index
+
+    @classmethod
+    def _load_search_index(cls, file: Path) -> bool:
+        """Loads the persisted search index of the database file and applies all pending changes.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            Whether a valid index was loaded.
+        """
+        if not cls._search_index.load(file):
+            return False
+        # the changes which have not been written to the database file yet
+        _instance = cast(Database, cls._instance)
+        for label, new_label in {**cls._journaled_entries, **cls._unsaved_entries}.items():
+            cls._search_index.remove(label)
+            if new_label is not None and new_label in _instance:
+                cls._search_index.add(new_label, _instance[new_label])
+        return True
+
+    @classmethod
+    def _load_indices(cls, file: Path) -> None:
+        """Loads the persisted schema and search index before the database file changes.
+
+        This keeps them valid without having to scan the database. The search index only gets
+        loaded if it has been persisted before.
+
+        Args:
+            file: the path to the database file.
+        """
+        if not cls._schema.loaded:
+            cls._load_schema(file)
+        if not cls._search_index.loaded and SearchIndex.path(file).exists():
+            cls._load_search_index(file)
 
     def disambiguate_label(self, label: str, entry: cobib.database.Entry) -> str:
         """Disambiguate a given label to ensure it becomes unique.
@@ -146,16 +467,171 @@ class Database(OrderedDict):  # type: ignore
                 label,
             )
 
+    def _backup(self, label: str) -> None:
+        """Backs up the original entry of a label during a `Database.transaction`.
+
+        This does nothing outside of a transaction or if the label has already been backed up. The
+        entry itself does not get copied: its label and `EntryData` are remembered and the contents
+        of the latter only get copied right before they get modified (see `Database._backup_data`).
+
+        Args:
+            label: the label of the entry which is about to be accessed or changed.
+        """
+        transaction = Database._transaction
+        if transaction is None or label in transaction.backup:
+            return
+        if label not in self.keys():
+            transaction.backup[label] = None
+            return
+        entry = super().__getitem__(label)
+        if isinstance(entry, LazyEntry):
+            transaction.backup[label] = entry
+            return
+        transaction.backup[label] = (entry, entry.label, entry.data)
+        transaction.data.setdefault(id(entry.data), None)
+
+    @staticmethod
+    def _backup_data(data: EntryData) -> None:
+        """Copies the contents of a backed up `EntryData` right before its first modification.
+
+        This is the `EntryData.on_change` callback during a `Database.transaction`.
+
+        Args:
+            data: the data which is about to be modified.
+        """
+        transaction = Database._transaction
+        if transaction is None:
+            return
+        key = id(data)
+        if key in transaction.data and transaction.data[key] is None:
+            transaction.data[key] = copy.deepcopy(dict(data))
+
+    @classmethod
+    @contextmanager
+    def transaction(cls) -> Iterator[Database]:
+        """Batches all mutations of the database.
+
+        While this context manager is active, `Database.save` and the automatic git commits of
+        `cobib.commands.base_command.Command.git` are deferred. Upon a successful exit, all changes
+        are written with a single call to `Database.save` and a single git commit (combining the
+        messages of all deferred ones) is made.
+        If an exception occurs, the runtime state of the database is restored to the state at the
+        start of the transaction and nothing gets written. This does not require re-reading the
+        database file, because the original entries get backed up upon their first access during the
+        transaction. Their data only gets copied once it gets modified.
+
+        ```python
+        from cobib.database import Database
+
+        with Database.transaction() as bib:
+            for entry in bib.values():
+                entry.tags = entry.tags + ["reviewed"]
+                bib.update({entry.label: entry})
+        ```
+
+        .. note::
+           Only changes to entries which are accessed through the `Database` *during* the
+           transaction can be restored. Nested transactions are merged into the outermost one.
+
+        Yields:
+            The `Database` instance.
+        """
+        _instance = cls()
+        if cls._transaction is not None:
+            yield _instance
+            return
+
+        LOGGER.debug("Starting a database transaction.")
+        cls._transaction = _Transaction(
+            list(_instance.keys()), dict(cls._unsaved_entries), dict(cls._journaled_entries)
+        )
+        EntryData.on_change = cls._backup_data
+        try:
+            yield _instance
+        except BaseException:
+            transaction, cls._transaction = cls._transaction, None
+            EntryData.on_change = None
+            _instance._rollback(transaction)
+            raise
+
+        transaction, cls._transaction = cls._transaction, None
+        EntryData.on_change = None
+        LOGGER.debug("Committing the database transaction.")
+        cls.save()
+        if transaction.commits:
+            # pylint: disable=import-outside-toplevel,cyclic-import
+            from cobib.commands.base_command import Command
+
+            msg = transaction.commits[0]
+            if len(transaction.commits) > 1:
+                msg = "Auto-commit: Transaction\n\n" + "\n\n".join(transaction.commits)
+            Command.git_commit(msg)
+
+    def _rollback(self, transaction: _Transaction) -> None:
+        """Restores the runtime state of the database at the start of a transaction.
+
+        Besides the entries, this restores the bookkeeping of unsaved and journaled entries and
+        clears all state derived from the entries, such that it gets rebuilt upon its next use.
+
+        Args:
+            transaction: the state of the transaction which to roll back.
+        """
+        LOGGER.warning("Rolling back the database transaction.")
+        current = OrderedDict(super().items())
+        super().clear()
+        for label in transaction.order:
+            original = transaction.backup.get(label, None)
+            if original is None:
+                if label not in current:
+                    LOGGER.error("Unable to restore the entry '%s' which was not backed up.", label)
+                    continue
+                entry = current[label]
+            elif isinstance(original, LazyEntry):
+                entry = original
+            else:
+                entry, original_label, data = original
+                entry.label = original_label
+                contents = transaction.data.get(id(data), None)
+                entry.data = data if contents is None else contents
+            super().__setitem__(label, entry)
+        Database._unsaved_entries = transaction.unsaved
+        Database._journaled_entries = transaction.journaled
+        Database._field_index.clear()
+        Database._schema.clear()
+        Database._search_index.clear()
+        Database._trigram_index.clear()
+        Database._changes = None
+
+    @classmethod
+    def defer_commit(cls, msg: str) -> bool:
+        """Defers a git commit until the end of the ongoing `Database.transaction`.
+
+        Args:
+            msg: the commit message.
+
+        Returns:
+            Whether a transaction is ongoing. If not, the commit was not deferred.
+        """
+        if cls._transaction is None:
+            return False
+        LOGGER.debug("Deferring the git commit until the end of the transaction.")
+        cls._transaction.commits.append(msg)
+        return True
+
     @classmethod
     def read(cls) -> None:
         """Reads the database file.
 
-        The YAML database file pointed to by the configuration file is read in and parsed.
-        This uses `cobib.parsers.YAMLParser` to parse the data.
+        The database file pointed to by the configuration file is read in by the storage backend
+        returned by `cobib.database.backends.get_backend`. Refer to the documentation of the
+        individual backends for more details.
         This function clears the contents of the singleton `Database` instance and resets
         `Database._unsaved_entries` to an empty dictionary. Thus, a call to this function
         *irreversibly* synchronizes the state of the runtime `Database` instance to the actually
         written contents of the database file on disc.
+        If a journal of the database file exists (see `cobib.database.journal`), the process which
+        wrote it must have died before compacting it. Thus, its mutations get replayed and compacted
+        into the database file.
         """
         if cls._instance is None:
             cls()
@@ -165,101 +641,198 @@ class Database(OrderedDict):  # type: ignore
         file = RelPath(config.database.file).path
         try:
             LOGGER.info("Loading database file: %s", file)
-            # pylint: disable=import-outside-toplevel
-            from cobib.parsers.yaml import YAMLParser
-
+            cls._backend = get_backend(file)
+            entries = cls._backend.read()
             _instance.clear()
-            _instance.update(YAMLParser().parse(file))
+            _instance.update(entries)
         except FileNotFoundError:
             LOGGER.critical("The database file %s does not exist! Please run `cobib init`!", file)
             sys.exit(1)
+        except ValueError as err:
+            LOGGER.critical(err)
+            sys.exit(1)
 
         cls._unsaved_entries.clear()
+        cls._journaled_entries.clear()
+        cls._changes = None
+
+        journal = Journal(file)
+        if journal.exists():
+            cls._replay(journal)
+
+    @classmethod
+    def _replay(cls, journal: Journal) -> None:
+        """Replays the mutations of a journal and compacts them into the database file.
+
+        Args:
+            journal: the journal which to replay.
+        """
+        # pylint: disable=import-outside-toplevel
+        from cobib.parsers.yaml import YAMLParser
+
+        _instance = cast(Database, cls._instance)
+        yml = YAMLParser()
+        mutations = journal.read()
+        LOGGER.warning(
+            "Replaying %d mutations from the database journal %s.", len(mutations), journal.path
+        )
+        for mutation in mutations:
+            if mutation.new is None or mutation.document is None:
+                if mutation.label in _instance:
+                    _instance.pop(mutation.label)
+                else:
+                    cls._unsaved_entries[mutation.label] = None
+                continue
+            if mutation.new != mutation.label and mutation.label in _instance:
+                _instance.rename(mutation.label, mutation.new)
+            _instance.update({mutation.new: yml.parse_document(mutation.document)})
+
+        cls._journaled_entries.update(cls._unsaved_entries)
+        cls._unsaved_entries.clear()
+        cls.compact()
 
     @classmethod
     def save(cls) -> None:
         """Saves all unsaved entries.
 
-        This uses `cobib.parsers.YAMLParser` to save all entries in `Database._unsaved_entries` to
-        disc. In doing so, this function preserves the order of the entries in the database file by
-        overwriting changed entries in-place and appending new entries to the end of the file.
-
-        The method of determining whether an entry was added, changed or removed is the following:
-        1. we read in the current database as written to disc.
-        2. we iterate all lines and determine the label of the entry we are currently on.
-        3. if this label is not in `Database._unsaved_entries` we continue.
-        4. Otherwise we query the runtime `Database` instance for the new contents of the unsaved
-           (and therefore changed) entry and remove the label from `Database._unsaved_entries`.
-        5. Using `Entry.save` and a `cobib.parsers.YAMLParser` we overwrite the previous lines of
-           the changed entry.
-        6. Finally, all labels still left in `Database._unsaved_entries` are newly added entries and
-           can simply be appended to the file.
-
-        In order to optimize performance and IO access, all of the above is done with a single call
-        to `write`.
+        This passes all entries in `Database._unsaved_entries` to the storage backend (see
+        `cobib.database.backends.base_backend.Backend.save`), which only writes the changed entries
+        while preserving the order of all others. Refer to the documentation of the individual
+        backends for more details.
+
+        If `cobib.config.config.DatabaseConfig.journal` is enabled, the unsaved entries only get
+        appended to the journal (see `cobib.database.journal`) instead. They are written to the
+        database file by `Database.compact`.
+
+        During a `Database.transaction`, this is deferred until the end of the transaction.
         """
         if cls._instance is None:
             cls()
         _instance = cast(Database, cls._instance)
 
+        if cls._transaction is not None:
+            LOGGER.debug("Deferring the saving of the database until the end of the transaction.")
+            return
+
+        if not config.database.journal:
+            cls._write()
+            return
+
         # pylint: disable=import-outside-toplevel
         from cobib.parsers.yaml import YAMLParser
 
+        file = RelPath(config.database.file).path
+        cls._load_indices(file)
+
         yml = YAMLParser()
+        mutations: List[Mutation] = []
+        for label, new_label in cls._unsaved_entries.items():
+            entry = None if new_label is None else _instance.get(new_label, None)
+            if entry is None:
+                mutations.append(Mutation(label, None, None))
+            else:
+                mutations.append(Mutation(label, new_label, entry.save(parser=yml)))
+
+        Journal(file).append(mutations)
+        # the database file remains unchanged but new fields may have been journaled
+        Database._schema.dump(file)
+        Database._search_index.dump(file)
+        # journaled entries are coalesced exactly like unsaved ones would be
+        cls._journaled_entries.update(cls._unsaved_entries)
+        cls._unsaved_entries.clear()
+
+        if not cls._compact_at_exit:
+            atexit.register(cls.compact)
+            cls._compact_at_exit = True
+
+    @classmethod
+    def compact(cls) -> None:
+        """Compacts the journal into the database file.
+
+        This writes all journaled (and unsaved) entries into the database file and removes the
+        journal afterwards (see `cobib.database.journal`). This does nothing if no entries have been
+        journaled.
+        """
+        if not cls._journaled_entries:
+            return
+        LOGGER.info("Compacting %d journaled entries.", len(cls._journaled_entries))
+        cls._write()
+
+    @classmethod
+    def _write(cls) -> None:
+        """Writes all journaled and unsaved entries into the database file via the storage backend.
+
+        The journal gets removed afterwards.
+        """
+        if cls._instance is None:
+            cls()
+        _instance = cast(Database, cls._instance)
 
         file = RelPath(config.database.file).path
-        with open(file, "r", encoding="utf-8") as bib:
-            lines = bib.readlines()
-
-        label_regex = re.compile(r"^([^:]+):$")
-
-        overwrite = False
-        cur_label: str = ""
-        buffer: List[str] = []
-        for line in lines:
-            try:
-                matches = label_regex.match(line)
-                if matches is None:
-                    raise AttributeError
-                new_label = matches.groups()[0]
-                if new_label in cls._unsaved_entries:
-                    LOGGER.debug('Entry "%s" found. Starting to replace lines.', new_label)
-                    overwrite = True
-                    cur_label = new_label
-                    continue
-            except AttributeError:
-                pass
-            if overwrite and line.startswith("..."):
-                LOGGER.debug('Reached end of entry "%s".', cur_label)
-                overwrite = False
-
-                new_label = cls._unsaved_entries.pop(cur_label)
-                entry = _instance.get(new_label, None)
-                if entry:
-                    LOGGER.debug('Writing modified entry "%s".', new_label)
-                    entry_str = entry.save(parser=yml)
-                    buffer.append("\n".join(entry_str.split("\n")[1:]))
-                else:
-                    # Entry has been deleted. Pop the previous `---` line.
-                    LOGGER.debug('Deleting entry "%s".', new_label)
-                    buffer.pop()
-                # we pop `new_label` too, because in case of a rename it differs from `cur_label`
-                if new_label is not None:
-                    cls._unsaved_entries.pop(new_label, None)
-            elif not overwrite:
-                # keep previous line
-                buffer.append(line)
-
-        if cls._unsaved_entries:
-            for label in cls._unsaved_entries.copy().values():
-                if label is None:
-                    # should never occur but we avoid a type exception
-                    continue
-                LOGGER.debug('Adding new entry "%s".', label)
-                entry_str = _instance[label].save(parser=yml)
-                buffer.append(entry_str)
-                cls._unsaved_entries.pop(label)
-
-        with open(file, "w", encoding="utf-8") as bib:
-            for line in buffer:
-                bib.write(line)
+        backend = cls._backend
+        if backend is None or backend.path != file:
+            backend = get_backend(file)
+            cls._backend = backend
+
+        cls._load_indices(file)
+
+        changes = {**cls._journaled_entries, **cls._unsaved_entries}
+        documents = {
+            label: None if new_label is None else _instance.get(new_label, None)
+            for label, new_label in changes.items()
+        }
+
+        for path in backend.save(documents, _instance):
+            cls._written_files[path] = None
+        cls._journaled_entries.clear()
+        cls._unsaved_entries.clear()
+
+        Journal(file).remove()
+        # the keys of the schema and the search index change along with the database file
+        cls._schema.dump(file)
+        cls._search_index.dump(file)
+
+    @classmethod
+    def pop_written_files(cls) -> List[Path]:
+        """Returns and forgets the files which have been written by `Database.save`.
+
+        This is used by `cobib.commands.base_command.Command.git` in order to only stage the files
+        which actually changed.
+
+        Returns:
+            The list of written files, in the order in which they were first written.
+        """
+        files = list(cls._written_files.keys())
+        cls._written_files.clear()
+        return files
+
+    @classmethod
+    def _record_change(cls, label: str, new_label: Optional[str]) -> None:
+        """Records the change of an entry for `Database.pop_changes`.
+
+        Args:
+            label: the (previous) label of the changed entry.
+            new_label: the new label of the entry or `None` if it was removed.
+        """
+        if cls._changes is None:
+            return
+        if label not in cls._changes and len(cls._changes) >= _MAX_CHANGES:
+            cls._changes = None
+            return
+        cls._changes[label] = new_label
+
+    @classmethod
+    def pop_changes(cls) -> Optional[Dict[str, Optional[str]]]:
+        """Returns and forgets the changes of the entries since the last call of this method.
+
+        This is used by the `cobib.ui.tui.TUI` in order to only update the changed rows of its list
+        of entries (see `cobib.commands.list_.ListCommand.patch_labels`).
+
+        Returns:
+            The dictionary of changed entries whose structure is identical to
+            `Database._unsaved_entries` or `None` if the entire database may have changed (for
+            example, because it was read anew).
+        """
+        changes = cls._changes
+        cls._changes = {}
+        return changes
@@ -5,12 +5,31 @@ from __future__ import annotations
 import logging
 import re
 import subprocess
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
+import sys
+from itertools import count
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from pylatexenc.latexencode import UnicodeToLatexEncoder
 
 from cobib.config import config
 from cobib.utils.rel_path import RelPath
+from cobib.utils.text_cache import TextCache
+
+from .filter_plan import FilterPlan
 
 if TYPE_CHECKING:
     import cobib.parsers
@@ -18,6 +37,101 @@ if TYPE_CHECKING:
 LOGGER = logging.getLogger(__name__)
 """@private module logger."""
 
+_VERSIONS = count(1)
+"""@private the source of the `EntryData.version` numbers which are unique across all instances."""
+
+
+class _Stringified(NamedTuple):
+    """A cached result of `Entry.stringify` along with the state from which it was computed."""
+
+    version: int
+    """The `EntryData.version` of the entry."""
+
+    label: str
+    """The label of the entry."""
+
+    revision: int
+    """The revision of the configuration (see `cobib.config.config._ConfigBase.revision`)."""
+
+    data: Dict[str, str]
+    """The stringified entry."""
+
+
+class EntryData(Dict[str, Any]):
+    """The dictionary which holds the `Entry.data`.
+
+    This behaves exactly like a regular `dict` but keeps track of its modifications via the
+    `version` number. This allows the `Entry` to cache its stringified representation (see
+    `Entry.stringify`) and others to cache anything derived from it.
+
+    .. note::
+       Modifying a (list-valued) field in-place cannot be tracked. Assign a new value instead.
+    """
+
+    __slots__ = ("version",)
+
+    on_change: ClassVar[Optional[Callable[[EntryData], None]]] = None
+    """An optional callback which gets called with an instance right before it gets modified. The
+    `Database.transaction` uses this in order to back up the original data of an entry only once it
+    actually changes."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initializes the dictionary like `dict` does."""
+        super().__init__(*args, **kwargs)
+        self.version: int = next(_VERSIONS)
+        """A number which changes upon every modification of this dictionary. It is unique across
+        all instances, such that it also identifies the dictionary of an entry."""
+
+    def _modify(self) -> None:
+        """Notifies the `on_change` callback and increases the `version` before a modification."""
+        if EntryData.on_change is not None:
+            EntryData.on_change(self)
+        self.version = next(_VERSIONS)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Sets an item like `dict` does."""
+        self._modify()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        """Deletes an item like `dict` does."""
+        self._modify()
+        super().__delitem__(key)
+
+    def __ior__(self, other: Any) -> EntryData:
+        """Updates the dictionary in-place like `dict` does."""
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Removes all items like `dict` does."""
+        self._modify()
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        """Removes an item like `dict` does."""
+        self._modify()
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Any]:
+        """Removes the last item like `dict` does."""
+        self._modify()
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        """Inserts an item if it is missing like `dict` does."""
+        self._modify()
+        return super().setdefault(key, default)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Updates the dictionary like `dict` does."""
+        self._modify()
+        super().update(*args, **kwargs)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickles the dictionary without its modification counter."""
+        return (self.__class__, (dict(self),))
+
 
 class Entry:
     """coBib's bibliographic entry.
@@ -37,46 +151,63 @@ class Entry:
     and querying.
     """
 
+    __slots__ = ("_label", "_data", "_stringified")
+
+    PROPERTIES: ClassVar[FrozenSet[str]] = frozenset({"label", "tags", "file", "url", "month"})
+    """The fields which are exposed as properties of this class. When these fields are set, they
+    are passed through the setters of their properties."""
+
+    lint: ClassVar[bool] = False
+    """Whether the lint messages about the data passed to `Entry.__init__` get logged. This gets
+    enabled by `cobib.utils.shell_helper.lint_database`."""
+
     def __init__(self, label: str, data: Dict[str, Any]) -> None:
         """Initializes a new Entry.
 
+        The field names get interned such that they are shared among all entries.
+
         Args:
             label: the label associated with this entry in the `Database`.
             data: the actual bibliographic data stored as a dictionary mapping free-form field names
                 (`str`) to any other data. Some fields are exposed as properties of this class for
                 convenience.
         """
-        LOGGER.debug("Initializing entry: %s", label)
-
         self._label: str = str(label)
 
-        self.data: Dict[str, Any] = {}
-        """The actual bibliographic data."""
+        self._data: EntryData = EntryData()
+
+        self._stringified: Optional[Dict[bool, _Stringified]] = None
+
+        lint = Entry.lint
+        # bypasses the modification tracking which is irrelevant during the initialization
+        store = dict.__setitem__
 
         for key, value in data.items():
-            if hasattr(self, key):
+            if key in self.PROPERTIES:
                 setattr(self, key, value)
             elif isinstance(value, str) and value.isnumeric():
-                LOGGER.info(
-                    "Converting field '%s' of entry '%s' to integer: %s.",
-                    key,
-                    label,
-                    value,
-                    extra={"entry": label, "field": key},
-                )
-                self.data[key] = int(value)
+                if lint:
+                    LOGGER.info(
+                        "Converting field '%s' of entry '%s' to integer: %s.",
+                        key,
+                        label,
+                        value,
+                        extra={"entry": label, "field": key},
+                    )
+                store(self._data, sys.intern(key), int(value))
             else:
-                self.data[key] = value
+                store(self._data, sys.intern(key), value)
 
         if "ID" in self.data:
             self.data.pop("ID")
-            LOGGER.info(
-                "The field '%s' of entry '%s' is no longer required. It will be inferred from the "
-                "entry label.",
-                "ID",
-                label,
-                extra={"entry": label, "field": "ID"},
-            )
+            if lint:
+                LOGGER.info(
+                    "The field '%s' of entry '%s' is no longer required. It will be inferred from "
+                    "the entry label.",
+                    "ID",
+                    label,
+                    extra={"entry": label, "field": "ID"},
+                )
 
     def __eq__(self, other: object) -> bool:
         """Checks equality of two entries."""
@@ -84,6 +215,34 @@ class Entry:
             return False
         return self.label == other.label and self.data == other.data
 
+    def __getstate__(self) -> Tuple[str, Dict[str, Any]]:
+        """Excludes the cached stringified representation from copies and pickles."""
+        return (self._label, dict(self._data))
+
+    def __setstate__(self, state: Tuple[str, Dict[str, Any]]) -> None:
+        """Restores the state returned by `__getstate__`."""
+        self._label, data = state
+        self._data = EntryData(data)
+        self._stringified = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The actual bibliographic data.
+
+        Assigning a regular dictionary to this property converts it to an `EntryData` instance.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, data: Dict[str, Any]) -> None:
+        """Sets the bibliographic data.
+
+        Args:
+            data: the dictionary of bibliographic data.
+        """
+        self._data = EntryData(data)
+        self._stringified = None
+
     @property
     def label(self) -> str:
         """The `Database` label of this entry."""
@@ -100,7 +259,18 @@ class Entry:
         self._label = str(label)
 
     def markup_label(self) -> str:
-        """Returns the label of this entry with the rich markup based on special tags."""
+        """Returns the label of this entry with the rich markup based on special tags.
+
+        This is cached along with the result of `Entry.stringify`.
+        """
+        return self._cached_stringify(True)["label"]
+
+    def _markup_label(self) -> str:
+        """Computes the label of this entry with the rich markup based on special tags.
+
+        Returns:
+            The marked up label.
+        """
         markup_label = self.label
 
         markup_tags: dict[str, int] = {}
@@ -245,19 +415,49 @@ class Entry:
     def stringify(self, *, markup: bool = False) -> Dict[str, str]:
         """Returns an identical entry to self but with all fields converted to strings.
 
+        The result is cached until the `data` or `label` of this entry or the relevant configuration
+        settings change. Each call returns a new copy of the cached dictionary.
+
         Args:
             markup: whether or not to add markup based on the configured special tags.
 
         Returns:
             An `Entry` with purely string fields.
         """
+        return dict(self._cached_stringify(markup))
+
+    def _cached_stringify(self, markup: bool) -> Dict[str, str]:
+        """Returns the cached result of `stringify` which must *not* be modified.
+
+        Args:
+            markup: whether or not to add markup based on the configured special tags.
+
+        Returns:
+            The cached string fields.
+        """
+        separators = config.database.stringify.list_separator
+
+        if self._stringified is None:
+            self._stringified = {}
+        cached = self._stringified.get(markup, None)
+        if (
+            cached is not None
+            and cached.version == self._data.version
+            and cached.label == self._label
+            and cached.revision == config.revision
+        ):
+            return cached.data
+
         data = {}
-        data["label"] = self.markup_label() if markup else self.label
+        data["label"] = self._markup_label() if markup else self.label
         for field, value in self.data.items():
-            if isinstance(value, list) and hasattr(config.database.stringify.list_separator, field):
-                data[field] = getattr(config.database.stringify.list_separator, field).join(value)
+            if isinstance(value, list) and hasattr(separators, field):
+                data[field] = getattr(separators, field).join(value)
             else:
                 data[field] = str(value)
+        self._stringified[markup] = _Stringified(
+            self._data.version, self._label, config.revision, data
+        )
         return data
 
     def escape_special_chars(self, suppress_warnings: bool = True) -> None:
@@ -312,7 +512,10 @@ class Entry:
         return parser.dump(self) or ""  # `dump` may return `None`
 
     def matches(
-        self, filter_: Dict[Tuple[str, bool], List[str]], or_: bool, ignore_case: bool = False
+        self,
+        filter_: Union[Dict[Tuple[str, bool], List[str]], FilterPlan],
+        or_: bool = False,
+        ignore_case: bool = False,
     ) -> bool:
         """Check whether this entry matches the supplied filter.
 
@@ -333,32 +536,31 @@ class Entry:
         | `{('year', True): ['2020', '2021']}`  | True     | `year` contains either 2020 or 2021   |
         | `{('year', True): ['2020', '2021']}`  | False    | cannot match anything                 |
         | `{('year', False): ['2020', '2021']}` | False    | `year` contains neither 2020 nor 2021 |
+        | `{('year', True): ['2015..2020']}`    | *either* | `year` lies between 2015 and 2020     |
+        | `{('year', False): ['..2010']}`       | *either* | `year` does not lie below 2010        |
+
+        Values of the form `start..end` (where either bound may be omitted) are not interpreted as
+        regex patterns but as inclusive numeric ranges (see
+        `cobib.database.field_index.parse_range`). Fields with non-numeric values never lie within
+        a range.
+
+        When checking many entries against the same filter, it should be compiled into a
+        `cobib.database.filter_plan.FilterPlan` once and passed instead of the dictionary.
 
         Args:
-            filter_: dictionary describing the filter as explained above.
+            filter_: dictionary describing the filter as explained above or a compiled plan thereof.
             or_ : boolean indicating whether logical OR (`true`) or AND (`false`) is used to combine
-                multiple filter items.
-            ignore_case: if True, the matching will be case-*in*sensitive.
+                multiple filter items. This is ignored when `filter_` is a compiled plan.
+            ignore_case: if True, the matching will be case-*in*sensitive. This is ignored when
+                `filter_` is a compiled plan.
 
         Returns:
             Boolean indicating whether this entry matches the filter.
         """
         LOGGER.debug("Checking whether entry %s matches.", self.label)
-        re_flags = re.IGNORECASE if ignore_case else 0
-        match_list = []
-        stringified_data = self.stringify()
-        for key, values in filter_.items():
-            if key[0] not in stringified_data:
-                match_list.append(not key[1])
-                continue
-            for val in values:
-                if re.search(rf"{val}", stringified_data[key[0]], flags=re_flags):
-                    match_list.append(key[1])
-                else:
-                    match_list.append(not key[1])
-        if or_:
-            return any(m for m in match_list)
-        return all(m for m in match_list)
+        if not isinstance(filter_, FilterPlan):
+            filter_ = FilterPlan(filter_, or_, ignore_case)
+        return filter_.evaluate(self._cached_stringify(False))
 
     def search(
         self,
@@ -366,6 +568,7 @@ class Entry:
         context: int = 1,
         ignore_case: bool = False,
         skip_files: bool = False,
+        file_matches: Optional[Mapping[str, Mapping[Path, List[List[str]]]]] = None,
     ) -> List[List[str]]:
         """Search entry contents for the query strings.
 
@@ -374,7 +577,8 @@ class Entry:
         `query` and will interpret these as regex patterns.
         If a `file` is associated with this entry, the search will try its best to recursively query
         its contents, too. However, the success of this depends highly on the configured search
-        tool, `cobib.config.config.SearchCommandConfig.grep`.
+        tool, `cobib.config.config.SearchCommandConfig.grep`. Unless it is disabled, the search
+        tool runs on the text cached by the `cobib.utils.text_cache.TextCache`.
 
         Args:
             query: the list of regex patterns to search for.
@@ -382,6 +586,10 @@ class Entry:
                 to the *Context Line Control* available for the UNIX `grep` command (`--context`).
             ignore_case: if True, the search will be case-*in*sensitive.
             skip_files: if True, associated files will *not* be searched.
+            file_matches: the matches of the associated files which have been searched already,
+                keyed by the query and the resolved path of the file (see
+                `cobib.utils.grep.grep_files`). When this is provided, the associated files do not
+                get searched again.
 
         Returns:
             A list of lists containing the context for each match associated with this entry.
@@ -392,6 +600,7 @@ class Entry:
         from cobib.parsers.bibtex import BibtexParser
 
         bibtex = BibtexParser().dump(self).split("\n")
+        text_cache = None if skip_files or file_matches is not None else TextCache.from_config()
         re_flags = re.IGNORECASE if ignore_case else 0
         for query_str in query:
             re_compiled = re.compile(rf"{query_str}", flags=re_flags)
@@ -426,6 +635,13 @@ class Entry:
                     )
                     continue
 
+                if file_matches is not None:
+                    matches.extend(file_matches.get(query_str, {}).get(path, []))
+                    continue
+
+                if text_cache is not None:
+                    path = text_cache.get(path) or path
+
                 LOGGER.debug("Searching associated file %s with %s", file_, grep_prog)
                 with subprocess.Popen(
                     [
@@ -433,7 +649,7 @@ class Entry:
                         *config.commands.search.grep_args,
                         f"-C{context}",
                         query_str,
-                        RelPath(file_).path,
+                        path,
                     ],
                     stdout=subprocess.PIPE,
                 ) as grep:
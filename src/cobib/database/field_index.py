@@ -0,0 +1,577 @@
+"""coBib's field-value index.
+
+Filtering the database (see `cobib.commands.list_.ListCommand.filter_entries`) used to convert every
+single entry to strings and to match each filter against them. However, the outcome of a filter only
+depends on the stringified value of the filtered field and most fields (for example `year`, `tags`
+or `ENTRYTYPE`) only take on a small number of *distinct* values throughout the database.
+
+Thus, the `FieldIndex` maps every field to its distinct stringified values and each of those to the
+set of labels of the entries which carry it. A filter is then evaluated as follows:
+1. a literal filter (one without any regex special characters) is checked for containment within
+   each distinct value of the field, only.
+2. an anchored filter (`^prefix` or `^value$`) is answered from the sorted distinct values of the
+   field via bisection (or by a direct lookup, respectively).
+3. a numeric range filter (`start..end`, where either bound may be omitted) is answered from the
+   numerically sorted values of the field via bisection (see `parse_range`).
+4. any other regex pattern falls back to being searched for in each distinct value of the field.
+The labels associated with the matching values are combined using set unions and intersections.
+
+The index also serves the sorting of the database (see `FieldIndex.sort`): the distinct values of a
+field get ranked once and entries are sorted by the ranks of their values. A new distinct value gets
+ranked in between its neighbours, such that the ranks of all other values (and thereby the cached
+sort keys of the entries) remain valid.
+
+The index gets built upon its first use and is kept up-to-date incrementally by
+`cobib.database.Database.update`, `cobib.database.Database.pop` and
+`cobib.database.Database.rename`.
+
+.. warning::
+   Since the index stores the stringified values, any modification of an `cobib.database.Entry`
+   must be registered with `cobib.database.Database.update` in order to be reflected by it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import logging
+import math
+import re
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from cobib.config import config
+
+if TYPE_CHECKING:
+    import cobib.database
+    import cobib.database.filter_plan
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+"""@private the characters which have a special meaning in a regex pattern."""
+
+
+_NUMBER = r"-?\d+(?:\.\d+)?"
+"""@private the regex pattern of a number."""
+
+_NUMBER_REGEX = re.compile(rf"\s*({_NUMBER})\s*")
+"""@private the regex matching a numeric field value."""
+
+_RANGE_REGEX = re.compile(rf"({_NUMBER})?\.\.({_NUMBER})?")
+"""@private the regex matching a numeric range filter."""
+
+_MAX_SORT_KEYS = 8
+"""@private the maximum number of combinations of fields whose sort keys are cached."""
+
+_EMPTY_SORT_KEY = (0, 0.0, "")
+"""@private the `sort_key` of an empty value. Its rank is 0, just like that of a missing value."""
+
+
+def _is_literal(pattern: str) -> bool:
+    """@private Returns whether a pattern does not contain any regex special characters."""
+    return not _REGEX_SPECIAL_CHARS.intersection(pattern)
+
+
+def _to_number(value: str) -> Optional[float]:
+    """@private Returns the numeric value of a stringified field or `None` if it is not numeric."""
+    match = _NUMBER_REGEX.fullmatch(value)
+    return None if match is None else float(match.group(1))
+
+
+def parse_range(pattern: str) -> Optional[Tuple[float, float]]:
+    """Parses a numeric range filter.
+
+    A range filter takes the form `start..end` where both bounds are inclusive and either one of
+    them (but not both) may be omitted. For example, `2015..2020`, `..2010` or `2015..`.
+
+    Args:
+        pattern: the filter pattern.
+
+    Returns:
+        The pair of lower and upper bound (which default to infinity) or `None` if the pattern is
+        not a range filter.
+    """
+    match = _RANGE_REGEX.fullmatch(pattern)
+    if match is None or match.group(1) is match.group(2) is None:
+        return None
+    lower, upper = match.groups()
+    return (
+        -math.inf if lower is None else float(lower),
+        math.inf if upper is None else float(upper),
+    )
+
+
+def sort_key(value: str) -> Tuple[int, float, str]:
+    """Returns the key by which a stringified field value gets sorted.
+
+    Empty values come first, followed by numeric values (which are sorted numerically) and all other
+    values (which are sorted case-insensitively).
+
+    Args:
+        value: the stringified field value.
+
+    Returns:
+        The sort key.
+    """
+    if not value:
+        return (0, 0.0, "")
+    number = _to_number(value)
+    if number is not None:
+        return (1, number, "")
+    return (2, 0.0, value.casefold())
+
+
+def in_range(value: str, bounds: Tuple[float, float]) -> bool:
+    """Returns whether a stringified field value lies within a numeric range.
+
+    Args:
+        value: the stringified field value.
+        bounds: the inclusive range as returned by `parse_range`.
+
+    Returns:
+        Whether the value is numeric and lies within the range.
+    """
+    number = _to_number(value)
+    return number is not None and bounds[0] <= number <= bounds[1]
+
+
+class FieldIndex:
+    """coBib's field-value index.
+
+    This is an inverted index mapping every field to the distinct stringified values it takes on and
+    each of those to the labels of the entries which carry it.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._built: bool = False
+        """Whether the index has been built."""
+
+        self._separators: Optional[Tuple[Tuple[str, Any], ...]] = None
+        """The list separators with which the index was built. The stringified values depend on
+        these, which is why the index gets rebuilt when they change."""
+
+        self._postings: Dict[str, Dict[str, Set[str]]] = {}
+        """The dictionary mapping fields to their values and those to the labels carrying them."""
+
+        self._values: Dict[str, Dict[str, str]] = {}
+        """The dictionary mapping labels to the indexed values of their entries."""
+
+        self._sorted: Dict[str, List[str]] = {}
+        """The sorted distinct values of those fields which have been queried by prefix."""
+
+        self._ranks: Dict[str, Dict[str, float]] = {}
+        """The sort ranks of the distinct values of those fields which have been sorted by. These
+        are updated incrementally."""
+
+        self._rank_order: Dict[str, List[Tuple[Tuple[int, float, str], str]]] = {}
+        """The distinct values of the ranked fields along with their `sort_key`, in sorted order."""
+
+        self._sort_keys: Dict[Tuple[Tuple[str, bool], ...], Dict[str, Tuple[float, ...]]] = {}
+        """The sort keys of all labels for those combinations of fields which have been sorted by.
+        These are updated incrementally."""
+
+        self._numeric: Dict[str, Tuple[List[float], List[str]]] = {}
+        """The numerically sorted values of those fields which have been queried by range, along
+        with the labels carrying them. These are updated incrementally."""
+
+    @staticmethod
+    def _current_separators() -> Tuple[Tuple[str, Any], ...]:
+        """Returns the currently configured list separators.
+
+        Returns:
+            The sorted pairs of fields and their list separators.
+        """
+        return tuple(sorted(vars(config.database.stringify.list_separator).items()))
+
+    @property
+    def built(self) -> bool:
+        """Whether the index has been built and is still valid."""
+        return self._built and self._separators == self._current_separators()
+
+    def clear(self) -> None:
+        """Clears the index. It will be rebuilt upon its next use."""
+        self._built = False
+        self._postings.clear()
+        self._values.clear()
+        self._sorted.clear()
+        self._ranks.clear()
+        self._rank_order.clear()
+        self._sort_keys.clear()
+        self._numeric.clear()
+
+    def build(self, entries: Iterable[Tuple[str, cobib.database.Entry]]) -> None:
+        """Builds the index.
+
+        Args:
+            entries: the pairs of labels and entries which to index.
+        """
+        self.clear()
+        self._separators = self._current_separators()
+        count = 0
+        for label, entry in entries:
+            self.add(label, entry)
+            count += 1
+        self._built = True
+        LOGGER.debug("Indexed the field values of %d entries.", count)
+
+    def add(self, label: str, entry: cobib.database.Entry) -> None:
+        """Adds (or replaces) an entry in the index.
+
+        Args:
+            label: the label under which the entry is stored in the database.
+            entry: the entry.
+        """
+        self.remove(label)
+        values = entry.stringify()
+        self._values[label] = values
+        for field, value in values.items():
+            postings = self._postings.setdefault(field, {})
+            if value not in postings:
+                postings[value] = set()
+                self._add_value(field, value)
+            postings[value].add(label)
+            if field in self._numeric:
+                number = _to_number(value)
+                if number is not None:
+                    numbers, labels = self._numeric[field]
+                    idx = bisect.bisect_right(numbers, number)
+                    numbers.insert(idx, number)
+                    labels.insert(idx, label)
+        for keys, sort_keys in self._sort_keys.items():
+            sort_keys[label] = self._sort_key(label, keys)
+
+    def remove(self, label: str) -> None:
+        """Removes an entry from the index.
+
+        Args:
+            label: the label under which the entry was stored in the database.
+        """
+        values = self._values.pop(label, None)
+        if values is None:
+            return
+        for field, value in values.items():
+            postings = self._postings[field]
+            postings[value].discard(label)
+            if not postings[value]:
+                del postings[value]
+                self._remove_value(field, value)
+            if field in self._numeric:
+                number = _to_number(value)
+                if number is not None:
+                    numbers, labels = self._numeric[field]
+                    idx = bisect.bisect_left(numbers, number)
+                    while labels[idx] != label:
+                        idx += 1
+                    del numbers[idx]
+                    del labels[idx]
+        for sort_keys in self._sort_keys.values():
+            sort_keys.pop(label, None)
+
+    def _add_value(self, field: str, value: str) -> None:
+        """Inserts a new distinct value of a field into the cached orders of its values.
+
+        The value gets ranked in between its neighbours. Only if the precision of the ranks does not
+        suffice to do so, the ranks of the field get dropped and recomputed upon their next use.
+
+        Args:
+            field: the field.
+            value: the new distinct value.
+        """
+        if field in self._sorted:
+            bisect.insort(self._sorted[field], value)
+        if field not in self._ranks:
+            return
+        ranks, order = self._ranks[field], self._rank_order[field]
+        key = sort_key(value)
+        idx = bisect.bisect_left(order, (key,))
+        if key == _EMPTY_SORT_KEY:
+            rank: float = 0
+        elif idx < len(order) and order[idx][0] == key:
+            rank = ranks[order[idx][1]]
+        else:
+            lower = ranks[order[idx - 1][1]] if idx > 0 else 0
+            upper = ranks[order[idx][1]] if idx < len(order) else lower + 2
+            rank = (lower + upper) / 2
+            if not lower < rank < upper:
+                LOGGER.debug("Re-ranking the values of '%s'.", field)
+                self._ranks.pop(field)
+                self._rank_order.pop(field)
+                for keys in [keys for keys in self._sort_keys if any(f == field for f, _ in keys)]:
+                    del self._sort_keys[keys]
+                return
+        bisect.insort(order, (key, value))
+        ranks[value] = rank
+
+    def _remove_value(self, field: str, value: str) -> None:
+        """Removes a distinct value of a field from the cached orders of its values.
+
+        Args:
+            field: the field.
+            value: the value which no entry carries anymore.
+        """
+        if field in self._sorted:
+            values = self._sorted[field]
+            del values[bisect.bisect_left(values, value)]
+        if field in self._ranks:
+            order = self._rank_order[field]
+            del order[bisect.bisect_left(order, (sort_key(value), value))]
+            del self._ranks[field][value]
+
+    def labels(self) -> Set[str]:
+        """Returns the set of all indexed labels.
+
+        Returns:
+            The set of all indexed labels.
+        """
+        return set(self._values.keys())
+
+    def match(self, field: str, pattern: str, ignore_case: bool = False) -> Set[str]:
+        """Returns the labels of all entries whose field matches the given pattern.
+
+        This is equivalent to searching for the pattern in the stringified field of every entry (see
+        `cobib.database.Entry.matches`) but only needs to check the distinct values of the field.
+
+        Args:
+            field: the field to match against.
+            pattern: the regex pattern which to search for.
+            ignore_case: if True, the matching will be case-*in*sensitive.
+
+        Returns:
+            The set of labels of the matching entries.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from .filter_plan import FilterClause
+
+        return self._match(FilterClause.compile(field, True, pattern, ignore_case), ignore_case)
+
+    def _match(
+        self, clause: cobib.database.filter_plan.FilterClause, ignore_case: bool
+    ) -> Set[str]:
+        """Returns the labels of all entries whose field matches the pattern of a filter clause.
+
+        Args:
+            clause: the compiled filter clause. Its `positive` attribute is not taken into account.
+            ignore_case: whether the clause was compiled to match case-*in*sensitively.
+
+        Returns:
+            The set of labels of the matching entries.
+        """
+        field, pattern = clause.field, clause.pattern
+        if clause.bounds is not None:
+            LOGGER.debug("Matching the range '%s' against the values of '%s'.", pattern, field)
+            return self._ranged(field, clause.bounds)
+
+        postings = self._postings.get(field, {})
+
+        if not ignore_case and _is_literal(pattern):
+            LOGGER.debug("Matching the literal '%s' against the values of '%s'.", pattern, field)
+            matching: Iterable[str] = [value for value in postings if pattern in value]
+        elif not ignore_case and pattern.startswith("^") and _is_literal(pattern[1:]):
+            LOGGER.debug("Matching the prefix '%s' against the values of '%s'.", pattern, field)
+            matching = self._prefixed(field, pattern[1:])
+        elif (
+            not ignore_case
+            and pattern.startswith("^")
+            and pattern.endswith("$")
+            and _is_literal(pattern[1:-1])
+        ):
+            LOGGER.debug("Looking up the value '%s' of '%s'.", pattern, field)
+            # `$` also matches right before a trailing newline
+            matching = [val for val in (pattern[1:-1], pattern[1:-1] + "\n") if val in postings]
+        else:
+            LOGGER.debug("Searching the values of '%s' for the pattern '%s'.", field, pattern)
+            matching = [value for value in postings if clause.search(value)]
+
+        labels: Set[str] = set()
+        for value in matching:
+            labels |= postings[value]
+        return labels
+
+    def _prefixed(self, field: str, prefix: str) -> List[str]:
+        """Returns the distinct values of a field which start with the given prefix.
+
+        Args:
+            field: the field whose values to check.
+            prefix: the prefix.
+
+        Returns:
+            The list of values starting with the prefix.
+        """
+        if field not in self._sorted:
+            self._sorted[field] = sorted(self._postings.get(field, {}).keys())
+        values = self._sorted[field]
+        start = bisect.bisect_left(values, prefix)
+        end = start
+        while end < len(values) and values[end].startswith(prefix):
+            end += 1
+        return values[start:end]
+
+    def _ranged(self, field: str, bounds: Tuple[float, float]) -> Set[str]:
+        """Returns the labels of all entries whose numeric field value lies within a range.
+
+        Args:
+            field: the field whose values to check.
+            bounds: the inclusive range as returned by `parse_range`.
+
+        Returns:
+            The set of labels of the matching entries.
+        """
+        if field not in self._numeric:
+            pairs = sorted(
+                (number, label)
+                for value, labels in self._postings.get(field, {}).items()
+                for number in (_to_number(value),)
+                if number is not None
+                for label in labels
+            )
+            self._numeric[field] = ([number for number, _ in pairs], [label for _, label in pairs])
+        numbers, labels = self._numeric[field]
+        start = bisect.bisect_left(numbers, bounds[0])
+        end = bisect.bisect_right(numbers, bounds[1])
+        return set(labels[start:end])
+
+    def _ranked(self, field: str) -> Dict[str, float]:
+        """Returns the sort ranks of the distinct values of a field.
+
+        The values are ordered by `sort_key` and ranked starting from 1, except for an empty value
+        which shares the rank 0 with a missing value. Values with equal sort keys share the same
+        rank.
+
+        Args:
+            field: the field whose values to rank.
+
+        Returns:
+            The dictionary mapping the distinct values of the field to their rank.
+        """
+        if field not in self._ranks:
+            order = sorted((sort_key(value), value) for value in self._postings.get(field, {}))
+            ranks: Dict[str, float] = {}
+            rank, previous = 0, _EMPTY_SORT_KEY
+            for key, value in order:
+                if key != previous:
+                    rank, previous = rank + 1, key
+                ranks[value] = rank
+            self._ranks[field] = ranks
+            self._rank_order[field] = order
+        return self._ranks[field]
+
+    def sort(
+        self,
+        labels: Iterable[str],
+        keys: List[Tuple[str, bool]],
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """Sorts the labels of indexed entries by their field values.
+
+        The entries are sorted by the first field and ties are broken by the subsequent ones (see
+        `sort_key` for how the values are compared). Entries which do not have a field are treated
+        like those with an empty value and precede all others. Any remaining ties retain their
+        provided order.
+
+        Only the distinct values of each field get sorted, the entries themselves are sorted by the
+        ranks of their values. Both of these are cached and kept up-to-date when entries get added
+        or removed. Thus, sorting by the same fields repeatedly only needs to look up the cached
+        sort key of every label.
+
+        Args:
+            labels: the labels of the entries which to sort.
+            keys: the pairs of fields and whether to sort by them in descending order.
+            reverse: whether to reverse the entire order.
+            limit: if provided, only this many labels get returned. These are selected via a heap
+                (see `heapq.nsmallest`) which avoids sorting all labels.
+
+        Returns:
+            The sorted labels.
+        """
+        spec = tuple(keys)
+        if spec not in self._sort_keys:
+            LOGGER.debug("Computing the sort keys for %s.", spec)
+            if len(self._sort_keys) >= _MAX_SORT_KEYS:
+                # drop the sort keys which were computed first
+                del self._sort_keys[next(iter(self._sort_keys))]
+            self._sort_keys[spec] = {label: self._sort_key(label, spec) for label in self._values}
+        key = self._sort_keys[spec].__getitem__
+        if limit is not None:
+            # these are equivalent to `sorted(...)[:limit]` (including the order of ties)
+            if reverse:
+                return heapq.nlargest(limit, labels, key=key)
+            return heapq.nsmallest(limit, labels, key=key)
+        return sorted(labels, key=key, reverse=reverse)
+
+    def rank(self, label: str, keys: List[Tuple[str, bool]]) -> Tuple[float, ...]:
+        """Returns the key by which `FieldIndex.sort` orders an indexed entry.
+
+        Args:
+            label: the label of the entry.
+            keys: the pairs of fields and whether to sort by them in descending order.
+
+        Returns:
+            The sort key of the entry. It is only comparable to those of other entries as long as
+            the index does not change.
+        """
+        spec = tuple(keys)
+        sort_keys = self._sort_keys.get(spec, None)
+        if sort_keys is not None:
+            return sort_keys[label]
+        return self._sort_key(label, spec)
+
+    def _sort_key(self, label: str, keys: Tuple[Tuple[str, bool], ...]) -> Tuple[float, ...]:
+        """Returns the key by which an indexed entry gets sorted.
+
+        Args:
+            label: the label of the entry.
+            keys: the pairs of fields and whether to sort by them in descending order.
+
+        Returns:
+            The tuple of (possibly negated) ranks of the values of the entry.
+        """
+        values = self._values[label]
+        key = []
+        for field, descending in keys:
+            value = values.get(field, None)
+            rank = 0 if not value else self._ranked(field)[value]
+            key.append(-rank if descending else rank)
+        return tuple(key)
+
+    def filter(
+        self,
+        filter_: Union[Dict[Tuple[str, bool], List[str]], cobib.database.filter_plan.FilterPlan],
+        or_: bool = False,
+        ignore_case: bool = False,
+    ) -> Set[str]:
+        """Returns the labels of all entries which match the supplied filter.
+
+        This is equivalent to `cobib.database.Entry.matches` (refer to it for an explanation of the
+        arguments) applied to every indexed entry. The evaluation stops early once no more labels
+        can be removed from (for logical ANDs) or added to (for logical ORs) the result.
+
+        Args:
+            filter_: dictionary describing the filter or a compiled plan thereof.
+            or_ : boolean indicating whether logical OR (`true`) or AND (`false`) is used to combine
+                multiple filter items. This is ignored when `filter_` is a compiled plan.
+            ignore_case: if True, the matching will be case-*in*sensitive. This is ignored when
+                `filter_` is a compiled plan.
+
+        Returns:
+            The set of labels of the matching entries.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from .filter_plan import FilterPlan
+
+        if not isinstance(filter_, FilterPlan):
+            filter_ = FilterPlan(filter_, or_, ignore_case)
+
+        everything = self.labels()
+        result: Set[str] = set() if filter_.or_ else everything
+        for (_, positive), clauses in filter_.clauses.items():
+            for clause in clauses:
+                labels = self._match(clause, filter_.ignore_case)
+                if not positive:
+                    labels = everything - labels
+                result = result | labels if filter_.or_ else result & labels
+                if len(result) == (len(everything) if filter_.or_ else 0):
+                    return result
+        return result
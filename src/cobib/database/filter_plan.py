@@ -0,0 +1,153 @@
+"""coBib's compiled filters.
+
+The filters of the `cobib.commands.list_.ListCommand` (which are also used by the `search`, `modify`
+and `export` commands as well as the preset filters of the TUI) are specified as a dictionary (see
+`cobib.database.Entry.matches` for an explanation of its format). Evaluating such a dictionary
+directly requires its values to be parsed and compiled as regex patterns over and over again.
+
+Instead, a `FilterPlan` gets compiled once from such a dictionary. It holds the precompiled
+patterns (or the parsed numeric ranges, see `cobib.database.field_index.parse_range`) of all its
+`FilterClause` items and knows which fields it touches. A plan can be evaluated against single
+entries via `FilterPlan.matches` or against the whole database via
+`cobib.database.field_index.FieldIndex.filter`. In both cases, the evaluation stops as soon as the
+outcome is known: the first failing clause decides a logical AND and the first succeeding clause
+decides a logical OR.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from .field_index import in_range, parse_range
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+
+class FilterClause(NamedTuple):
+    """A single compiled item of a filter."""
+
+    field: str
+    """The field to match against."""
+
+    positive: bool
+    """Whether a positive (`True`) or negative (`False`) match is required."""
+
+    pattern: str
+    """The raw filter value."""
+
+    bounds: Optional[Tuple[float, float]]
+    """The numeric range if the `pattern` is a range filter."""
+
+    regex: Optional[re.Pattern[str]]
+    """The compiled regex if the `pattern` is *not* a range filter."""
+
+    @classmethod
+    def compile(
+        cls, field: str, positive: bool, pattern: str, ignore_case: bool = False
+    ) -> FilterClause:
+        """Compiles a single filter value.
+
+        Args:
+            field: the field to match against.
+            positive: whether a positive (`True`) or negative (`False`) match is required.
+            pattern: the filter value.
+            ignore_case: if True, the matching will be case-*in*sensitive.
+
+        Returns:
+            The compiled filter clause.
+        """
+        bounds = parse_range(pattern)
+        regex = None
+        if bounds is None:
+            regex = re.compile(pattern, flags=re.IGNORECASE if ignore_case else 0)
+        return cls(field, positive, pattern, bounds, regex)
+
+    def search(self, value: str) -> bool:
+        """Returns whether the stringified field value matches the pattern of this clause.
+
+        Note, that this does not take `positive` into account.
+
+        Args:
+            value: the stringified field value.
+
+        Returns:
+            Whether the value matches.
+        """
+        if self.bounds is not None:
+            return in_range(value, self.bounds)
+        return self.regex.search(value) is not None  # type: ignore[union-attr]
+
+
+class FilterPlan:
+    """A compiled filter."""
+
+    def __init__(
+        self, filter_: Dict[Tuple[str, bool], List[str]], or_: bool, ignore_case: bool = False
+    ) -> None:
+        """Compiles a filter.
+
+        Args:
+            filter_: dictionary describing the filter as explained in
+                `cobib.database.Entry.matches`.
+            or_ : boolean indicating whether logical OR (`true`) or AND (`false`) is used to combine
+                multiple filter items.
+            ignore_case: if True, the matching will be case-*in*sensitive.
+        """
+        self.or_: bool = or_
+        """Whether the clauses are combined with logical ORs (rather than ANDs)."""
+
+        self.ignore_case: bool = ignore_case
+        """Whether the matching is case-*in*sensitive."""
+
+        self.clauses: Dict[Tuple[str, bool], List[FilterClause]] = {
+            (field, positive): [
+                FilterClause.compile(field, positive, value, ignore_case) for value in values
+            ]
+            for (field, positive), values in filter_.items()
+        }
+        """The compiled clauses, grouped by their filter key."""
+
+        self.fields: Tuple[str, ...] = tuple(dict.fromkeys(field for field, _ in filter_))
+        """The fields which are touched by this filter."""
+
+        LOGGER.debug("Compiled a filter plan on the fields %s.", self.fields)
+
+    def evaluate(self, values: Mapping[str, str]) -> bool:
+        """Evaluates this plan on the stringified fields of an entry.
+
+        Args:
+            values: the stringified entry (see `cobib.database.Entry.stringify`).
+
+        Returns:
+            Whether the entry matches.
+        """
+        # the first outcome which equals `or_` decides the result
+        decisive = self.or_
+        for (field, positive), clauses in self.clauses.items():
+            value = values.get(field, None)
+            if value is None:
+                # a missing field never matches
+                if (not positive) == decisive:
+                    return decisive
+                continue
+            for clause in clauses:
+                if (clause.search(value) == positive) == decisive:
+                    return decisive
+        return not decisive
+
+    def matches(self, entry: cobib.database.Entry) -> bool:
+        """Returns whether an entry matches this plan.
+
+        Args:
+            entry: the entry to check.
+
+        Returns:
+            Whether the entry matches.
+        """
+        return entry.matches(self)
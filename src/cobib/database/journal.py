@@ -0,0 +1,110 @@
+"""coBib's database journal.
+
+Writing the changed entries into the database file requires (at least partially) rewriting it. When
+`cobib.config.config.DatabaseConfig.journal` is enabled, `cobib.database.Database.save` instead only
+appends the pending mutations to an append-only journal file next to the database file. This makes
+saving cheap and crash-safe, such that it can be done after every single operation.
+
+The journaled mutations are written into the database file during *compaction* (see
+`cobib.database.Database.compact`), after which the journal gets removed. This happens:
+* right before an automatic git commit (see `cobib.commands.base_command.Command.git`),
+* when the Python process exits normally,
+* and when the database is read. If the process died before compacting the journal, the journaled
+  mutations are replayed on top of the database file and compacted automatically.
+
+Every line of the journal is a JSON object describing a single mutation of an entry: its previous
+`label`, its `new` label (or `null` if it was deleted) and its YAML `document` (as written by
+`cobib.parsers.YAMLParser`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+
+class Mutation(NamedTuple):
+    """A single journaled mutation of an entry."""
+
+    label: str
+    """The previous label of the entry."""
+
+    new: Optional[str]
+    """The new label of the entry or `None` if it was deleted."""
+
+    document: Optional[str]
+    """The YAML document of the entry or `None` if it was deleted."""
+
+
+class Journal:
+    """coBib's database journal."""
+
+    SUFFIX = ".journal"
+    """The suffix which is appended to the name of the database file to obtain the journal file."""
+
+    def __init__(self, file: Path) -> None:
+        """Initializes the journal of a database file.
+
+        Args:
+            file: the path to the database file (or the directory of a sharded database).
+        """
+        self.path: Path = file.parent / (file.name + self.SUFFIX)
+        """The path to the journal file."""
+
+    def exists(self) -> bool:
+        """Returns whether the journal contains any mutations.
+
+        Returns:
+            Whether the journal file exists.
+        """
+        return self.path.exists()
+
+    def append(self, mutations: List[Mutation]) -> None:
+        """Appends mutations to the journal.
+
+        The journal file gets synchronized to disc before this method returns.
+
+        Args:
+            mutations: the mutations which to append.
+        """
+        if not mutations:
+            return
+        LOGGER.debug("Journaling %d mutations in %s.", len(mutations), self.path)
+        lines = "".join(json.dumps(mutation._asdict()) + "\n" for mutation in mutations)
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.write(lines)
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def read(self) -> List[Mutation]:
+        """Reads all mutations from the journal.
+
+        A truncated last line (which can occur when the process died while appending to the journal)
+        gets ignored.
+
+        Returns:
+            The list of journaled mutations in order.
+        """
+        mutations: List[Mutation] = []
+        with open(self.path, "r", encoding="utf-8") as journal:
+            for line_no, line in enumerate(journal, start=1):
+                try:
+                    mutations.append(Mutation(**json.loads(line)))
+                except (ValueError, TypeError):
+                    LOGGER.warning(
+                        "Ignoring the corrupted line %d of the database journal %s.",
+                        line_no,
+                        self.path,
+                    )
+        return mutations
+
+    def remove(self) -> None:
+        """Removes the journal file."""
+        LOGGER.debug("Removing the database journal %s.", self.path)
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,429 @@
+"""coBib's database offset index.
+
+coBib's YAML database file consists of one YAML document per entry, delimited by the explicit `---`
+and `...` markers. The `OffsetIndex` maps the label of every entry to the byte range of its document
+inside of the database file. This allows `cobib.database.Database.save` to only re-serialize the
+entries which actually changed, while splicing all other byte ranges through unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import cobib.database
+    import cobib.parsers.yaml
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_MARKER_REGEX = re.compile(rb"^(---|\.\.\.)[ \t]*(?:\r?\n|\Z)", re.MULTILINE)
+"""@private the regex matching the explicit YAML document start and end markers."""
+
+_LABEL_REGEX = re.compile(rb"(.+?):[ \t]*(?:\r?\n|\Z)")
+"""@private the regex matching the label on the first line of a YAML document."""
+
+_PLAIN_LABEL_REGEX = re.compile(r"[A-Za-z_][\w\-+./]*")
+"""@private the regex matching labels which YAML can never resolve to anything but a string."""
+
+_AMBIGUOUS_LABELS = {"true", "false", "null", "yes", "no", "on", "off", "y", "n"}
+"""@private plain labels which YAML may resolve to a non-string value."""
+
+Buffer = Union[bytes, mmap.mmap]
+"""@private the type of buffers which can be scanned."""
+
+
+class OffsetIndex:
+    """coBib's database offset index.
+
+    The index gets constructed by scanning the database file for its document markers (see
+    `OffsetIndex.scan`). It remembers the modification time and size of the file, in order to detect
+    changes which have been made to the file behind coBib's back (see `OffsetIndex.is_valid`).
+    """
+
+    def __init__(self, file: Path, documents: Dict[str, Tuple[int, int]]) -> None:
+        """Initializes a new offset index.
+
+        Args:
+            file: the path to the database file.
+            documents: the ordered dictionary mapping labels to the byte range (start inclusive, end
+                exclusive) of their documents.
+        """
+        self.file: Path = file
+        """The path to the indexed database file."""
+
+        self.documents: Dict[str, Tuple[int, int]] = documents
+        """The ordered dictionary mapping labels to the byte ranges of their documents."""
+
+        self._stat: Tuple[int, int] = self._get_stat(file)
+
+    def __contains__(self, label: object) -> bool:
+        """Returns whether the given label is indexed."""
+        return label in self.documents
+
+    def __len__(self) -> int:
+        """Returns the number of indexed documents."""
+        return len(self.documents)
+
+    @staticmethod
+    def _get_stat(file: Path) -> Tuple[int, int]:
+        """Returns the modification time and size of a file.
+
+        Args:
+            file: the path to the file.
+
+        Returns:
+            The pair of the modification time (in nanoseconds) and size of the file.
+        """
+        stat = os.stat(file)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def is_valid(self, file: Optional[Path] = None) -> bool:
+        """Returns whether this index still matches the database file.
+
+        Args:
+            file: the path to the database file. If this differs from the indexed file, the index
+                is considered invalid.
+
+        Returns:
+            Whether the file has not been touched since it got indexed.
+        """
+        if file is not None and file != self.file:
+            return False
+        try:
+            return self._get_stat(self.file) == self._stat
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def iter_ranges(buffer: Buffer) -> Iterator[Tuple[int, int]]:
+        """Iterates the byte ranges of the YAML documents in a buffer.
+
+        Only the explicit document markers at the beginning of a line are inspected. The YAML
+        content itself is never parsed, making this much faster than actually loading the data.
+
+        Args:
+            buffer: the raw contents of a database file.
+
+        Yields:
+            Pairs of the start and end offsets of each document. The document range includes its
+            start and end markers.
+        """
+        start: Optional[int] = None
+        for match in _MARKER_REGEX.finditer(buffer):
+            if match.group(1) == b"---":
+                if start is not None:
+                    # the previous document was not explicitly ended
+                    yield start, match.start()
+                start = match.start()
+            elif start is not None:
+                yield start, match.end()
+                start = None
+        if start is not None:
+            yield start, len(buffer)
+
+    @staticmethod
+    def iter_documents(buffer: Buffer) -> Iterator[Tuple[Optional[str], int, int]]:
+        """Iterates the YAML documents in a buffer.
+
+        In addition to `OffsetIndex.iter_ranges`, this extracts the label on the first line of
+        every document.
+
+        Args:
+            buffer: the raw contents of a database file.
+
+        Yields:
+            Triplets of the label (or `None` if none was found) and the start and end offsets of
+            each document. The document range includes its start and end markers.
+        """
+        for start, end in OffsetIndex.iter_ranges(buffer):
+            yield OffsetIndex._get_label(buffer, start), start, end
+
+    @staticmethod
+    def _get_label(buffer: Buffer, start: int) -> Optional[str]:
+        """Extracts the label of the document starting at the given offset.
+
+        Args:
+            buffer: the raw contents of a database file.
+            start: the offset of the document start marker.
+
+        Returns:
+            The label of the document or `None` if it could not be determined.
+        """
+        line_end = buffer.find(b"\n", start)
+        if line_end < 0:
+            return None
+        match = _LABEL_REGEX.match(buffer, line_end + 1)
+        if match is None:
+            return None
+        label = match.group(1).decode("utf-8")
+        if _PLAIN_LABEL_REGEX.fullmatch(label) is None or label.lower() in _AMBIGUOUS_LABELS:
+            # let YAML resolve quoted labels and those which may not be plain strings
+            # pylint: disable=import-outside-toplevel,cyclic-import
+            from cobib.parsers.yaml import YAMLParser
+
+            try:
+                loaded = YAMLParser.load_string(f"{label}: null")
+            except Exception:  # pylint: disable=broad-exception-caught
+                return None
+            if not isinstance(loaded, dict) or len(loaded) != 1:
+                return None
+            label = str(next(iter(loaded)))
+        return label
+
+    @classmethod
+    def scan(cls, file: Path) -> OffsetIndex:
+        """Scans the given database file and constructs its offset index.
+
+        If a label occurs more than once, only its last document gets indexed. This matches the
+        `cobib.parsers.yaml.YAMLParser` which also lets the last occurrence take precedence.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            The offset index of the file.
+        """
+        LOGGER.debug("Scanning the document offsets of %s.", file)
+        documents: Dict[str, Tuple[int, int]] = OrderedDict()
+        with open(file, "rb") as stream, _map(stream) as buffer:
+            for label, start, end in cls.iter_documents(buffer):
+                if label is not None:
+                    # keep the documents ordered by their offsets
+                    documents.pop(label, None)
+                    documents[label] = (start, end)
+        return cls(file, documents)
+
+    def write_entries(
+        self,
+        documents: Dict[str, Optional[cobib.database.Entry]],
+        parser: cobib.parsers.yaml.YAMLParser,
+    ) -> None:
+        """Writes the changed entries into the database file.
+
+        Every entry whose previous label is indexed replaces its previous document (or removes it,
+        if the entry no longer exists). All other entries get appended to the end of the file. Only
+        these entries get serialized, everything else gets spliced through via
+        `OffsetIndex.splice`. If the index turns out not to match the file, it gets re-scanned
+        before trying again.
+
+        Args:
+            documents: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+            parser: the parser used to serialize the entries.
+        """
+        try:
+            self.splice(*self._prepare(documents, parser))
+        except ValueError as err:
+            LOGGER.warning("%s Re-scanning the database file.", err)
+            self.documents = OffsetIndex.scan(self.file).documents
+            self.splice(*self._prepare(documents, parser))
+
+    def _prepare(
+        self,
+        documents: Dict[str, Optional[cobib.database.Entry]],
+        parser: cobib.parsers.yaml.YAMLParser,
+    ) -> Tuple[Dict[str, Optional[Tuple[str, str]]], List[Tuple[str, str]]]:
+        """Serializes the changed entries for `OffsetIndex.splice`.
+
+        Args:
+            documents: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+            parser: the parser used to serialize the entries.
+
+        Returns:
+            The pair of replacements and appended documents.
+        """
+        replacements: Dict[str, Optional[Tuple[str, str]]] = {}
+        for label, entry in documents.items():
+            if label not in self.documents:
+                continue
+            if entry:
+                LOGGER.debug('Writing modified entry "%s".', entry.label)
+                replacements[label] = (entry.label, entry.save(parser=parser))
+            else:
+                LOGGER.debug('Deleting entry "%s".', label)
+                replacements[label] = None
+
+        # in case of a rename, the new label must not be appended again
+        written = {value[0] for value in replacements.values() if value is not None}
+        appended: List[Tuple[str, str]] = []
+        for label, entry in documents.items():
+            if label in replacements or not entry or entry.label in written:
+                continue
+            LOGGER.debug('Adding new entry "%s".', entry.label)
+            appended.append((entry.label, entry.save(parser=parser)))
+            written.add(entry.label)
+
+        return replacements, appended
+
+    def splice(
+        self,
+        replacements: Dict[str, Optional[Tuple[str, str]]],
+        appended: List[Tuple[str, str]],
+    ) -> None:
+        """Writes the changed documents into the database file.
+
+        All unchanged byte ranges are copied through as they are. Whenever possible, this happens
+        without passing them through user space (via `os.copy_file_range`). The result gets written
+        to a temporary file which then atomically replaces the database file. Afterwards, this index
+        is updated to reflect the new state of the file.
+
+        Args:
+            replacements: a dictionary mapping the labels of indexed documents to either `None`, if
+                the document is to be removed, or a pair of the (potentially new) label and the new
+                document contents.
+            appended: a list of pairs of labels and document contents which are to be appended to
+                the end of the file.
+
+        Raises:
+            ValueError: if a replaced document does not start where it is indexed. In this case, the
+                database file remains untouched.
+        """
+        encoded: Dict[str, Optional[Tuple[str, bytes]]] = {
+            label: None if value is None else (value[0], _encode(value[1]))
+            for label, value in replacements.items()
+        }
+        encoded_appended = [(label, _encode(text)) for label, text in appended]
+        operations = sorted(self.documents[label] + (label,) for label in encoded)
+
+        tmp_fd, tmp_name = tempfile.mkstemp(dir=self.file.parent, prefix=f".{self.file.name}.")
+        try:
+            with open(self.file, "rb") as src, _map(src) as buffer:
+                position = 0
+                for start, end, label in operations:
+                    if buffer[start : start + 3] != b"---":
+                        raise ValueError(f"The document of '{label}' is not at offset {start}.")
+                    _copy_range(src.fileno(), tmp_fd, buffer, position, start)
+                    replacement = encoded[label]
+                    if replacement is not None:
+                        _write(tmp_fd, replacement[1])
+                    position = end
+                size = len(buffer)
+                _copy_range(src.fileno(), tmp_fd, buffer, position, size)
+            for _, data in encoded_appended:
+                _write(tmp_fd, data)
+            os.fsync(tmp_fd)
+        except BaseException:
+            os.close(tmp_fd)
+            os.remove(tmp_name)
+            raise
+        os.close(tmp_fd)
+        shutil.copymode(self.file, tmp_name)
+        os.replace(tmp_name, self.file)
+
+        self._update(encoded, encoded_appended, size)
+
+    def _update(
+        self,
+        replacements: Dict[str, Optional[Tuple[str, bytes]]],
+        appended: List[Tuple[str, bytes]],
+        size: int,
+    ) -> None:
+        """Updates the indexed offsets after splicing.
+
+        Args:
+            replacements: the encoded replacements which were spliced into the file.
+            appended: the encoded documents which were appended to the file.
+            size: the size of the database file before splicing.
+        """
+        documents: Dict[str, Tuple[int, int]] = OrderedDict()
+        delta = 0
+        for label, (start, end) in self.documents.items():
+            if label not in replacements:
+                documents[label] = (start + delta, end + delta)
+                continue
+            replacement = replacements[label]
+            if replacement is None:
+                delta -= end - start
+                continue
+            new_label, data = replacement
+            documents[new_label] = (start + delta, start + delta + len(data))
+            delta += len(data) - (end - start)
+
+        position = size + delta
+        for label, data in appended:
+            documents[label] = (position, position + len(data))
+            position += len(data)
+
+        self.documents = documents
+        self._stat = self._get_stat(self.file)
+
+
+@contextmanager
+def _map(stream: BinaryIO) -> Iterator[Buffer]:
+    """Memory-maps an open file for reading.
+
+    Args:
+        stream: the file opened in binary mode.
+
+    Yields:
+        The read-only memory-mapped contents of the file. Since empty files cannot be memory-mapped,
+        an empty `bytes` object is yielded for those.
+    """
+    if os.fstat(stream.fileno()).st_size == 0:
+        yield b""
+        return
+    with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        yield buffer
+
+
+def _encode(text: str) -> bytes:
+    """Encodes a document the same way as a text-mode file would.
+
+    Args:
+        text: the document contents.
+
+    Returns:
+        The UTF-8 encoded bytes with platform-specific line endings.
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)  # pragma: no cover
+    return text.encode("utf-8")
+
+
+def _write(dst_fd: int, data: Union[bytes, memoryview]) -> None:
+    """Writes an entire bytes-like object to a file descriptor.
+
+    Args:
+        dst_fd: the file descriptor to write to.
+        data: the bytes to write.
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(dst_fd, view)
+        view = view[written:]
+
+
+def _copy_range(src_fd: int, dst_fd: int, buffer: Buffer, start: int, end: int) -> None:
+    """Copies a byte range of the source file to the current position of the destination file.
+
+    Args:
+        src_fd: the file descriptor of the source file.
+        dst_fd: the file descriptor of the destination file.
+        buffer: the memory-mapped contents of the source file, used as a fallback when the kernel
+            cannot copy the range directly.
+        start: the start offset (inclusive).
+        end: the end offset (exclusive).
+    """
+    while start < end:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, end - start, start)
+        except (AttributeError, OSError):
+            copied = 0
+        if copied <= 0:
+            break
+        start += copied
+
+    if start < end:
+        with memoryview(buffer) as view:
+            _write(dst_fd, view[start:end])
@@ -0,0 +1,203 @@
+"""coBib's database schema.
+
+The `cobib.commands.list_.ListCommand` registers a pair of filter arguments for every field which
+occurs in the database. Gathering these fields used to require a scan over all entries (parsing any
+lazily read ones in the process) every time the argument parser got initialized.
+
+Instead, the `Schema` keeps track of the set of known fields. It gets populated once (either from
+coBib's cache or by scanning the database) and is then kept up-to-date incrementally by
+`cobib.database.Database.update`. Fields never get removed from the schema while the database is
+in use: a field which no longer occurs in any entry is harmless, since filtering on it simply
+matches nothing. Only a rolled-back `cobib.database.Database.transaction` clears the schema, since
+the fields of its discarded entries never made it into the database.
+
+Every change of the set of known fields increments `Schema.version`. This allows the
+`cobib.commands.list_.ListCommand` to refresh its filter arguments only when the schema changed.
+
+The schema is persisted in coBib's cache (see `cobib.config.config.LoggingConfig.cache`) whenever
+the database is saved. It is keyed on the path, modification time and size of the database file (or
+of all files inside of the directory of a sharded database). Whenever this key does not match, the
+persisted schema is considered stale and the database gets scanned once more.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from cobib.config import config
+from cobib.utils.rel_path import RelPath
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+
+class Schema:
+    """coBib's database schema."""
+
+    SECTION = "Schema"
+    """The section of coBib's cache in which the schemas of all databases are stored."""
+
+    def __init__(self) -> None:
+        """Initializes an empty schema."""
+        self._fields: Optional[Set[str]] = None
+        """The set of known fields or `None` if the schema has not been populated."""
+
+        self._frozen: Optional[FrozenSet[str]] = None
+        """@private the cached immutable copy of `Schema._fields`."""
+
+        self.version = 0
+        """A counter which gets incremented whenever the set of known fields changes."""
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the schema has been populated."""
+        return self._fields is not None
+
+    @property
+    def fields(self) -> FrozenSet[str]:
+        """The set of known fields."""
+        if self._frozen is None:
+            self._frozen = frozenset(self._fields or ())
+        return self._frozen
+
+    def clear(self) -> None:
+        """Clears the schema. It needs to be populated again before its next use."""
+        self._fields = None
+        self._frozen = None
+        self.version += 1
+
+    def build(self, entries: Iterable[cobib.database.Entry]) -> None:
+        """Populates the schema from scratch.
+
+        Args:
+            entries: all entries of the database.
+        """
+        LOGGER.debug("Building the database schema.")
+        self._fields = set()
+        self._frozen = None
+        self.version += 1
+        for entry in entries:
+            self._fields.update(entry.data.keys())
+
+    def add(self, entry: cobib.database.Entry) -> None:
+        """Adds the fields of an entry to the schema.
+
+        This does nothing if the schema has not been populated.
+
+        Args:
+            entry: the entry whose fields to add.
+        """
+        if self._fields is None:
+            return
+        new_fields = entry.data.keys() - self._fields
+        if new_fields:
+            LOGGER.debug("Adding the fields %s to the database schema.", sorted(new_fields))
+            self._fields.update(new_fields)
+            self._frozen = None
+            self.version += 1
+
+    @staticmethod
+    def key(file: Path) -> List[Any]:
+        """Computes the key of the schema for the given database file.
+
+        Args:
+            file: the path to the database file (or the directory of a sharded database).
+
+        Returns:
+            The list against which a persisted schema is compared.
+
+        Raises:
+            FileNotFoundError: if the database file does not exist.
+        """
+        if file.is_dir():
+            key: List[Any] = []
+            with os.scandir(file) as items:
+                for item in items:
+                    if item.is_file():
+                        stat = item.stat()
+                        key.append([item.name, stat.st_mtime_ns, stat.st_size])
+            return sorted(key)
+        stat = os.stat(file)
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def _read_cache() -> Dict[str, Any]:
+        """Reads coBib's cache.
+
+        Returns:
+            The cached data.
+        """
+        cache_path = RelPath(config.logging.cache).path
+        try:
+            with open(cache_path, "r", encoding="utf-8") as cache:
+                cached_data = json.load(cache)
+        except FileNotFoundError:
+            cached_data = {}
+        return cached_data  # type: ignore[no-any-return]
+
+    def load(self, file: Path) -> bool:
+        """Loads the persisted schema of the given database file.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            Whether a valid schema was loaded.
+        """
+        try:
+            stored = self._read_cache().get(self.SECTION, {}).get(str(file), None)
+            if stored is None:
+                LOGGER.info("No database schema is cached for %s.", file)
+                return False
+            if stored["key"] != self.key(file):
+                LOGGER.info("The cached database schema of %s is outdated.", file)
+                return False
+            self._fields = set(stored["fields"])
+        except FileNotFoundError:
+            LOGGER.info("The database file %s does not exist.", file)
+            return False
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Ignoring the unreadable database schema of %s: %s", file, err)
+            return False
+
+        self._frozen = None
+        self.version += 1
+        LOGGER.info("Loaded the cached database schema of %s.", file)
+        return True
+
+    def dump(self, file: Path) -> None:
+        """Persists the schema of the given database file.
+
+        This does nothing if the schema has not been populated. Any errors encountered during this
+        process are logged but otherwise ignored, since the schema is merely an optimization.
+
+        Args:
+            file: the path to the database file.
+        """
+        if self._fields is None:
+            return
+        cache_path = RelPath(config.logging.cache).path
+        try:
+            key = self.key(file)
+            cached_data = self._read_cache()
+            if self.SECTION not in cached_data.keys():
+                cached_data[self.SECTION] = {}
+            cached_data[self.SECTION][str(file)] = {"key": key, "fields": sorted(self._fields)}
+
+            if not cache_path.parent.exists():
+                cache_path.parent.mkdir(parents=True)
+
+            with open(cache_path, "w", encoding="utf-8") as cache:
+                json.dump(cached_data, cache)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Could not cache the database schema of %s: %s", file, err)
+            return
+
+        LOGGER.debug("Cached the database schema of %s.", file)
@@ -0,0 +1,288 @@
+"""coBib's ranked search index.
+
+The `cobib.commands.search.SearchCommand` matches regex patterns against a BibTeX dump of every
+entry and reports its results in the order of the database. For a ranked search (`cobib search
+--ranked`) the entries are instead scored by their relevance to the query using
+[Okapi BM25](https://en.wikipedia.org/wiki/Okapi_BM25).
+
+To do so, the `SearchIndex` splits the fields configured via
+`cobib.config.config.SearchCommandConfig.ranked_fields` into lower-case word tokens and maps each
+token to the term frequencies of the entries containing it. A query then only needs to visit the
+postings of its own tokens rather than all entries of the database.
+
+The index gets built upon its first use and is kept up-to-date incrementally by
+`cobib.database.Database.update`, `cobib.database.Database.pop` and
+`cobib.database.Database.rename`. Once it exists, it is also persisted next to the database file
+(with the additional `.index` suffix) whenever the database is saved. It is keyed on the indexed
+fields as well as on the modification time and size of the database file (see
+`cobib.database.schema.Schema.key`). Whenever this key does not match, the persisted index is
+considered stale and gets rebuilt.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, List, Optional, Tuple
+
+from cobib.config import config
+
+from .schema import Schema
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_FORMAT = 1
+"""The version of the persisted index format."""
+
+_TOKEN_REGEX = re.compile(r"\w\w+")
+"""@private the regex matching a token. Single characters are not indexed."""
+
+_K1 = 1.2
+"""@private the term frequency saturation parameter of BM25."""
+
+_B = 0.75
+"""@private the document length normalization parameter of BM25."""
+
+
+class SearchIndex:
+    """coBib's ranked search index."""
+
+    SUFFIX = ".index"
+    """The suffix appended to the name of the database file in order to obtain the index file."""
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._fields: Optional[Tuple[str, ...]] = None
+        """The indexed fields or `None` if the index has not been populated."""
+
+        self._postings: Dict[str, Dict[str, int]] = {}
+        """The term frequencies of every token, keyed by the labels of the entries containing it."""
+
+        self._terms: Dict[str, str] = {}
+        """The space-separated distinct tokens of every indexed entry, keyed by its label. These are
+        stored as a single string since this is significantly faster to persist."""
+
+        self._lengths: Dict[str, int] = {}
+        """The number of tokens of every indexed entry, keyed by its label."""
+
+        self._total_length = 0
+        """The total number of tokens of all indexed entries."""
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been populated and still indexes the configured fields."""
+        return self._fields is not None and self._fields == tuple(
+            config.commands.search.ranked_fields
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of indexed entries."""
+        return len(self._lengths)
+
+    def clear(self) -> None:
+        """Clears the index. It needs to be populated again before its next use."""
+        self._fields = None
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Splits a text into tokens.
+
+        Args:
+            text: the text to split.
+
+        Returns:
+            The lower-case word tokens of the text.
+        """
+        return _TOKEN_REGEX.findall(text.lower())
+
+    def build(self, entries: Iterable[Tuple[str, cobib.database.Entry]]) -> None:
+        """Populates the index from scratch.
+
+        Args:
+            entries: the pairs of labels and entries which to index.
+        """
+        self.clear()
+        self._fields = tuple(config.commands.search.ranked_fields)
+        for label, entry in entries:
+            self.add(label, entry)
+        LOGGER.debug("Indexed the tokens of %d entries.", len(self))
+
+    def add(self, label: str, entry: cobib.database.Entry) -> None:
+        """Adds (or replaces) an entry in the index.
+
+        This does nothing if the index has not been populated.
+
+        Args:
+            label: the label under which the entry is stored in the database.
+            entry: the entry.
+        """
+        if self._fields is None:
+            return
+        self.remove(label)
+        values = entry.stringify()
+        frequencies: Dict[str, int] = {}
+        length = 0
+        for field in self._fields:
+            for token in self.tokenize(values.get(field, "")):
+                frequencies[token] = frequencies.get(token, 0) + 1
+                length += 1
+        for token, frequency in frequencies.items():
+            self._postings.setdefault(token, {})[label] = frequency
+        self._terms[label] = " ".join(frequencies)
+        self._lengths[label] = length
+        self._total_length += length
+
+    def remove(self, label: str) -> None:
+        """Removes an entry from the index.
+
+        Args:
+            label: the label under which the entry was stored in the database.
+        """
+        terms = self._terms.pop(label, None)
+        if terms is None:
+            return
+        for token in terms.split():
+            postings = self._postings[token]
+            del postings[label]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(label)
+
+    def search(
+        self,
+        query: Iterable[str],
+        limit: Optional[int] = None,
+        labels: Optional[Collection[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Ranks the indexed entries by their BM25 score.
+
+        Args:
+            query: the query strings. These get split into tokens (see `tokenize`).
+            limit: the maximum number of entries to return.
+            labels: an optional collection of labels to which the results are restricted.
+
+        Returns:
+            The pairs of labels and scores of all entries which contain at least one of the query
+            tokens, ordered by decreasing score.
+        """
+        tokens = dict.fromkeys(token for string in query for token in self.tokenize(string))
+        num_entries = len(self._lengths)
+        if not tokens or not self._total_length:
+            return []
+        lengths = self._lengths
+        norm = _K1 / (self._total_length / num_entries) * _B
+        scores: Dict[str, float] = {}
+        for token in tokens:
+            postings = self._postings.get(token, None)
+            if postings is None:
+                continue
+            matching = len(postings)
+            idf = math.log(1.0 + (num_entries - matching + 0.5) / (matching + 0.5))
+            weight = idf * (_K1 + 1.0)
+            for label, frequency in postings.items():
+                score = weight * frequency / (frequency + _K1 * (1.0 - _B) + norm * lengths[label])
+                scores[label] = scores.get(label, 0.0) + score
+        if labels is not None:
+            scores = {label: score for label, score in scores.items() if label in labels}
+        if limit is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    @classmethod
+    def path(cls, file: Path) -> Path:
+        """Returns the path of the index of a database file.
+
+        Args:
+            file: the path to the database file (or the directory of a sharded database).
+
+        Returns:
+            The path to the index file.
+        """
+        return file.parent / (file.name + cls.SUFFIX)
+
+    def _key(self, file: Path) -> List[Any]:
+        """Computes the key of the index for the given database file.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            The list against which a persisted index is compared.
+        """
+        return [_FORMAT, list(config.commands.search.ranked_fields), Schema.key(file)]
+
+    def load(self, file: Path) -> bool:
+        """Loads the persisted index of the given database file.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            Whether a valid index was loaded.
+        """
+        path = self.path(file)
+        try:
+            with open(path, "rb") as index:
+                stored = pickle.load(index)
+            if stored["key"] != self._key(file):
+                LOGGER.info("The search index %s is outdated.", path)
+                return False
+            self._fields = tuple(config.commands.search.ranked_fields)
+            self._postings = stored["postings"]
+            self._terms = stored["terms"]
+            self._lengths = stored["lengths"]
+            self._total_length = sum(self._lengths.values())
+        except FileNotFoundError:
+            LOGGER.debug("The search index %s does not exist.", path)
+            return False
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Ignoring the unreadable search index %s: %s", path, err)
+            self.clear()
+            return False
+
+        LOGGER.info("Loaded the search index %s.", path)
+        return True
+
+    def dump(self, file: Path) -> None:
+        """Persists the index of the given database file.
+
+        This does nothing if the index has not been populated. Any errors encountered during this
+        process are logged but otherwise ignored, since the index can always be rebuilt.
+
+        Args:
+            file: the path to the database file.
+        """
+        if not self.loaded:
+            return
+        path = self.path(file)
+        try:
+            stored = {
+                "key": self._key(file),
+                "postings": self._postings,
+                "terms": self._terms,
+                "lengths": self._lengths,
+            }
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=path.parent, prefix=path.name, delete=False
+            ) as index:
+                pickle.dump(stored, index, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(index.name, path)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Could not write the search index %s: %s", path, err)
+            return
+
+        LOGGER.debug("Wrote the search index %s.", path)
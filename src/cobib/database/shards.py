@@ -0,0 +1,289 @@
+"""coBib's sharded database layout.
+
+Instead of a single YAML file, `cobib.config.config.DatabaseConfig.file` may also point to a
+directory. In this case, the database is split into multiple *shard* files inside of this directory.
+Each shard file follows the same format as a normal database file. A `manifest.yaml` file in the
+directory specifies how the entries are distributed among the shards:
+
+```yaml
+---
+bucket: hash
+shards: 16
+...
+```
+
+The following buckets are supported:
+* `hash`: the entries are distributed among a fixed number of shards (`shards`) based on a
+  (stable) hash of their label. The shard files are named after their index, e.g. `0a.yaml`.
+* `year`: the entries are grouped by their `year` field, e.g. `2019.yaml`. Entries without a year
+  end up in `unknown.yaml`.
+
+When reading a sharded database, all shards get loaded in parallel (see
+`cobib.parsers.yaml.YAMLParser.parse_shards`). When saving, only those shards which contain changed
+entries get rewritten. This also allows the git integration to only stage the changed shards.
+
+The order in which the entries were added is kept in an `order.txt` file in the directory, which
+lists one label per line. Just like in a single database file, changed and renamed entries keep
+their position while new entries get appended. This file only gets rewritten when entries are
+added, deleted or renamed. Entries which are not listed in it (for example, because they were
+written to a shard file manually) follow the listed ones, ordered shard by shard.
+
+A sharded database can be initialized via `cobib init --shards {hash,year}`.
+
+.. note::
+   The `cobib.config.config.DatabaseConfig.lazy` and `cobib.config.config.DatabaseConfig.cache`
+   settings do not apply to sharded databases.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .offset_index import OffsetIndex
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+MANIFEST = "manifest.yaml"
+"""The name of the manifest file of a sharded database."""
+
+ORDER = "order.txt"
+"""The name of the file listing the labels of a sharded database in their order."""
+
+BUCKETS = ("hash", "year")
+"""The supported methods of distributing the entries among the shards."""
+
+_YEAR_REGEX = re.compile(r"\d{1,4}")
+"""@private the regex matching valid years for shard file names."""
+
+_T = TypeVar("_T")
+"""@private the type of the values of a dictionary keyed by labels."""
+
+
+class Shards:
+    """coBib's sharded database layout."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initializes the sharded layout from its manifest.
+
+        Args:
+            directory: the path to the directory containing the shard files.
+
+        Raises:
+            FileNotFoundError: if the manifest does not exist.
+            ValueError: if the manifest is invalid.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from cobib.parsers.yaml import YAMLParser
+
+        self.directory: Path = directory
+        """The path to the directory containing the shard files."""
+
+        with open(directory / MANIFEST, "r", encoding="utf-8") as file:
+            manifest = YAMLParser.load_string(file.read())
+
+        if not isinstance(manifest, dict) or manifest.get("bucket", None) not in BUCKETS:
+            raise ValueError(
+                f"The manifest of {directory} must specify a `bucket` out of {', '.join(BUCKETS)}."
+            )
+
+        self.bucket: str = manifest["bucket"]
+        """The method of distributing the entries among the shards."""
+
+        self.shards: int = manifest.get("shards", 16)
+        """The number of shards used by the `hash` bucket."""
+
+        if not isinstance(self.shards, int) or self.shards < 1:
+            raise ValueError(f"The manifest of {directory} must specify a positive `shards` count.")
+
+    @staticmethod
+    def is_sharded(path: Path) -> bool:
+        """Returns whether the given database path points to a sharded database.
+
+        Args:
+            path: the path configured by `cobib.config.config.DatabaseConfig.file`.
+
+        Returns:
+            Whether the path is a directory.
+        """
+        return path.is_dir()
+
+    @classmethod
+    def create(cls, directory: Path, bucket: str, shards: int = 16) -> Shards:
+        """Creates a new, empty sharded database.
+
+        Args:
+            directory: the path to the directory which to create.
+            bucket: the method of distributing the entries among the shards (see `BUCKETS`).
+            shards: the number of shards used by the `hash` bucket.
+
+        Returns:
+            The sharded layout of the new database.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = f"---\nbucket: {bucket}\n"
+        if bucket == "hash":
+            manifest += f"shards: {shards}\n"
+        manifest += "...\n"
+        with open(directory / MANIFEST, "w", encoding="utf-8") as file:
+            file.write(manifest)
+        return cls(directory)
+
+    def paths(self) -> List[Path]:
+        """Returns the paths of all existing shard files.
+
+        Returns:
+            The sorted list of all shard files in the directory.
+        """
+        return sorted(path for path in self.directory.glob("*.yaml") if path.name != MANIFEST)
+
+    def order(self, labels: Dict[str, _T]) -> Dict[str, _T]:
+        """Orders a dictionary keyed by labels according to the `ORDER` file.
+
+        Args:
+            labels: the dictionary keyed by labels, ordered shard by shard.
+
+        Returns:
+            A new dictionary with the labels listed in the `ORDER` file first (in their listed
+            order), followed by all other labels in their original order.
+        """
+        path = self.directory / ORDER
+        if not path.exists():
+            return labels
+        ordered = {
+            label: labels[label]
+            for label in path.read_text(encoding="utf-8").splitlines()
+            if label in labels
+        }
+        if len(ordered) < len(labels):
+            ordered.update(
+                (label, value) for label, value in labels.items() if label not in ordered
+            )
+        return ordered
+
+    def shard_of(self, entry: cobib.database.Entry) -> Path:
+        """Returns the shard file to which an entry belongs.
+
+        Args:
+            entry: the entry.
+
+        Returns:
+            The path to the shard file.
+        """
+        if self.bucket == "year":
+            year = str(entry.data.get("year", ""))
+            name = year if _YEAR_REGEX.fullmatch(year) else "unknown"
+        else:
+            width = len(f"{self.shards - 1:x}")
+            index = zlib.crc32(entry.label.encode("utf-8")) % self.shards
+            name = f"{index:0{width}x}"
+        return self.directory / f"{name}.yaml"
+
+    def read(self) -> Tuple[Dict[str, cobib.database.Entry], Dict[str, Path]]:
+        """Reads all shard files.
+
+        Returns:
+            The pair of the ordered dictionary of all entries and the dictionary mapping every label
+            to the shard file from which it was read.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from cobib.parsers.yaml import YAMLParser
+
+        entries, origins = YAMLParser().parse_shards(self.paths())
+        return self.order(entries), self.order(origins)
+
+    def save(
+        self,
+        changes: Dict[str, Tuple[Optional[Path], Optional[cobib.database.Entry]]],
+        origins: Dict[str, Path],
+    ) -> List[Path]:
+        """Writes the changed entries into their shard files.
+
+        Only the shard files containing a changed entry get rewritten. Within each shard file, this
+        uses `cobib.database.offset_index.OffsetIndex.write_entries` in order to only serialize the
+        changed entries. An entry which moves to another shard (for example, because its year or
+        label changed) gets removed from its previous shard and appended to its new one.
+
+        If entries were added, deleted or renamed, the `ORDER` file gets rewritten, too.
+
+        Args:
+            changes: a dictionary mapping the previous labels of the changed entries to the pair of
+                their previous shard file (or `None` for new entries) and their current entry (or
+                `None` if they were deleted).
+            origins: the dictionary mapping every label to its shard file, in the order of the
+                entries. This gets updated in place.
+
+        Returns:
+            The list of shard files which were written.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from cobib.parsers.yaml import YAMLParser
+
+        yml = YAMLParser()
+
+        order: Optional[List[str]] = None
+        if any(
+            previous is None or entry is None or entry.label != label
+            for label, (previous, entry) in changes.items()
+        ):
+            order = []
+            for label in origins:
+                if label not in changes:
+                    order.append(label)
+                    continue
+                _, entry = changes[label]
+                if entry is not None:
+                    order.append(entry.label)
+            order.extend(
+                entry.label
+                for label, (previous, entry) in changes.items()
+                if previous is None and entry is not None
+            )
+
+        per_shard: Dict[Path, Dict[str, Optional[cobib.database.Entry]]] = OrderedDict()
+        for label, (previous, entry) in changes.items():
+            current = self.shard_of(entry) if entry else None
+            if previous is not None:
+                per_shard.setdefault(previous, OrderedDict())[label] = (
+                    entry if previous == current else None
+                )
+                origins.pop(label, None)
+            if entry and current is not None:
+                if current != previous:
+                    per_shard.setdefault(current, OrderedDict())[entry.label] = entry
+                origins[entry.label] = current
+
+        for path, documents in per_shard.items():
+            LOGGER.debug("Writing %d changed entries to shard %s.", len(documents), path)
+            path.touch(exist_ok=True)
+            OffsetIndex.scan(path).write_entries(documents, yml)
+
+        written = list(per_shard.keys())
+        if order is not None:
+            reordered = {label: origins[label] for label in order if label in origins}
+            origins.clear()
+            origins.update(reordered)
+            written.append(self.write_order(reordered))
+        return written
+
+    def write_order(self, labels: Iterable[str]) -> Path:
+        """Writes the `ORDER` file.
+
+        Args:
+            labels: the labels of all entries in their order.
+
+        Returns:
+            The path to the `ORDER` file.
+        """
+        path = self.directory / ORDER
+        LOGGER.debug("Writing the order of the entries to %s.", path)
+        path.write_text("".join(f"{label}\n" for label in labels), encoding="utf-8")
+        return path
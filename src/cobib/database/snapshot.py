@@ -0,0 +1,325 @@
+"""coBib's database snapshot.
+
+Parsing a large YAML database file is by far the most expensive part of starting coBib.
+To avoid paying this price on every invocation, the parsed contents of the database can optionally
+be stored in a binary snapshot file (see `cobib.config.config.DatabaseConfig.cache`).
+
+The snapshot is keyed on the path, modification time, size and content hash of the database file as
+well as on those configuration settings which affect the construction of `cobib.database.Entry`
+instances. Whenever any part of this key does not match, the snapshot is considered stale and the
+database file gets parsed normally (after which the snapshot gets rewritten).
+
+Saving the database does not rewrite the entire snapshot. Instead, as long as the snapshot matched
+the database file before it got saved, only the changed entries are appended to the snapshot
+together with the new key (see `Snapshot.append`). Upon loading, these changes get replayed in the
+same way in which they were written to the database file. After `_MAX_CHANGES` such appends, the
+snapshot gets compacted by rewriting it entirely.
+
+.. note::
+   The snapshot gets bypassed entirely when hooks are subscribed to the
+   `cobib.config.event.Event.PreYAMLParse` or `cobib.config.event.Event.PostYAMLParse` events,
+   because these would not fire when loading the snapshot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from cobib import __version__
+from cobib.config import Event, config
+from cobib.utils.rel_path import RelPath
+
+from .entry import Entry
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_FORMAT = 4
+"""The version of the snapshot format. This must be increased whenever the pickled layout of an
+`cobib.database.Entry` changes."""
+
+_CHUNK_SIZE = 1 << 20
+"""@private the chunk size used while hashing the database file."""
+
+_MAX_CHANGES = 64
+"""@private the number of changes which may be appended to a snapshot before it gets compacted."""
+
+
+class Snapshot:
+    """coBib's database snapshot.
+
+    This class only provides class methods to load and dump the snapshot of the database.
+    """
+
+    _current_path: Optional[Path] = None
+    """The path of the snapshot file which is known to match the database file."""
+
+    _current_key: Optional[Tuple[Any, ...]] = None
+    """The key of the database file which the snapshot file is known to match."""
+
+    _appended: int = 0
+    """The number of changes which have been appended to the snapshot file."""
+
+    @classmethod
+    def _remember(cls, path: Optional[Path], key: Optional[Tuple[Any, ...]], appended: int) -> None:
+        """Remembers which snapshot file is known to match the database file.
+
+        Args:
+            path: the path of the snapshot file or `None` if it is not known to match.
+            key: the key of the database file which the snapshot file matches.
+            appended: the number of changes which have been appended to the snapshot file.
+        """
+        cls._current_path = path
+        cls._current_key = key
+        cls._appended = appended
+
+    @staticmethod
+    def enabled() -> bool:
+        """Returns whether the snapshot should be used.
+
+        Returns:
+            Whether the snapshot is configured, the database is not read lazily, no YAML-parsing
+            hooks are subscribed and the entries are not being linted.
+        """
+        if config.database.cache is None:
+            return False
+        if config.database.lazy:
+            LOGGER.debug("Skipping the database snapshot in favor of reading the database lazily.")
+            return False
+        if Event.PreYAMLParse in config.events or Event.PostYAMLParse in config.events:
+            LOGGER.debug("Skipping the database snapshot due to registered YAML parsing hooks.")
+            return False
+        if Entry.lint:
+            LOGGER.debug("Skipping the database snapshot since the entries are being linted.")
+            return False
+        return True
+
+    @staticmethod
+    def hash(file: Path) -> str:
+        """Computes the content hash of a file.
+
+        Args:
+            file: the path to the file.
+
+        Returns:
+            The hexadecimal digest of the file contents.
+        """
+        digest = hashlib.blake2b()
+        with open(file, "rb") as stream:
+            for chunk in iter(lambda: stream.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(file: Path, digest: Optional[str] = None) -> Tuple[Any, ...]:
+        """Computes the key of the snapshot for the given database file.
+
+        Args:
+            file: the path to the database file.
+            digest: the content hash of the database file, if it is already known.
+
+        Returns:
+            The tuple against which a stored snapshot is compared.
+
+        Raises:
+            FileNotFoundError: if the database file does not exist.
+        """
+        stat = os.stat(file)
+        separators = config.database.stringify.list_separator
+        return (
+            _FORMAT,
+            __version__,
+            str(file),
+            stat.st_mtime_ns,
+            stat.st_size,
+            digest or Snapshot.hash(file),
+            (separators.file, separators.tags, separators.url),
+        )
+
+    @classmethod
+    def load(cls, file: Path) -> Optional[Dict[str, cobib.database.Entry]]:
+        """Loads the snapshot of the given database file.
+
+        Any changes appended to the snapshot get replayed onto the stored entries.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            The ordered dictionary of entries stored in the snapshot or `None` if no valid snapshot
+            exists for the current state of the database file.
+
+        Raises:
+            FileNotFoundError: if the database file does not exist.
+        """
+        key = Snapshot.key(file)
+        path = RelPath(config.database.cache).path  # type: ignore[arg-type]
+        cls._remember(None, None, 0)
+        appended = 0
+        try:
+            with open(path, "rb") as stream:
+                stored_key = pickle.load(stream)
+                entries: Dict[str, cobib.database.Entry] = pickle.load(stream)
+                while stored_key != key:
+                    try:
+                        stored_key, changes = pickle.load(stream)
+                    except EOFError:
+                        LOGGER.info("The database snapshot at %s is outdated.", path)
+                        return None
+                    entries = Snapshot._replay(entries, changes)
+                    appended += 1
+        except FileNotFoundError:
+            LOGGER.info("No database snapshot exists at %s.", path)
+            return None
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Ignoring the unreadable database snapshot at %s: %s", path, err)
+            return None
+
+        cls._remember(path, key, appended)
+        LOGGER.info("Loaded %d entries from the database snapshot at %s.", len(entries), path)
+        return entries
+
+    @staticmethod
+    def _replay(
+        entries: Dict[str, cobib.database.Entry],
+        changes: Dict[str, Optional[cobib.database.Entry]],
+    ) -> Dict[str, cobib.database.Entry]:
+        """Replays the changes which were appended to a snapshot.
+
+        This mirrors `cobib.database.offset_index.OffsetIndex.write_entries`: changed and renamed
+        entries keep their position, deleted entries get removed and new entries get appended.
+
+        Args:
+            entries: the ordered dictionary of entries before the changes.
+            changes: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+
+        Returns:
+            The ordered dictionary of entries after the changes.
+        """
+        replayed: Dict[str, cobib.database.Entry] = OrderedDict()
+        for label, entry in entries.items():
+            if label not in changes:
+                replayed[label] = entry
+                continue
+            changed = changes[label]
+            if changed is not None:
+                replayed[changed.label] = changed
+        written = {
+            changed.label for label, changed in changes.items() if label in entries and changed
+        }
+        for label, changed in changes.items():
+            if label in entries or not changed or changed.label in written:
+                continue
+            replayed[changed.label] = changed
+            written.add(changed.label)
+        return replayed
+
+    @classmethod
+    def dump(
+        cls, file: Path, entries: Dict[str, cobib.database.Entry], digest: Optional[str] = None
+    ) -> None:
+        """Dumps the snapshot of the given database file.
+
+        The snapshot gets written to a temporary file first which then atomically replaces any
+        previous snapshot. Any errors encountered during this process are logged but otherwise
+        ignored, since the snapshot is merely an optimization.
+
+        Args:
+            file: the path to the database file.
+            entries: the entries which are currently stored in the database file.
+            digest: the content hash of the database file, if it is already known.
+        """
+        path = RelPath(config.database.cache).path  # type: ignore[arg-type]
+        cls._remember(None, None, 0)
+        tmp_name: Optional[str] = None
+        try:
+            key = Snapshot.key(file, digest)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=path.parent, prefix=f".{path.name}.", delete=False
+            ) as stream:
+                tmp_name = stream.name
+                pickle.dump(key, stream, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(OrderedDict(entries), stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Could not write the database snapshot to %s: %s", path, err)
+            if tmp_name is not None and os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            return
+
+        cls._remember(path, key, 0)
+        LOGGER.debug("Wrote %d entries to the database snapshot at %s.", len(entries), path)
+
+    @classmethod
+    def is_current(cls, file: Path) -> bool:
+        """Returns whether the snapshot is known to match the given database file.
+
+        This is the case if the snapshot has been loaded, dumped or appended to by this process and
+        neither the database file nor the relevant configuration settings have changed since. The
+        database file does not get hashed again.
+
+        Args:
+            file: the path to the database file.
+
+        Returns:
+            Whether changes to the database file can be appended to the snapshot.
+        """
+        path, key = cls._current_path, cls._current_key
+        if key is None or path != RelPath(config.database.cache).path:  # type: ignore[arg-type]
+            return False
+        digest = key[5]  # pylint: disable=unsubscriptable-object
+        try:
+            # if the database file has not been touched, its stored content hash is still valid
+            return Snapshot.key(file, digest) == key
+        except FileNotFoundError:
+            return False
+
+    @classmethod
+    def append(
+        cls,
+        file: Path,
+        changes: Dict[str, Optional[cobib.database.Entry]],
+        entries: Dict[str, cobib.database.Entry],
+    ) -> None:
+        """Appends the changes which were just saved to the database file to its snapshot.
+
+        This must only be used if the snapshot matched the database file before the changes were
+        saved (see `is_current`). Once `_MAX_CHANGES` changes have been appended, the snapshot gets
+        compacted by dumping all entries instead. Any errors encountered during this process are
+        logged but otherwise ignored, since the snapshot is merely an optimization.
+
+        Args:
+            file: the path to the database file.
+            changes: a dictionary mapping the previous labels of the changed entries to their
+                current entries (or `None` if they were deleted).
+            entries: all entries which are currently stored in the database file.
+        """
+        path, appended = cls._current_path, cls._appended
+        if path is None or appended >= _MAX_CHANGES:
+            LOGGER.debug("Compacting the database snapshot.")
+            cls.dump(file, entries)
+            return
+
+        cls._remember(None, None, 0)
+        try:
+            key = Snapshot.key(file)
+            with open(path, "ab") as stream:
+                pickle.dump((key, dict(changes)), stream, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            LOGGER.warning("Could not append to the database snapshot at %s: %s", path, err)
+            return
+
+        cls._remember(path, key, appended + 1)
+        LOGGER.debug("Appended %d changes to the database snapshot at %s.", len(changes), path)
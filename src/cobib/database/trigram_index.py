@@ -0,0 +1,235 @@
+"""coBib's fuzzy search index.
+
+A fuzzy search (`cobib search --fuzzy`) finds entries even if the query is misspelled or only
+approximates the words of an entry. To do so, every word is split into its character trigrams (the
+sequences of three consecutive characters, with the word being padded by two leading and one
+trailing space). The similarity of two words is the fraction of their trigrams which they share
+(i.e. the [Jaccard index](https://en.wikipedia.org/wiki/Jaccard_index) of their trigram sets).
+
+The `TrigramIndex` splits the fields configured via
+`cobib.config.config.SearchCommandConfig.fuzzy_fields` into lower-case words. It maps each of these
+words to the labels of the entries containing it, as well as each trigram to the words containing
+it. A query word then only needs to be compared to those words with which it shares at least one
+trigram rather than to all entries of the database.
+
+An entry is scored by the average similarity of every query word to its most similar word of the
+entry. Only words and entries whose similarity reaches the threshold configured via
+`cobib.config.config.SearchCommandConfig.fuzzy_threshold` are considered to match.
+
+The index gets built upon its first use and is kept up-to-date incrementally by
+`cobib.database.Database.update`, `cobib.database.Database.pop` and
+`cobib.database.Database.rename`.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Collection, Dict, Iterable, List, Optional, Set, Tuple
+
+from cobib.config import config
+
+if TYPE_CHECKING:
+    import cobib.database
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_WORD_REGEX = re.compile(r"\w+")
+"""@private the regex matching a word."""
+
+
+def trigrams(word: str) -> Set[str]:
+    """Splits a word into its character trigrams.
+
+    Args:
+        word: the (lower-case) word to split.
+
+    Returns:
+        The set of trigrams of the padded word.
+    """
+    padded = f"  {word} "
+    return {padded[idx : idx + 3] for idx in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """coBib's fuzzy search index.
+
+    This is an inverted index mapping character trigrams to the words containing them and each word
+    to the labels of the entries containing it.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty index."""
+        self._fields: Optional[Tuple[str, ...]] = None
+        """The indexed fields or `None` if the index has not been built."""
+
+        self._trigrams: Dict[str, Set[str]] = {}
+        """The dictionary mapping trigrams to the words containing them."""
+
+        self._sizes: Dict[str, int] = {}
+        """The dictionary mapping words to their number of trigrams."""
+
+        self._labels: Dict[str, Set[str]] = {}
+        """The dictionary mapping words to the labels of the entries containing them."""
+
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        """The dictionary mapping labels to the distinct words of their entries."""
+
+    @property
+    def built(self) -> bool:
+        """Whether the index has been built and still indexes the configured fields."""
+        return self._fields is not None and self._fields == tuple(
+            config.commands.search.fuzzy_fields
+        )
+
+    def __len__(self) -> int:
+        """Returns the number of indexed entries."""
+        return len(self._words)
+
+    def clear(self) -> None:
+        """Clears the index. It will be rebuilt upon its next use."""
+        self._fields = None
+        self._trigrams.clear()
+        self._sizes.clear()
+        self._labels.clear()
+        self._words.clear()
+
+    @staticmethod
+    def split(text: str) -> List[str]:
+        """Splits a text into words.
+
+        Args:
+            text: the text to split.
+
+        Returns:
+            The lower-case words of the text.
+        """
+        return _WORD_REGEX.findall(text.lower())
+
+    def build(self, entries: Iterable[Tuple[str, cobib.database.Entry]]) -> None:
+        """Builds the index.
+
+        Args:
+            entries: the pairs of labels and entries which to index.
+        """
+        self.clear()
+        self._fields = tuple(config.commands.search.fuzzy_fields)
+        for label, entry in entries:
+            self.add(label, entry)
+        LOGGER.debug("Indexed the trigrams of %d entries.", len(self))
+
+    def add(self, label: str, entry: cobib.database.Entry) -> None:
+        """Adds (or replaces) an entry in the index.
+
+        This does nothing if the index has not been built.
+
+        Args:
+            label: the label under which the entry is stored in the database.
+            entry: the entry.
+        """
+        if self._fields is None:
+            return
+        self.remove(label)
+        values = entry.stringify()
+        values["label"] = label
+        words = tuple(
+            dict.fromkeys(
+                word for field in self._fields for word in self.split(values.get(field, ""))
+            )
+        )
+        for word in words:
+            labels = self._labels.get(word, None)
+            if labels is None:
+                labels = self._labels[word] = set()
+                word_trigrams = trigrams(word)
+                self._sizes[word] = len(word_trigrams)
+                for trigram in word_trigrams:
+                    self._trigrams.setdefault(trigram, set()).add(word)
+            labels.add(label)
+        self._words[label] = words
+
+    def remove(self, label: str) -> None:
+        """Removes an entry from the index.
+
+        Args:
+            label: the label under which the entry was stored in the database.
+        """
+        words = self._words.pop(label, None)
+        if words is None:
+            return
+        for word in words:
+            labels = self._labels[word]
+            labels.discard(label)
+            if labels:
+                continue
+            # the word no longer occurs in any entry
+            del self._labels[word]
+            del self._sizes[word]
+            for trigram in trigrams(word):
+                containing = self._trigrams[trigram]
+                containing.discard(word)
+                if not containing:
+                    del self._trigrams[trigram]
+
+    def similar_words(self, word: str, threshold: float) -> Dict[str, float]:
+        """Finds the indexed words which are similar to the provided one.
+
+        Args:
+            word: the (lower-case) word to look up.
+            threshold: the minimum similarity of the returned words.
+
+        Returns:
+            The similar words mapped to their similarity.
+        """
+        word_trigrams = trigrams(word)
+        shared: Dict[str, int] = {}
+        for trigram in word_trigrams:
+            for other in self._trigrams.get(trigram, ()):
+                shared[other] = shared.get(other, 0) + 1
+        size = len(word_trigrams)
+        similar = {}
+        for other, count in shared.items():
+            similarity = count / (size + self._sizes[other] - count)
+            if similarity >= threshold:
+                similar[other] = similarity
+        return similar
+
+    def search(
+        self,
+        query: Iterable[str],
+        threshold: float,
+        labels: Optional[Collection[str]] = None,
+    ) -> Tuple[List[Tuple[str, float]], Set[str]]:
+        """Finds the entries which are similar to the query.
+
+        Args:
+            query: the query strings. These get split into words (see `split`).
+            threshold: the minimum similarity of the matching words and entries.
+            labels: an optional collection of labels to which the results are restricted.
+
+        Returns:
+            The pairs of labels and similarities of all matching entries, ordered by decreasing
+            similarity, together with the indexed words which matched the query.
+        """
+        words = list(dict.fromkeys(word for string in query for word in self.split(string)))
+        if not words:
+            return [], set()
+        totals: Dict[str, float] = {}
+        matched: Set[str] = set()
+        for word in words:
+            best: Dict[str, float] = {}
+            for other, similarity in self.similar_words(word, threshold).items():
+                matched.add(other)
+                for label in self._labels[other]:
+                    if similarity > best.get(label, 0.0):
+                        best[label] = similarity
+            for label, similarity in best.items():
+                totals[label] = totals.get(label, 0.0) + similarity
+        scores = [
+            (label, total / len(words))
+            for label, total in totals.items()
+            if total / len(words) >= threshold and (labels is None or label in labels)
+        ]
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return scores, matched
@@ -14,10 +14,16 @@ The following documentation is mostly inherited from the abstract interface
 
 import io
 import logging
+import multiprocessing
+import os
 import sys
+import time
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
-from typing import IO, Dict, Optional, Union
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from rich.console import Console
 from rich.progress import track
@@ -32,6 +38,49 @@ from .base_parser import Parser
 LOGGER = logging.getLogger(__name__)
 """@private module logger."""
 
+_CHUNKS_PER_PROCESS = 4
+"""@private the number of chunks per process into which a YAML file gets split for parallel
+loading. Using more chunks than processes balances the load between them."""
+
+_MIN_DOCUMENT_SIZE = len(b"---")
+"""@private the minimum number of bytes of a YAML document, namely its start marker."""
+
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+"""@private the method with which the worker processes of the parallel YAML loading get started."""
+
+_WORKER_YAML: Dict[bool, yaml.YAML] = {}
+"""@private the YAML loaders of a worker process, keyed by whether they are pure-Python."""
+
+
+def _available_cpus() -> int:
+    """Returns the number of CPUs available to this process.
+
+    Returns:
+        The number of usable CPUs.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1  # pragma: no cover
+
+
+def _load_chunk(chunk: bytes, pure: bool) -> Tuple[List[Dict[str, Any]], float]:
+    """Loads all YAML documents of a chunk.
+
+    This is executed inside of the worker processes of `YAMLParser._load_parallel`.
+
+    Args:
+        chunk: the raw contents of a sequence of YAML documents.
+        pure: whether to use the pure-Python implementation of the YAML parser.
+
+    Returns:
+        The pair of the loaded documents and the time it took to load them.
+    """
+    start_time = time.perf_counter()
+    if pure not in _WORKER_YAML:
+        _WORKER_YAML[pure] = yaml.YAML(typ="safe", pure=pure)
+    documents = list(_WORKER_YAML[pure].load_all(chunk.decode("utf-8")))
+    return documents, time.perf_counter() - start_time
+
 
 class YAMLParser(Parser):
     """The YAML Parser."""
@@ -55,34 +104,271 @@ class YAMLParser(Parser):
 
         bib: Dict[str, Entry] = OrderedDict()
         LOGGER.debug("Loading YAML data from file: %s.", string)
-        try:
-            stream: IO = io.StringIO(Path(string))  # type: ignore[arg-type,type-arg]
-        except TypeError:
-            try:
-                stream = open(string, "r", encoding="utf-8")  # pylint: disable=consider-using-with
-            except FileNotFoundError as exc:
-                raise exc
-        for entry in track(
+        self._construct_entries(self._load_documents(string), bib)
+
+        Event.PostYAMLParse.fire(bib)
+
+        return bib
+
+    def _construct_entries(
+        self, documents: Iterable[Dict[str, Any]], bib: Dict[str, Entry]
+    ) -> List[str]:
+        """Constructs the entries from the loaded YAML documents.
+
+        Args:
+            documents: the loaded YAML documents.
+            bib: the dictionary into which to insert the constructed entries.
+
+        Returns:
+            The labels of the constructed entries.
+        """
+        labels: List[str] = []
+        for document in documents:
+            for label, data in document.items():
+                actual_entry = Entry(label, data)
+                if actual_entry.label in bib.keys():
+                    self.warn_duplicate_label(actual_entry.label)
+                bib[actual_entry.label] = actual_entry
+                labels.append(actual_entry.label)
+        return labels
+
+    def _load_documents(self, path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+        """Loads the YAML documents of a file.
+
+        Files which may contain at least as many documents as configured by
+        `cobib.config.config.YAMLParserConfig.parallel_threshold` get loaded in parallel (see
+        `_load_parallel`). Since every document starts with a `---` marker, this can be ruled out
+        from the size of the file alone, in which case it gets streamed sequentially without any
+        further inspection. Either way, the file is read only once.
+
+        Args:
+            path: the path to the YAML file.
+
+        Yields:
+            The loaded YAML documents.
+
+        Raises:
+            FileNotFoundError: if the file does not exist.
+        """
+        threshold = config.parsers.yaml.parallel_threshold
+        processes = _available_cpus()
+        if (
+            threshold is None
+            or processes < 2
+            or os.path.getsize(path) < threshold * _MIN_DOCUMENT_SIZE
+        ):
+            with open(path, "r", encoding="utf-8") as stream:
+                yield from self._load_sequential(stream)
+            return
+
+        with open(path, "rb") as file:
+            raw = file.read()
+        documents = self._load_parallel(raw, threshold, processes)
+        if documents is None:
+            yield from self._load_sequential(raw.decode("utf-8"))
+        else:
+            yield from documents
+
+    def _load_sequential(self, stream: Union[IO[str], str]) -> Iterable[Dict[str, Any]]:
+        """Loads YAML documents sequentially while displaying a progress bar.
+
+        Args:
+            stream: the YAML documents to load.
+
+        Returns:
+            The lazily loaded YAML documents.
+        """
+        return track(
             self._yaml.load_all(stream),  # type: ignore[union-attr]
             description="Reading database...",
             transient=True,
             console=Console(file=sys.stderr),
-        ):
-            for label, data in entry.items():
-                actual_entry = Entry(label, data)
-                if actual_entry.label in bib.keys():
-                    LOGGER.warning(
-                        "An entry with label '%s' was already encountered earlier on in the YAML "
-                        "file! Please check the file manually as this cannot be resolved "
-                        "automatically by coBib.",
-                        actual_entry.label,
+        )
+
+    def _load_parallel(
+        self, raw: bytes, threshold: int, processes: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Loads YAML documents in parallel.
+
+        The contents are split into chunks at their document boundaries, which get loaded by a pool
+        of processes. The results are returned in file order, such that the construction of the
+        entries (and with it any warnings or lint messages) remains identical to the sequential
+        case.
+
+        Args:
+            raw: the raw contents of a YAML file.
+            threshold: the minimum number of documents for which to load them in parallel (see
+                `cobib.config.config.YAMLParserConfig.parallel_threshold`).
+            processes: the number of processes to use.
+
+        Returns:
+            The list of loaded YAML documents or `None` if they should be loaded sequentially.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from cobib.database.offset_index import OffsetIndex
+
+        starts = [start for start, _ in OffsetIndex.iter_ranges(raw)]
+        if len(starts) < threshold:
+            return None
+
+        num_chunks = min(len(starts), processes * _CHUNKS_PER_PROCESS)
+        # the first chunk also includes anything preceding the first document marker
+        offsets = [0] + [starts[len(starts) * idx // num_chunks] for idx in range(1, num_chunks)]
+        offsets.append(len(raw))
+        chunks = [raw[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+        LOGGER.debug(
+            "Loading %d YAML documents in %d chunks using %d processes.",
+            len(starts),
+            len(chunks),
+            processes,
+        )
+        results = self._load_chunks(chunks, processes)
+        if results is None:
+            return None
+        return [document for documents in results for document in documents]
+
+    @staticmethod
+    def _load_chunks(chunks: List[bytes], processes: int) -> Optional[List[List[Dict[str, Any]]]]:
+        """Loads chunks of YAML documents using a pool of processes.
+
+        The worker processes do not get forked from the current process, since this may be any of
+        the threads of the `cobib.ui.tui.TUI`, whose locks would be inherited in an arbitrary state.
+
+        Args:
+            chunks: the raw chunks, each consisting of complete YAML documents.
+            processes: the number of processes to use.
+
+        Returns:
+            The lists of loaded YAML documents of every chunk (in the original order) or `None` if
+            the process pool failed.
+        """
+        start_time = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context(_START_METHOD)
+            ) as executor:
+                results = list(
+                    track(
+                        executor.map(
+                            _load_chunk, chunks, repeat(not config.parsers.yaml.use_c_lib_yaml)
+                        ),
+                        description="Reading database...",
+                        total=len(chunks),
+                        transient=True,
+                        console=Console(file=sys.stderr),
                     )
-                bib[actual_entry.label] = actual_entry
-        stream.close()
+                )
+        except (OSError, BrokenProcessPool) as err:
+            LOGGER.warning("Falling back to sequential YAML parsing: %s", err)
+            return None
+        wall_time = time.perf_counter() - start_time
+
+        busy_time = sum(duration for _, duration in results)
+        LOGGER.debug(
+            "Loaded the YAML documents in %.3fs instead of %.3fs (%.1fx speedup).",
+            wall_time,
+            busy_time,
+            busy_time / wall_time if wall_time > 0 else 1.0,
+        )
+        return [documents for documents, _ in results]
+
+    def parse_shards(self, paths: List[Path]) -> Tuple[Dict[str, Entry], Dict[str, Path]]:
+        """Parses the shard files of a sharded database.
+
+        The `cobib.config.event.Event.PreYAMLParse` event gets fired for every shard file, while the
+        `cobib.config.event.Event.PostYAMLParse` event gets fired once for all entries combined.
+        The shards get loaded in parallel, following the same conditions as in `parse` (see
+        `cobib.config.config.YAMLParserConfig.parallel_threshold`).
+
+        Args:
+            paths: the paths to the shard files.
+
+        Returns:
+            The pair of the ordered dictionary of all entries and the dictionary mapping every label
+            to the shard file from which it was read.
+
+        Raises:
+            FileNotFoundError: if a shard file does not exist.
+        """
+        paths = [Path(Event.PreYAMLParse.fire(path) or path) for path in paths]
+        raws: List[bytes] = []
+        for path in paths:
+            LOGGER.debug("Loading YAML data from file: %s.", path)
+            with open(path, "rb") as file:
+                raws.append(file.read())
+
+        results: Optional[List[List[Dict[str, Any]]]] = None
+        processes = min(_available_cpus(), len(paths))
+        if config.parsers.yaml.parallel_threshold is not None and processes > 1:
+            # pylint: disable=import-outside-toplevel,cyclic-import
+            from cobib.database.offset_index import OffsetIndex
+
+            count = sum(1 for raw in raws for _ in OffsetIndex.iter_ranges(raw))
+            if count >= config.parsers.yaml.parallel_threshold:
+                LOGGER.debug("Loading %d shards using %d processes.", len(paths), processes)
+                results = self._load_chunks(raws, processes)
+        if results is None:
+            results = [
+                list(self._yaml.load_all(raw.decode("utf-8")))  # type: ignore[union-attr]
+                for raw in raws
+            ]
+
+        bib: Dict[str, Entry] = OrderedDict()
+        origins: Dict[str, Path] = {}
+        for path, documents in zip(paths, results):
+            for label in self._construct_entries(documents, bib):
+                origins[label] = path
 
         Event.PostYAMLParse.fire(bib)
 
-        return bib
+        return bib, origins
+
+    def parse_document(self, string: str) -> Entry:
+        """Parses a single YAML document of the database file.
+
+        Contrary to `parse`, this does not fire any events. It is used to construct the entries of a
+        lazily read `cobib.database.Database` on demand.
+
+        Args:
+            string: the YAML document containing exactly one entry.
+
+        Returns:
+            The parsed entry.
+        """
+        document = self._yaml.load(string)  # type: ignore[union-attr]
+        label, data = next(iter(document.items()))
+        return Entry(label, data)
+
+    @staticmethod
+    def warn_duplicate_label(label: str) -> None:
+        """Warns about a label which occurs more than once in the database file.
+
+        Args:
+            label: the duplicate label.
+        """
+        LOGGER.warning(
+            "An entry with label '%s' was already encountered earlier on in the YAML "
+            "file! Please check the file manually as this cannot be resolved "
+            "automatically by coBib.",
+            label,
+        )
+
+    @classmethod
+    def load_string(cls, string: str) -> Any:
+        """Loads a raw YAML string.
+
+        Contrary to `parse`, this does not construct any `cobib.database.Entry` instances and does
+        not fire any events. This is useful for interpreting small snippets of a database file.
+
+        Args:
+            string: the YAML string.
+
+        Returns:
+            The plain Python representation of the (first) YAML document in the string.
+        """
+        cls()
+        return cls._yaml.load(string)  # type: ignore[union-attr]
 
     @override
     def dump(self, entry: Entry) -> Optional[str]:
@@ -93,8 +93,7 @@ class CLI(UI):
             else:
                 subcmd.execute()
             if arguments.porcelain:
-                output = subcmd.render_porcelain()
-                for line in output:
+                for line in subcmd.stream_porcelain():
                     print(line)
             else:
                 renderable = subcmd.render_rich()
@@ -2,6 +2,11 @@
 
 This widget gets used to display the result of `cobib.commands.show.ShowCommand.render_textual`.
 
+Rendering an entry (in particular its syntax highlighting) is comparatively expensive. Thus, the
+widget keeps the most recently shown entries in a least-recently-used cache (see
+`EntryView.CACHE_SIZE`). The cached renderables remember the lines into which they got rendered,
+such that showing an entry again only needs to copy these.
+
 .. warning::
 
    This module makes no API stability guarantees! Refer to `cobib.ui.components` for more details.
@@ -9,15 +14,59 @@ This widget gets used to display the result of `cobib.commands.show.ShowCommand.
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List
+
+from rich.console import Console, ConsoleOptions, ConsoleRenderable, RenderResult
+from rich.measure import Measurement
+from rich.segment import Segment, SegmentLines
 from textual.app import ComposeResult
 from textual.containers import VerticalScroll
 from textual.widgets import Static
 from typing_extensions import override
 
 
+class _RenderedEntry:
+    """@private a renderable which remembers the lines into which it got rendered."""
+
+    def __init__(self, renderable: ConsoleRenderable) -> None:  # pylint: disable=C0116
+        # noqa: D107
+        self.renderable = renderable
+        """The wrapped renderable."""
+        self.lines: Dict[int, List[List[Segment]]] = {}
+        """The rendered lines, keyed by the width into which they got rendered."""
+
+    def render(self, console: Console, options: ConsoleOptions) -> List[List[Segment]]:
+        """Renders the wrapped renderable unless it was rendered at the same width before.
+
+        Args:
+            console: the console to render with.
+            options: the options to render with.
+
+        Returns:
+            The rendered lines.
+        """
+        lines = self.lines.get(options.max_width, None)
+        if lines is None:
+            lines = console.render_lines(self.renderable, options, pad=False)
+            self.lines[options.max_width] = lines
+        return lines
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        """Yields the rendered lines (see `render`)."""
+        yield SegmentLines(self.render(console, options), new_lines=True)
+
+    def __rich_measure__(self, console: Console, options: ConsoleOptions) -> Measurement:
+        """Measures the wrapped renderable."""
+        return Measurement.get(console, options, self.renderable)
+
+
 class EntryView(VerticalScroll):
     """coBib's entry viewer widget."""
 
+    CACHE_SIZE = 64
+    """The maximum number of rendered entries which are cached."""
+
     DEFAULT_CSS = """
         EntryView {
             height: 1fr;
@@ -25,6 +74,57 @@ class EntryView(VerticalScroll):
         }
     """
 
+    def __init__(self) -> None:
+        """Initializes the widget."""
+        super().__init__()
+        self._cache: OrderedDict[Hashable, _RenderedEntry] = OrderedDict()
+        """@private the least-recently-used cache of rendered entries."""
+
     @override
     def compose(self) -> ComposeResult:
         yield Static()
+
+    def _get(self, key: Hashable, render: Callable[[], ConsoleRenderable]) -> _RenderedEntry:
+        """Returns the cached renderable of an entry, creating it if necessary.
+
+        Args:
+            key: the key which identifies the rendered entry.
+            render: the callback which creates the renderable of the entry.
+
+        Returns:
+            The cached renderable.
+        """
+        rendered = self._cache.get(key, None)
+        if rendered is None:
+            rendered = _RenderedEntry(render())
+            self._cache[key] = rendered
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return rendered
+
+    def show(self, key: Hashable, render: Callable[[], ConsoleRenderable]) -> None:
+        """Shows an entry.
+
+        Args:
+            key: the key which identifies the rendered entry. It must change whenever the contents
+                of the entry or the way in which it gets rendered change.
+            render: the callback which creates the renderable of the entry. This only gets called
+                when the entry is not cached.
+        """
+        self.query_one(Static).update(self._get(key, render))
+
+    def prefetch(self, key: Hashable, render: Callable[[], ConsoleRenderable]) -> None:
+        """Renders an entry into the cache without showing it.
+
+        Args:
+            key: the key which identifies the rendered entry (see `show`).
+            render: the callback which creates the renderable of the entry.
+        """
+        static = self.query_one(Static)
+        width = static.content_region.width
+        if width <= 0:
+            return
+        console = self.app.console
+        self._get(key, render).render(console, console.options.update_width(width))
@@ -1,7 +1,13 @@
 """coBib's list results viewer widget.
 
 This widget gets produces by `cobib.commands.list.ListCommand.render_textual`.
-It subclasses textual's built-in `DataTable` widget.
+It subclasses textual's `ScrollView` widget and renders its lines itself (following textual's
+[line API](https://textual.textualize.io/guide/widgets/#line-api)).
+
+The widget only keeps the ordered list of labels. The cells of a row are produced by a callback upon
+demand and only the rows inside of the visible viewport plus a buffer of one page in either
+direction are kept around. This keeps the construction of the widget cheap, regardless of the number
+of listed entries. The widths of the columns grow to fit the widest cell rendered so far.
 
 .. warning::
 
@@ -10,19 +16,30 @@ It subclasses textual's built-in `DataTable` widget.
 
 from __future__ import annotations
 
+from typing import Callable, Dict, List, Optional, Sequence
+
+from rich.segment import Segment
+from rich.style import Style
 from rich.text import Text
+from textual import events
 from textual.binding import Binding
 from textual.coordinate import Coordinate
-from textual.geometry import Region, clamp
-from textual.widgets import DataTable
+from textual.css.query import NoMatches
+from textual.geometry import Region, Size, clamp
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
 from typing_extensions import override
 
 from cobib.config import config
 
 from .motion_key import MotionKey
 
+RowRenderer = Callable[[str], Sequence[Text]]
+"""The type of the callback which renders the cells of the row of a label."""
+
 
-class ListView(DataTable[Text]):
+class ListView(ScrollView, can_focus=True):
     """coBib's list results viewer widget."""
 
     id = "cobib-list-view"
@@ -44,7 +61,6 @@ class ListView(DataTable[Text]):
     """
     | Key(s) | Description |
     | :- | :- |
-    | space | Toggle the expand/collapsed space of the current item. |
     | j, down | Moves one row down. |
     | k, up | Moves one row up. |
     | h, left | Moves to the left. |
@@ -55,38 +71,290 @@ class ListView(DataTable[Text]):
     | Home | Moves to the top of the list. |
     """
 
+    COMPONENT_CLASSES = {
+        "list-view--header",
+        "list-view--fixed",
+        "list-view--fixed-cursor",
+        "list-view--cursor",
+        "list-view--odd-row",
+        "list-view--even-row",
+    }
+    """
+    | Class | Description |
+    | :- | :- |
+    | `list-view--header` | Target the header row. |
+    | `list-view--fixed` | Target the fixed (label) column. |
+    | `list-view--fixed-cursor` | Target the fixed (label) column of the row under the cursor. |
+    | `list-view--cursor` | Target the row under the cursor. |
+    | `list-view--odd-row` | Target odd rows (row indices start at 0). |
+    | `list-view--even-row` | Target even rows (row indices start at 0). |
+    """
+
     DEFAULT_CSS = """
         ListView {
             height: 1fr;
+            background: $surface;
+            color: $text;
+        }
+        ListView > .list-view--header {
+            text-style: bold;
+            background: $primary;
+            color: $text;
+        }
+        ListView > .list-view--fixed {
+            background: $primary 50%;
+            color: $text;
+        }
+        ListView > .list-view--fixed-cursor {
+            background: $secondary 92%;
+            color: $text;
+        }
+        ListView > .list-view--cursor {
+            background: $secondary;
+            color: $text;
+        }
+        ListView > .list-view--even-row {
+            background: $primary 10%;
+        }
+        .-dark-mode ListView > .list-view--even-row {
+            background: $primary 15%;
         }
     """
 
+    cursor_row: reactive[int] = reactive(0)
+    """The index of the row under the cursor."""
+
+    def __init__(
+        self,
+        labels: Sequence[str] = (),
+        columns: Sequence[str] = (),
+        render_row: Optional[RowRenderer] = None,
+    ) -> None:
+        """Initializes the widget.
+
+        Args:
+            labels: the ordered labels of the listed entries.
+            columns: the names of the columns. The first column must contain the label.
+            render_row: the callback which renders the cells of the row of a label. If omitted, only
+                the labels are shown.
+        """
+        super().__init__()
+        self.labels: List[str] = list(labels)
+        """The ordered labels of the listed entries."""
+        self.columns: List[str] = list(columns) or ["label"]
+        """The names of the columns."""
+        self._render_row: RowRenderer = render_row or (lambda label: [Text(label)])
+        self._rows: Dict[str, Sequence[Text]] = {}
+        """@private the rendered cells of the rows inside of the viewport and its buffer."""
+        self._widths: List[int] = [len(col) for col in self.columns]
+        """@private the widths of the columns (excluding their padding)."""
+        self._update_virtual_size()
+
     @property
+    def row_count(self) -> int:
+        """The number of rows."""
+        return len(self.labels)
+
+    @property
+    def cursor_coordinate(self) -> Coordinate:
+        """The coordinate of the cursor. Only its row is meaningful for this widget."""
+        return Coordinate(self.cursor_row, 0)
+
+    @cursor_coordinate.setter
+    def cursor_coordinate(self, coordinate: Coordinate) -> None:
+        self.cursor_row = coordinate.row
+
+    @property
+    def _page_height(self) -> int:
+        """The number of rows which fit into the viewport (below the header)."""
+        return max(self.scrollable_content_region.height - 1, 1)
+
+    def _update_virtual_size(self) -> None:
+        """Updates the virtual size based on the rows and the current column widths."""
+        width = sum(width + 2 for width in self._widths)
+        self.virtual_size = Size(width, self.row_count + 1)
+
+    def validate_cursor_row(self, value: int) -> int:
+        """Clamps the cursor onto the existing rows.
+
+        Args:
+            value: the requested row index.
+
+        Returns:
+            The valid row index.
+        """
+        return clamp(value, 0, max(self.row_count - 1, 0))
+
+    def watch_cursor_row(self) -> None:
+        """Keeps at least `config.tui.scroll_offset` rows above and below the cursor visible."""
+        offset = min(config.tui.scroll_offset, (self._page_height - 1) // 2)
+        scroll_y = self.scroll_y
+        if self.cursor_row - offset < scroll_y:
+            scroll_y = self.cursor_row - offset
+        elif self.cursor_row + offset >= scroll_y + self._page_height:
+            scroll_y = self.cursor_row + offset - self._page_height + 1
+        self.scroll_to(y=max(scroll_y, 0), animate=False)
+        self.refresh()
+
+    def update_labels(self, labels: Sequence[str], changed: Sequence[str] = ()) -> None:
+        """Replaces the listed labels in-place.
+
+        The cursor remains on the same row index (as far as it still exists).
+
+        Args:
+            labels: the new ordered labels of the listed entries.
+            changed: the labels of the rows which need to be rendered anew.
+        """
+        self.labels = list(labels)
+        self._update_virtual_size()
+        self.cursor_row = self.cursor_row
+        self.refresh_rows(changed)
+
+    def refresh_rows(self, labels: Optional[Sequence[str]] = None) -> None:
+        """Forgets the rendered cells of the given rows such that they get rendered anew.
+
+        Args:
+            labels: the labels of the rows to refresh. If omitted, all rows get refreshed.
+        """
+        if labels is None:
+            self._rows.clear()
+        else:
+            for label in labels:
+                self._rows.pop(label, None)
+        self.refresh()
+
+    def _get_row(self, label: str) -> Sequence[Text]:
+        """Returns the rendered cells of a row, rendering them if necessary.
+
+        Args:
+            label: the label of the row.
+
+        Returns:
+            The rendered cells of the row.
+        """
+        cells = self._rows.get(label, None)
+        if cells is None:
+            cells = self._render_row(label)
+            self._rows[label] = cells
+            for idx, cell in enumerate(cells[: len(self._widths)]):
+                if cell.cell_len > self._widths[idx]:
+                    self._widths[idx] = cell.cell_len
+        return cells
+
+    def _prepare_rows(self) -> None:
+        """Renders the rows inside of the viewport and its buffer and forgets all others."""
+        page = self._page_height
+        first = max(int(self.scroll_y) - page, 0)
+        labels = self.labels[first : int(self.scroll_y) + 2 * page]
+        widths = list(self._widths)
+        for label in labels:
+            self._get_row(label)
+        if len(self._rows) > len(labels):
+            keep = set(labels)
+            self._rows = {label: cells for label, cells in self._rows.items() if label in keep}
+        if widths != self._widths:
+            self._update_virtual_size()
+
     @override
-    def scrollable_content_region(self) -> Region:
-        # we shrink the scroll-able content region by the scroll offset at the bottom
-        # NOTE: shrinking at the top does not seem to yield the intended result as it merely adds to
-        # the offset at the bottom
-        return super().scrollable_content_region.shrink((0, 0, config.tui.scroll_offset, 0))
+    def render_lines(self, crop: Region) -> List[Strip]:
+        self._prepare_rows()
+        return super().render_lines(crop)
+
+    def _render_cells(self, cells: Sequence[Text], widths: Sequence[int], style: Style) -> Strip:
+        """Renders cells into a single line.
+
+        Args:
+            cells: the cells to render.
+            widths: the widths of the columns of these cells.
+            style: the base style of the line.
+
+        Returns:
+            The rendered line.
+        """
+        console = self.app.console
+        segments: List[Segment] = []
+        for cell, width in zip(cells, widths):
+            text = cell.copy()
+            text.truncate(width, pad=True)
+            text.pad(1)
+            segments.extend(text.render(console, end=""))
+        return Strip(Segment.apply_style(segments, style), sum(width + 2 for width in widths))
 
     @override
-    def validate_scroll_y(self, value: float) -> float:
-        # we implement the scroll offset at the top by forcing the scroll y value to be at
-        # least an offset away from the cursor row
-        if self.cursor_row - value < config.tui.scroll_offset:
-            value = self.cursor_row - config.tui.scroll_offset
-        return clamp(value, 0, self.row_count)
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        scroll_x, scroll_y = self.scroll_offset
+        base_style = self.rich_style
+
+        if y == 0:
+            cells: Sequence[Text] = [Text(col) for col in self.columns]
+            style = base_style + self.get_component_rich_style("list-view--header")
+            fixed_style = style
+        else:
+            row = scroll_y + y - 1
+            if row >= self.row_count:
+                return Strip.blank(width, base_style)
+            cells = self._get_row(self.labels[row])
+            if row == self.cursor_row:
+                style = base_style + self.get_component_rich_style("list-view--cursor")
+                fixed_style = base_style + self.get_component_rich_style("list-view--fixed-cursor")
+            else:
+                parity = "even" if row % 2 == 0 else "odd"
+                style = base_style + self.get_component_rich_style(f"list-view--{parity}-row")
+                fixed_style = base_style + self.get_component_rich_style("list-view--fixed")
+
+        cells = list(cells) + [Text()] * (len(self.columns) - len(cells))
+        fixed = self._render_cells(cells[:1], self._widths[:1], fixed_style)
+        scrollable = self._render_cells(cells[1:], self._widths[1:], style)
+        scrollable = scrollable.crop(scroll_x, scroll_x + max(width - fixed.cell_length, 0))
+        return Strip.join([fixed, scrollable]).adjust_cell_length(width, style)
+
+    def on_click(self, event: events.Click) -> None:
+        """Moves the cursor onto the clicked row.
+
+        Args:
+            event: the click event.
+        """
+        if event.y > 0:
+            self.cursor_row = int(self.scroll_y) + event.y - 1
+            self.post_message(MotionKey("down"))
+
+    def action_cursor_down(self) -> None:
+        """Moves the cursor one row down."""
+        self.cursor_row += 1
+
+    def action_cursor_up(self) -> None:
+        """Moves the cursor one row up."""
+        self.cursor_row -= 1
+
+    def action_cursor_right(self) -> None:
+        """Scrolls one column to the right."""
+        self.scroll_right(animate=False)
+
+    def action_cursor_left(self) -> None:
+        """Scrolls one column to the left."""
+        self.scroll_left(animate=False)
+
+    @override
+    def action_scroll_home(self) -> None:
+        self.cursor_row = 0
+
+    @override
+    def action_scroll_end(self) -> None:
+        self.cursor_row = self.row_count - 1
+
+    @override
+    def action_page_down(self) -> None:
+        self.cursor_row += self._page_height
 
     @override
-    def on_mount(self) -> None:
-        self.fixed_columns = 1
-        self.zebra_stripes = True
-        self.cursor_type = "row"
+    def action_page_up(self) -> None:
+        self.cursor_row -= self._page_height
 
     def action_motion(self, key: str, action: str) -> None:
         """Action to move the cursor.
 
-        Under the hood, this delegates to the respective built-in cursor motion methods.
+        Under the hood, this delegates to the respective cursor motion methods.
         However, this method also posts a `cobib.ui.components.motion_key.MotionKey` event.
 
         Args:
@@ -101,8 +369,12 @@ class ListView(DataTable[Text]):
     def get_current_label(self) -> str:
         """Gets the label of the entry currently under the cursor.
 
+        Raises:
+            NoMatches: when the list is empty.
+
         Returns:
             The label of the entry currently under the cursor.
         """
-        label = self.get_cell_at(Coordinate(self.cursor_row, 0)).plain
-        return label
+        if not self.labels:
+            raise NoMatches
+        return self.labels[self.cursor_row]
@@ -47,4 +47,18 @@ class PopupLoggingHandler(logging.Handler):
 
     @override
     def emit(self, record: logging.LogRecord) -> None:
-        self._app.print(Popup(self.format(record), level=record.levelno))
+        message = self.format(record)
+        try:
+            # records emitted by background workers must be displayed from within the main thread
+            self._app.call_from_thread(self._print, message, record.levelno)
+        except RuntimeError:
+            self._print(message, record.levelno)
+
+    def _print(self, message: str, level: int) -> None:
+        """Displays a logging message as a `cobib.ui.components.popup.Popup`.
+
+        Args:
+            message: the formatted message.
+            level: the level of the logging record.
+        """
+        self._app.print(Popup(message, level=level))
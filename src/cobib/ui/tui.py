@@ -18,21 +18,27 @@ import io
 import logging
 import shlex
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from functools import partial
 from inspect import iscoroutinefunction
-from typing import Any, Awaitable, Callable, Coroutine, Iterator, cast
+from typing import Any, Awaitable, Callable, Hashable, Iterator, TypeVar, cast
 
-from rich.console import RenderableType
+from rich.console import ConsoleRenderable, RenderableType
 from textual.app import App, ComposeResult
 from textual.css.query import NoMatches
 from textual.keys import Keys
 from textual.logging import TextualHandler
+from textual.timer import Timer
 from textual.widget import AwaitMount, Widget
-from textual.widgets import Footer, Header, Input, Static
+from textual.widgets import Footer, Header, Input, LoadingIndicator, Static
+from textual.worker import Worker
 from typing_extensions import override
 
 from cobib import commands
-from cobib.config import config
+from cobib.config import Event, config
+from cobib.database import Database
 from cobib.ui.components import (
     EntryView,
     HelpScreen,
@@ -53,6 +59,10 @@ from cobib.ui.ui import UI
 from cobib.utils.file_downloader import FileDownloader
 
 LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+_T = TypeVar("_T")
+"""@private the type of the result of a background job."""
 
 
 # NOTE: pylint and mypy are unable to understand that the `App` interface actually implements `run`
@@ -136,6 +146,15 @@ class TUI(UI, App[None]):  # type: ignore[misc]
     | x | Exports the current (or selected) entries. |
     """
 
+    ENTRY_DEBOUNCE = 0.05
+    """The number of seconds to wait after a motion key before rendering the entry under the cursor.
+    Any further motion within this period restarts the wait, such that only the final position of
+    the cursor gets rendered."""
+
+    ENTRY_PREFETCH = 0.25
+    """The number of seconds to wait after rendering the entry under the cursor before the
+    neighbouring entries of the list get rendered into the cache of the `EntryView`."""
+
     SCREENS = {
         "help": HelpScreen,
         "input": InputScreen,
@@ -155,9 +174,18 @@ class TUI(UI, App[None]):  # type: ignore[misc]
         self.title = "coBib"
         self.sub_title = "The Console Bibliography Manager"
         self._list_args = ["-r"]
+        self._listed_args: list[str] | None = None
         self._filter: SelectionFilter = SelectionFilter()
         self._filters.append(self._filter)
         self._background_tasks: set[asyncio.Task] = set()  # type: ignore[type-arg]
+        self._entry_timer: Timer | None = None
+        self._pending_changes: list[dict[str, str | None]] | None = None
+        self._generation = 0
+        # the background jobs access the database and, thus, must run one after another
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cobib")
+        # the commands must not change the database while a background job reads it
+        self._database_lock = threading.Lock()
+        self._command_task: asyncio.Task[None] | None = None
         PopupLoggingHandler(self, level=logging.INFO)
         FileDownloader.console = self
         FileDownloader.progress = Progress
@@ -231,7 +259,8 @@ class TUI(UI, App[None]):  # type: ignore[misc]
             event: the motion event.
         """
         if event.key in {Keys.Down, Keys.Up, Keys.PageDown, Keys.PageUp, Keys.Home, Keys.End}:
-            self._show_entry()
+            # bursts of motions only render the final entry
+            self._schedule(self.ENTRY_DEBOUNCE, self._show_entry)
 
     async def on_mount(self) -> None:
         """Triggers on the [`Mount`][1] event.
@@ -242,7 +271,15 @@ class TUI(UI, App[None]):  # type: ignore[misc]
         """
         self.screen.styles.layout = "horizontal"
         await self._update_table()
-        self._show_entry()
+
+    def on_unmount(self) -> None:
+        """Triggers on the [`Unmount`][1] event.
+
+        This method stops the thread which runs the background jobs once it becomes idle.
+
+        [1]: https://textual.textualize.io/api/events/#textual.events.Unmount
+        """
+        self._executor.shutdown(wait=False)
 
     # Action methods
 
@@ -430,46 +467,287 @@ class TUI(UI, App[None]):  # type: ignore[misc]
         with self.suspend():
             commands.EditCommand(label).execute()
 
+    def _schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        """Schedules the rendering of entries, replacing any previously scheduled one.
+
+        Args:
+            delay: the number of seconds after which to run the callback.
+            callback: the callback rendering the entries.
+        """
+        if self._entry_timer is not None:
+            self._entry_timer.stop()
+        self._entry_timer = self.set_timer(delay, callback)
+
+    def _render_entry(self, label: str) -> tuple[Hashable, Callable[[], ConsoleRenderable]]:
+        """Prepares the rendering of an entry via the `cobib.commands.show.ShowCommand`.
+
+        The rendered entry is identified by its label, the `cobib.database.entry.EntryData.version`
+        of its data and the `cobib.config.config._ConfigBase.revision`. Thus, the
+        `cobib.commands.show.ShowCommand` only runs once the entry is not cached by the `EntryView`.
+        However, when any hooks are subscribed to the `cobib.config.event.Event.PreShowCommand` or
+        `cobib.config.event.Event.PostShowCommand` events, the command runs every time such that
+        these fire whenever the entry gets shown.
+
+        Args:
+            label: the label of the entry.
+
+        Returns:
+            The key identifying the rendered entry in the cache of the `EntryView` and the callback
+            which renders it.
+        """
+        background_color = self.query_one(EntryView).background_colors[1].rich_color.name
+
+        if Event.PreShowCommand in config.events or Event.PostShowCommand in config.events:
+            show_cmd = commands.ShowCommand(label)
+            show_cmd.execute()
+            key = (label, show_cmd.entry_str, background_color)
+            return key, partial(show_cmd.render_rich, background_color=background_color)
+
+        entry = Database().get(label)
+        version = None if entry is None else entry.data.version
+
+        def render() -> ConsoleRenderable:
+            show_cmd = commands.ShowCommand(label)
+            show_cmd.execute()
+            return show_cmd.render_rich(background_color=background_color)
+
+        return (label, version, config.revision, background_color), render
+
     def _show_entry(self) -> None:
-        """Renders the entry currently under the cursor in the `EntryView` widget."""
+        """Renders the entry currently under the cursor in the `EntryView` widget.
+
+        The neighbouring entries of the list get rendered into the cache of the `EntryView` once the
+        user remains idle.
+        """
         main = self.query_one(MainContent)
-        label = main.get_current_label()
-        show_cmd = commands.ShowCommand(label)
-        show_cmd.execute()
-        entry = self.query_one(EntryView)
-        static = entry.query_one(Static)
-        static.update(
-            show_cmd.render_rich(
-                background_color=entry.background_colors[1].rich_color.name,
-            )
-        )
+        try:
+            label = main.get_current_label()
+        except NoMatches:
+            return
+        self.query_one(EntryView).show(*self._render_entry(label))
+        self._schedule(self.ENTRY_PREFETCH, self._prefetch_entries)
+
+    def _prefetch_entries(self) -> None:
+        """Renders the entries above and below the cursor into the cache of the `EntryView`."""
+        if Event.PreShowCommand in config.events or Event.PostShowCommand in config.events:
+            # the hooks should only fire for entries which actually get shown
+            return
+        main = self.query_one(MainContent)
+        if main.current != ListView.id:
+            return
+        table = main.query_one(ListView)
+        entry_view = self.query_one(EntryView)
+        for row in (table.cursor_row + 1, table.cursor_row - 1):
+            if 0 <= row < table.row_count:
+                entry_view.prefetch(*self._render_entry(table.labels[row]))
 
     async def _update_table(self) -> None:
-        """Updates the list of entries displayed in the `MainContent`."""
+        """Updates the list of entries displayed in the `MainContent`.
+
+        The entries get listed in the background (see `_replace_main_content`). When the arguments
+        of the listing did not change, only the entries which changed in the database since the
+        last update get patched into the displayed list (see
+        `cobib.commands.list_.ListCommand.patch_labels`). Otherwise, the entire list gets replaced.
+        """
+        changes = Database.pop_changes()
+        if changes is None or self._pending_changes is None:
+            self._pending_changes = None
+        else:
+            self._pending_changes.append(changes)
+        pending: list[dict[str, str | None]] | None = None
+        if self._pending_changes is not None and self._listed_args == self._list_args:
+            pending = list(self._pending_changes)
+        args = list(self._list_args)
+        labels = list(self.query_one(MainContent).query_one(ListView).labels)
+        self._replace_main_content(
+            "list",
+            partial(self._list_entries, args, labels, pending),
+            partial(self._show_table, args, pending or []),
+        )
+
+    @staticmethod
+    def _list_entries(
+        args: list[str], labels: list[str], changes: list[dict[str, str | None]] | None
+    ) -> tuple[commands.ListCommand, list[str] | None] | None:
+        """Lists the entries of the database.
+
+        .. note::
+           This method runs in a background thread.
+
+        Args:
+            args: the arguments of the `cobib.commands.list_.ListCommand`.
+            labels: the labels which are currently displayed.
+            changes: the changes of the database since the `labels` were listed with the same
+                arguments. If this is `None`, the entries always get listed anew.
+
+        Returns:
+            The executed command and the patched labels (or `None` if the command had to list all
+            entries anew). The entire result is `None` when the arguments could not be parsed.
+        """
+        try:
+            command = commands.ListCommand(*args)
+        except SystemExit:
+            return None
+        if changes is not None:
+            for change in changes:
+                patched = command.patch_labels(labels, change)
+                if patched is None:
+                    break
+                labels = patched
+            else:
+                return command, labels
+        command.execute()
+        return command, None
+
+    async def _show_table(
+        self,
+        args: list[str],
+        changes: list[dict[str, str | None]],
+        result: tuple[commands.ListCommand, list[str] | None],
+    ) -> None:
+        """Displays the result of `_list_entries` in the `MainContent`.
+
+        Args:
+            args: the arguments with which the entries were listed.
+            changes: the changes of the database which were patched into the displayed labels.
+            result: the result of `_list_entries`.
+        """
+        command, labels = result
         main = self.query_one(MainContent)
         old_table = main.query_one(ListView)
-        command = commands.ListCommand(*self._list_args)
-        command.execute()
-        table = command.render_textual()
-        await main.replace_widget(table)
-        table.focus()
-        if old_table is not None:
-            table.cursor_coordinate = old_table.cursor_coordinate
+        self._listed_args = args
+        self._pending_changes = []
+        if labels is not None:
+            changed = [label for change in changes for label in change.values() if label]
+            old_table.update_labels(labels, changed)
+            main.current = old_table.id
+            old_table.focus()
+        else:
+            table = command.render_textual()
+            await main.replace_widget(table)
+            table.focus()
+            table.cursor_row = old_table.cursor_row
             table.scroll_x = old_table.scroll_x
             table.scroll_y = old_table.scroll_y
             del old_table
         self.refresh(layout=True)
+        self._show_entry()
 
     async def _update_tree(self, command: list[str]) -> None:
-        """Updates the tree of search results displayed in the `MainContent`."""
-        subcmd = commands.SearchCommand(*command)
-        subcmd.execute()
+        """Updates the tree of search results displayed in the `MainContent`.
+
+        The search runs in the background (see `_replace_main_content`).
+
+        Args:
+            command: the arguments of the `cobib.commands.search.SearchCommand`.
+        """
+        self._replace_main_content(
+            "search", partial(self._search_entries, list(command)), self._show_tree
+        )
+
+    @staticmethod
+    def _search_entries(args: list[str]) -> commands.SearchCommand | None:
+        """Searches the entries of the database.
+
+        .. note::
+           This method runs in a background thread.
+
+        Args:
+            args: the arguments of the `cobib.commands.search.SearchCommand`.
+
+        Returns:
+            The executed command or `None` when the arguments could not be parsed.
+        """
+        try:
+            subcmd = commands.SearchCommand(*args)
+            subcmd.execute()
+        except SystemExit:
+            return None
+        return subcmd
+
+    async def _show_tree(self, subcmd: commands.SearchCommand) -> None:
+        """Displays the result of `_search_entries` in the `MainContent`.
+
+        Args:
+            subcmd: the executed search command.
+        """
         tree = subcmd.render_textual()
         main = self.query_one(MainContent)
         await main.replace_widget(tree)
         tree.focus()
         self.refresh(layout=True)
 
+    def _replace_main_content(
+        self,
+        description: str,
+        work: Callable[[], _T | None],
+        show: Callable[[_T], Awaitable[None]],
+    ) -> Worker[None]:
+        """Replaces the contents of the `MainContent` with the result of a background job.
+
+        The job runs in a background thread such that the TUI remains responsive, while a progress
+        indicator is being displayed. All jobs run one after another in the same thread and never
+        concurrently with a command which may change the `cobib.database.Database` (see
+        `_run_command`). Starting a new job cancels the previous one: a job which did not start yet
+        gets skipped and, since threads cannot be interrupted, the result of a running one simply
+        gets discarded. The same happens to a result which is already waiting to be displayed.
+        Thus, only the result of the latest job ever gets shown.
+
+        Args:
+            description: a short description of the job.
+            work: the blocking callback which computes the result. It returns `None` when there is
+                nothing to be displayed.
+            show: the asynchronous callback which displays the result. It runs on the main thread.
+
+        Returns:
+            The worker which runs the job.
+        """
+        self._generation += 1
+        generation = self._generation
+
+        def _work() -> _T | None:
+            if generation != self._generation:
+                LOGGER.debug("Skipping the superseded %s job.", description)
+                return None
+            with self._database_lock:
+                return work()
+
+        async def _run() -> None:
+            indicator = LoadingIndicator()
+            indicator.styles.height = 1
+            self.print(indicator)
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, _work)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                LOGGER.error("The %s job failed: %s", description, err)
+                return
+            finally:
+                indicator.remove()
+            if result is not None:
+                self.call_later(self._show_latest, generation, show, result)
+
+        return self.run_worker(
+            _run(),
+            name=description,
+            group="main-content",
+            description=description,
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    async def _show_latest(
+        self, generation: int, show: Callable[[_T], Awaitable[None]], result: _T
+    ) -> None:
+        """Displays the result of a background job unless a newer one has been started since.
+
+        Args:
+            generation: the generation of the job which computed the result.
+            show: the callback which displays the result.
+            result: the result to be displayed.
+        """
+        if generation == self._generation:
+            await show(result)
+
     async def _process_input(self, value: str) -> None:
         """Processes the input returned from the `cobib.ui.components.input_screen.InputScreen`.
 
@@ -523,60 +801,59 @@ class TUI(UI, App[None]):  # type: ignore[misc]
             else:
                 self._run_command(command)
 
-    @staticmethod
-    async def _async_done_callback(
-        task: Awaitable[None], async_callback: Callable[[], Coroutine[Any, Any, None]]
-    ) -> None:
-        """Adds an asynchronous callback for when the provided task is done.
-
-        Args:
-            task: the Task to await before running the next coroutine.
-            async_callback: the asynchronous callback to run after the `task` has completed.
-        """
-        await task
-        await async_callback()
-
     def _run_command(self, command: list[str]) -> None:
         """Parses and executes a cobib command with its arguments.
 
+        The command runs on the main thread because it may change the `cobib.database.Database`
+        which the widgets of the TUI read from. It waits until the background job (see
+        `_replace_main_content`) which may currently be reading the database has finished. The
+        commands themselves run in the order in which they were issued.
+
         This method also redirects `stdout` and `stderr` and captures their contents to be displayed
         as popups in the TUI.
 
         Args:
             command: the list of command and its arguments.
         """
-        with redirect_stdout(io.StringIO()) as stdout:
-            with redirect_stderr(io.StringIO()) as stderr:
-                try:
-                    subcmd = getattr(commands, command[0].title() + "Command")(
-                        *command[1:], prompt=Prompt, console=self
-                    )
-
-                    if not iscoroutinefunction(subcmd.execute):
-                        subcmd.execute()
-                    else:
-                        # 1. create subcommand execution task
-                        task1 = asyncio.create_task(subcmd.execute())
-
-                        # 2. create another task which chains an asynchronous callback after the
-                        #    previous one
-                        task2 = asyncio.create_task(
-                            TUI._async_done_callback(task1, self._update_table)
-                        )
-
-                        # 3. ensure proper clean-up of all created tasks
-                        self._background_tasks.add(task1)
-                        task1.add_done_callback(self._background_tasks.discard)
-                        self._background_tasks.add(task2)
-                        task2.add_done_callback(self._background_tasks.discard)
-
-                except SystemExit:
-                    pass
-
-        stdout_val = stdout.getvalue().strip()
-        if stdout_val:
-            self.print(Popup(stdout_val, level=logging.INFO))
-
-        stderr_val = stderr.getvalue().strip()
-        if stderr_val:
-            self.print(Popup(stderr_val, level=logging.CRITICAL))
+        previous = self._command_task
+
+        async def _run() -> None:
+            if previous is not None:
+                await asyncio.wait([previous])
+            # acquire the lock without blocking the event loop while a background job holds it
+            await asyncio.get_running_loop().run_in_executor(None, self._database_lock.acquire)
+            try:
+                subcmd: Any = None
+                with redirect_stdout(io.StringIO()) as stdout:
+                    with redirect_stderr(io.StringIO()) as stderr:
+                        try:
+                            subcmd = getattr(commands, command[0].title() + "Command")(
+                                *command[1:], prompt=Prompt, console=self
+                            )
+                            if not iscoroutinefunction(subcmd.execute):
+                                subcmd.execute()
+                                subcmd = None
+                        except SystemExit:
+                            subcmd = None
+
+                stdout_val = stdout.getvalue().strip()
+                if stdout_val:
+                    self.print(Popup(stdout_val, level=logging.INFO))
+
+                stderr_val = stderr.getvalue().strip()
+                if stderr_val:
+                    self.print(Popup(stderr_val, level=logging.CRITICAL))
+
+                if subcmd is None:
+                    return
+
+                await subcmd.execute()
+            finally:
+                self._database_lock.release()
+
+            await self._update_table()
+
+        task = asyncio.create_task(_run())
+        self._command_task = task
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
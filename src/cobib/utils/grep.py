@@ -0,0 +1,202 @@
+"""coBib's batched search of associated files.
+
+Searching the files associated with an entry (see `cobib.database.Entry.search`) runs the configured
+`cobib.config.config.SearchCommandConfig.grep` tool once per query, file and entry. On large
+libraries, spawning all of these processes dominates the duration of a search.
+
+Instead, `grep_files` searches all of the files at once using a single invocation of the tool per
+query (splitting overly long lists of files into chunks of `CHUNK_SIZE`). The matches get attributed
+to the files by means of the structured output of the tool:
+
+* [ripgrep](https://github.com/BurntSushi/ripgrep) reports its matches as JSON (`--json`).
+* GNU and BSD `grep` prefix each line with the file name terminated by a null byte (`-H --null`).
+
+Any other tool is detected via its `--version` output and falls back to searching each file
+separately. The same happens when an invocation fails.
+
+.. note::
+   The queries are *not* combined into a single invocation (using multiple `-e` arguments). Doing so
+   would merge the context lines of different queries into the same match, whereas every query is
+   supposed to report its matches separately.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from cobib.config import config
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+CHUNK_SIZE = 1000
+"""The maximum number of files passed to a single invocation of the search tool."""
+
+Matches = Dict[Path, List[List[str]]]
+"""The matches of a single query, keyed by the path of the file in which they occur. Every match is
+a list of its (context) lines."""
+
+
+@lru_cache(maxsize=None)
+def output_format(grep: str) -> Optional[str]:
+    """Detects the structured output supported by a search tool.
+
+    Args:
+        grep: the name of the search tool.
+
+    Returns:
+        `"json"` for ripgrep, `"null"` for GNU and BSD `grep` or `None` if the tool is unknown.
+    """
+    try:
+        result = subprocess.run(
+            [grep, "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError) as err:
+        LOGGER.debug("Could not detect the version of %s: %s", grep, err)
+        return None
+    version = result.stdout.decode("utf-8", errors="replace")
+    if "ripgrep" in version:
+        return "json"
+    if "GNU grep" in version or "BSD grep" in version:
+        return "null"
+    LOGGER.debug("The search tool %s does not support batched searches.", grep)
+    return None
+
+
+def _parse_null(stdout: bytes) -> Matches:
+    """Parses the output of `grep -H --null`.
+
+    Args:
+        stdout: the raw output.
+
+    Returns:
+        The parsed matches.
+    """
+    matches: Matches = {}
+    group: Optional[List[str]] = None
+    current = ""
+    for line in stdout.decode("utf-8", errors="replace").split("\n"):
+        if line == "--" or not line:
+            group = None
+            continue
+        name, sep, text = line.partition("\0")
+        if not sep:
+            continue
+        if group is None or name != current:
+            current = name
+            group = []
+            matches.setdefault(Path(name), []).append(group)
+        if text.strip():
+            group.append(text.strip())
+    return matches
+
+
+def _parse_json(stdout: bytes) -> Matches:
+    """Parses the output of `rg --json`.
+
+    Args:
+        stdout: the raw output.
+
+    Returns:
+        The parsed matches.
+    """
+    matches: Matches = {}
+    group: List[str] = []
+    current = ""
+    last_line = -1
+    for line in stdout.splitlines():
+        message = json.loads(line)
+        if message["type"] not in ("match", "context"):
+            continue
+        data = message["data"]
+        name = data["path"].get("text", "")
+        line_number = data["line_number"]
+        if name != current or line_number != last_line + 1:
+            current = name
+            group = []
+            matches.setdefault(Path(name), []).append(group)
+        last_line = line_number
+        text = data["lines"].get("text", "").strip()
+        if text:
+            group.append(text)
+    return matches
+
+
+def _grep_chunk(paths: Sequence[Path], query: str, context: int) -> Optional[Matches]:
+    """Searches a chunk of files for a single query.
+
+    Args:
+        paths: the paths of the files.
+        query: the regex pattern to search for.
+        context: the number of context lines to provide for each match.
+
+    Returns:
+        The matches or `None` if the search tool failed.
+    """
+    grep = config.commands.search.grep
+    output = output_format(grep)
+    if output is None:
+        return None
+    args = [grep, *config.commands.search.grep_args]
+    args += ["--json"] if output == "json" else ["-H", "--null"]
+    args += [f"-C{context}", "-e", query, "--", *(str(path) for path in paths)]
+    try:
+        result = subprocess.run(args, stdout=subprocess.PIPE, check=False)
+    except OSError as err:
+        LOGGER.debug("Could not run %s: %s", grep, err)
+        return None
+    # exit code 1 means that nothing matched
+    if result.returncode > 1:
+        LOGGER.debug("The batched search with %s failed with exit code %d", grep, result.returncode)
+        return None
+    try:
+        return _parse_json(result.stdout) if output == "json" else _parse_null(result.stdout)
+    except (ValueError, KeyError, TypeError) as err:
+        LOGGER.debug("Could not parse the output of %s: %s", grep, err)
+        return None
+
+
+def grep_files(
+    paths: Sequence[Path], queries: Sequence[str], context: int, jobs: int = 1
+) -> Optional[Dict[str, Matches]]:
+    """Searches all of the provided files for every query.
+
+    Args:
+        paths: the paths of the files.
+        queries: the regex patterns to search for.
+        context: the number of context lines to provide for each match.
+        jobs: the maximum number of invocations of the search tool which run concurrently.
+
+    Returns:
+        The matches of every query or `None` if the search tool does not support batched searches
+        or failed. In this case the files need to be searched separately.
+    """
+    if output_format(config.commands.search.grep) is None:
+        return None
+    unique = list(dict.fromkeys(paths))
+    chunks = [unique[idx : idx + CHUNK_SIZE] for idx in range(0, len(unique), CHUNK_SIZE)]
+    tasks = [(query, chunk) for query in dict.fromkeys(queries) for chunk in chunks]
+    LOGGER.debug("Searching %d files using %d invocations.", len(unique), len(tasks))
+
+    def run(task: tuple[str, List[Path]]) -> Optional[Matches]:
+        return _grep_chunk(task[1], task[0], context)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(tasks)))) as executor:
+        results = list(executor.map(run, tasks))
+
+    matches: Dict[str, Matches] = {query: {} for query in queries}
+    for (query, _), result in zip(tasks, results):
+        if result is None:
+            return None
+        matches[query].update(result)
+    return matches
@@ -11,7 +11,7 @@ import contextlib
 import inspect
 import logging
 from io import StringIO
-from typing import List, Set, Type
+from typing import Iterator, List, Set, Tuple, Type
 
 from rich.console import Console
 from rich.prompt import PromptBase, PromptType
@@ -106,11 +106,17 @@ class LintFormatter(logging.Formatter):
 
         # pylint: disable=import-outside-toplevel
         from cobib.config import config
+        from cobib.database.shards import Shards
 
-        self._database_path = RelPath(config.database.file)
+        database_path = RelPath(config.database.file)
+        paths = [database_path]
+        if Shards.is_sharded(database_path.path):
+            paths = [RelPath(shard) for shard in Shards(database_path.path).paths()]
 
-        with open(self._database_path.path, "r", encoding="utf-8") as database:
-            self._raw_database = database.readlines()
+        self._raw_databases: List[Tuple[RelPath, List[str]]] = []
+        for path in paths:
+            with open(path.path, "r", encoding="utf-8") as database:
+                self._raw_databases.append((path, database.readlines()))
 
     def format(self, record: logging.LogRecord) -> str:
         """Format's the LogRecord.
@@ -129,13 +135,20 @@ class LintFormatter(logging.Formatter):
             entry = record.entry  # type: ignore[attr-defined]
             field = record.field  # type: ignore[attr-defined]
             self.dirty_entries.add(entry)
-            raw_db = enumerate(self._raw_database)
+            database_path, raw_database = self._raw_databases[0]
+            if len(self._raw_databases) > 1:
+                # find the shard file containing the entry
+                for path, raw in self._raw_databases:
+                    if any(line.startswith(entry) for line in raw):
+                        database_path, raw_database = path, raw
+                        break
+            raw_db = enumerate(raw_database)
             _, line = next(raw_db)
             while not line.startswith(entry):
                 _, line = next(raw_db)
             while not line.strip().startswith(field):
                 line_no, line = next(raw_db)
-            return f"{self._database_path}:{line_no+1} {record.getMessage()}"
+            return f"{database_path}:{line_no+1} {record.getMessage()}"
         except AttributeError:
             return ""
 
@@ -162,7 +175,7 @@ def lint_database(*args: str) -> List[str]:
     largs = parser.parse_args(args)
 
     # pylint: disable=import-outside-toplevel
-    from cobib.database import Database
+    from cobib.database import Database, Entry
 
     output = StringIO()
 
@@ -183,7 +196,14 @@ def lint_database(*args: str) -> List[str]:
         root_logger.addHandler(handler)
 
     # trigger database reading to cause lint messages upon entry-construction
-    Database.read()
+    Entry.lint = True
+    try:
+        Database.read()
+        # this also constructs any entries which have been read lazily
+        for _ in Database().values():
+            pass
+    finally:
+        Entry.lint = False
 
     lint_messages = output.getvalue().split("\n")
 
@@ -273,3 +293,63 @@ def unify_labels(*args: str) -> List[str]:
         cmd.execute()
 
     return out.getvalue().strip().split("\n")
+
+
+def convert_database(*args: str) -> List[str]:
+    """Converts the database between storage backends.
+
+    The storage backend of the target is chosen by `cobib.database.backends.get_backend`. Since all
+    backends store the entries as YAML documents, this conversion is lossless. For example, you can
+    convert your database to SQLite via:
+    ```
+    cobib _convert_database ~/.local/share/cobib/literature.db
+    ```
+    Afterwards, point `cobib.config.config.DatabaseConfig.file` to the new file.
+
+    Args:
+        args: a sequence of additional arguments used for the execution. The following values are
+            allowed:
+                * `target`: the path to the converted database. Any existing database at this
+                    location gets replaced.
+                * `-s`, `--source`: the path to the database which to convert. This defaults to
+                    `cobib.config.config.DatabaseConfig.file`.
+
+    Returns:
+        A message summarizing the conversion.
+    """
+    # pylint: disable=import-outside-toplevel
+    from cobib.config import config
+    from cobib.database.backends import get_backend
+
+    parser = argparse.ArgumentParser(
+        prog="convert_database", description="Convert the database between storage backends."
+    )
+    parser.add_argument("target", type=str, help="path to the converted database")
+    parser.add_argument(
+        "-s",
+        "--source",
+        type=str,
+        default=config.database.file,
+        help="path to the database which to convert (defaults to the configured one)",
+    )
+    largs = parser.parse_args(args)
+
+    source = get_backend(RelPath(largs.source).path)
+    target = get_backend(RelPath(largs.target).path)
+    if source.path == target.path:
+        return ["The source and target of the conversion must be different."]
+
+    count = 0
+
+    def _count(documents: Iterator[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        nonlocal count
+        for document in documents:
+            count += 1
+            yield document
+
+    target.write_documents(_count(source.iter_documents()))
+
+    return [
+        f"Converted {count} entries from the {source.name} database at {source.path} to the "
+        f"{target.name} database at {target.path}."
+    ]
@@ -0,0 +1,221 @@
+"""coBib's cache of the text extracted from associated files.
+
+The `cobib.commands.search.SearchCommand` also searches the files associated with an entry (see
+`cobib.database.Entry.search`). Running the configured search tool on the original files means that
+binary formats (most notably PDFs) need to be decoded anew for every single search.
+
+Instead, the `TextCache` extracts the text of every associated file once and stores it in the
+directory configured via `cobib.config.config.SearchCommandConfig.text_cache`. This cache is opt-in,
+i.e. it remains disabled until you configure such a directory. The search tool then runs on this
+plain text, which also enables tools like the default `grep` to find matches inside of PDFs. How the text gets extracted is configured per file suffix via
+`cobib.config.config.SearchCommandConfig.text_extractors`. Files with any other suffix are assumed
+to be plain text already and get searched directly. The same happens when the configured extractor
+is not installed (for example, the default `pdftotext` requires poppler-utils), which is detected
+only once per process.
+
+Every cached text is keyed on the path, modification time and size of the original file. Whenever a
+file changes, its stale text gets discarded and extracted anew upon its next search. You can also
+rebuild the cache explicitly via `cobib search --rebuild-text-cache`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from cobib.config import config
+from cobib.utils.rel_path import RelPath
+
+LOGGER = logging.getLogger(__name__)
+"""@private module logger."""
+
+
+class TextCache:
+    """coBib's cache of the text extracted from associated files."""
+
+    def __init__(self, directory: Path) -> None:
+        """Initializes the cache.
+
+        Args:
+            directory: the directory in which to store the extracted texts.
+        """
+        self.directory = directory
+        """The directory in which the extracted texts are stored."""
+
+    @classmethod
+    def from_config(cls) -> Optional[TextCache]:
+        """Initializes the cache configured via `config.commands.search.text_cache`.
+
+        Returns:
+            The cache or `None` if it is disabled.
+        """
+        if config.commands.search.text_cache is None:
+            return None
+        return cls(RelPath(config.commands.search.text_cache).path)
+
+    @staticmethod
+    def _digest(path: Path) -> str:
+        """Computes the digest identifying the cached texts of a file.
+
+        Args:
+            path: the path to the original file.
+
+        Returns:
+            The hexadecimal digest of the resolved path.
+        """
+        return hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()
+
+    def _cached_path(self, path: Path) -> Path:
+        """Computes the path of the cached text of a file in its current state.
+
+        Args:
+            path: the path to the original file.
+
+        Returns:
+            The path of the cached text.
+
+        Raises:
+            FileNotFoundError: if the original file does not exist.
+        """
+        stat = os.stat(path)
+        return self.directory / f"{self._digest(path)}-{stat.st_mtime_ns}-{stat.st_size}.txt"
+
+    @staticmethod
+    def extractor(path: Path) -> Optional[List[str]]:
+        """Returns the command which extracts the text of a file.
+
+        Args:
+            path: the path to the file.
+
+        Returns:
+            The command configured for the suffix of the file or `None` if there is none.
+        """
+        return config.commands.search.text_extractors.get(path.suffix.lower(), None)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def available(program: str) -> bool:
+        """Checks whether a text extractor is installed.
+
+        The result is cached such that a missing extractor gets reported only once.
+
+        Args:
+            program: the name (or path) of the program.
+
+        Returns:
+            Whether the program can be found.
+        """
+        if shutil.which(program) is not None:
+            return True
+        LOGGER.debug(
+            "The text extractor %s is not installed. Searching the files directly.", program
+        )
+        return False
+
+    @classmethod
+    def extract(cls, path: Path) -> str:
+        """Extracts the text of a file.
+
+        Args:
+            path: the path to the file.
+
+        Returns:
+            The extracted text. Files without a text extractor are decoded as UTF-8.
+
+        Raises:
+            OSError: if the file cannot be read or the text extractor cannot be run.
+            subprocess.CalledProcessError: if the text extractor fails.
+        """
+        extractor = cls.extractor(path)
+        if extractor is None:
+            return path.read_bytes().decode("utf-8", errors="replace")
+        LOGGER.debug("Extracting the text of %s with %s", path, extractor[0])
+        result = subprocess.run(
+            [str(path) if arg == "{}" else arg for arg in extractor],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        return result.stdout.decode("utf-8", errors="replace")
+
+    def get(self, path: Path) -> Optional[Path]:
+        """Returns the cached text of a file, extracting it if it is missing or stale.
+
+        Args:
+            path: the path to the original file.
+
+        Returns:
+            The path of the cached text or `None` if the text could not be extracted. Any errors
+            encountered during this process are logged. Files without a text extractor are not
+            cached and their own path is returned instead. If the text extractor is not installed,
+            `None` is returned without logging a warning.
+        """
+        extractor = self.extractor(path)
+        if extractor is None:
+            return path
+        if not self.available(extractor[0]):
+            return None
+        try:
+            cached = self._cached_path(path)
+            if cached.exists():
+                return cached
+            self.invalidate(path, keep=cached)
+            text = self.extract(path)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # the file must only ever appear completely since other threads may search it
+            tmp = cached.with_name(f"{cached.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, cached)
+        except (OSError, subprocess.CalledProcessError) as err:
+            LOGGER.warning("Could not extract the text of %s: %s", path, err)
+            return None
+
+        LOGGER.info("Cached the text of %s.", path)
+        return cached
+
+    def invalidate(self, path: Path, keep: Optional[Path] = None) -> None:
+        """Removes all cached texts of a file.
+
+        Args:
+            path: the path to the original file.
+            keep: an optional cached text to retain. Another thread which searches the same file
+                concurrently may have just extracted it.
+        """
+        if not self.directory.exists():
+            return
+        for cached in self.directory.glob(f"{self._digest(path)}-*.txt"):
+            if cached != keep:
+                cached.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Removes all cached texts."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def rebuild(self, paths: Iterable[Path], prune: bool = False) -> List[Path]:
+        """Extracts the texts of the provided files anew.
+
+        Args:
+            paths: the paths of the original files.
+            prune: whether to remove the cached texts of all other files, too.
+
+        Returns:
+            The paths of the cached texts which were extracted successfully.
+        """
+        if prune:
+            self.clear()
+        rebuilt: List[Path] = []
+        for path in paths:
+            if self.extractor(path) is None:
+                continue
+            self.invalidate(path)
+            cached = self.get(path)
+            if cached is not None:
+                rebuilt.append(cached)
+        return rebuilt
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import contextlib
+import subprocess
 import tempfile
 from io import StringIO
 from typing import TYPE_CHECKING, Any, Dict, Generator, List, Type
@@ -53,6 +54,17 @@ class TestDeleteCommand(CommandTest):
 
         yield request.param
 
+    @pytest.fixture
+    def git_identity(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Configures a git identity such that the test commits do not depend on the host.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        for role in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{role}_NAME", "coBib")
+            monkeypatch.setenv(f"GIT_{role}_EMAIL", "cobib@example.com")
+
     def _assert(self, labels: List[str]) -> None:
         """Common assertion utility method.
 
@@ -110,6 +122,50 @@ class TestDeleteCommand(CommandTest):
             # assert the git commit message
             self.assert_git_commit_message("delete", {"labels": labels, "preserve_files": None})
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("setup", [{"git": True}], indirect=["setup"])
+    async def test_transaction(self, git_identity: None, setup: Any) -> None:
+        """Test that a transaction combines the git commits of multiple commands.
+
+        Args:
+            git_identity: the local git identity fixture.
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        with Database.transaction():
+            await DeleteCommand("knuthwebsite").execute()
+            await DeleteCommand("latexcompanion").execute()
+            # nothing has been written, yet
+            with open(config.database.file, "r", encoding="utf-8") as file:
+                assert "knuthwebsite" in file.read()
+
+        self._assert(["knuthwebsite", "latexcompanion"])
+
+        with subprocess.Popen(
+            ["git", "-C", self.COBIB_TEST_DIR, "log", "--format=format:%s"],
+            stdout=subprocess.PIPE,
+        ) as proc:
+            subjects, _ = proc.communicate()
+        assert subjects.decode("utf-8").split("\n") == [
+            "Auto-commit: Transaction",
+            "Initial commit",
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("setup", [{"git": True}], indirect=["setup"])
+    async def test_journal(self, git_identity: None, setup: Any) -> None:
+        """Test that the journal gets compacted before the git commit.
+
+        Args:
+            git_identity: the local git identity fixture.
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        config.database.journal = True
+        await DeleteCommand("knuthwebsite").execute()
+        self._assert(["knuthwebsite"])
+        self.assert_git_commit_message(
+            "delete", {"labels": ["knuthwebsite"], "preserve_files": None}
+        )
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         ["labels", "post_setup"],
@@ -174,7 +230,7 @@ class TestDeleteCommand(CommandTest):
             path = RelPath(tmpdirname + "/dummy.pdf")
             open(path.path, "w", encoding="utf-8").close()  # pylint: disable=consider-using-with
 
-            Database()["knuthwebsite"].file = str(path)
+            Database()["knuthwebsite"].file = [str(path)]
 
             args = ["knuthwebsite"]
             if preserve_files is not None:
@@ -151,7 +151,7 @@ class TestEditCommand(CommandTest):
                     path.path, "w", encoding="utf-8"
                 ).close()
 
-                Database()["einstein"].file = str(path)
+                Database()["einstein"].file = [str(path)]
 
                 args = ["einstein"]
                 if preserve_files is not None:
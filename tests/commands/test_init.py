@@ -13,6 +13,7 @@ from typing_extensions import override
 
 from cobib.commands import InitCommand
 from cobib.config import Event, config
+from cobib.database.shards import Shards
 
 from .command_test import CommandTest
 
@@ -72,7 +73,7 @@ class TestInitCommand(CommandTest):
             # and assert that it is indeed a folder
             assert self.COBIB_TEST_DIR_GIT.is_dir()
             # assert the git commit message
-            self.assert_git_commit_message("init", {"git": True})
+            self.assert_git_commit_message("init", {"git": True, "shards": None})
 
     @pytest.mark.parametrize(
         ["setup"],
@@ -115,11 +116,35 @@ class TestInitCommand(CommandTest):
             # and assert that it is indeed a folder
             assert self.COBIB_TEST_DIR_GIT.is_dir()
             # assert the git commit message
-            self.assert_git_commit_message("init", {"git": True})
+            self.assert_git_commit_message("init", {"git": True, "shards": None})
         finally:
             # clean up file system
             rmtree(self.COBIB_TEST_DIR_GIT)
 
+    @pytest.mark.parametrize(
+        ["setup"],
+        [
+            [{"git": False, "database": False}],
+        ],
+        indirect=["setup"],
+    )
+    @pytest.mark.parametrize(["bucket"], [["hash"], ["year"]])
+    def test_command_shards(self, setup: Any, bucket: str) -> None:
+        """Test initializing a sharded database.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            bucket: the bucket of the sharded database.
+        """
+        directory = self.COBIB_TEST_DIR / "shards"
+        config.database.file = str(directory)
+        try:
+            InitCommand("--shards", bucket).execute()
+            assert Shards.is_sharded(directory)
+            assert Shards(directory).bucket == bucket
+        finally:
+            rmtree(directory, ignore_errors=True)
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         ["setup"],
@@ -157,7 +182,7 @@ class TestInitCommand(CommandTest):
 
         InitCommand().execute()
 
-        self.assert_git_commit_message("init", {"git": True})
+        self.assert_git_commit_message("init", {"git": True, "shards": None})
 
     def test_event_post_init_command(self, setup: Any) -> None:
         """Tests the PostInitCommand event."""
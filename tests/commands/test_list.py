@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import contextlib
+import json
 import os
 from copy import copy
 from io import StringIO
@@ -17,7 +18,7 @@ from typing_extensions import override
 
 from cobib.commands import ListCommand
 from cobib.config import Event, config
-from cobib.database import Database
+from cobib.database import Database, Entry
 
 from .. import get_resource
 from .command_test import CommandTest
@@ -40,6 +41,19 @@ class TestListCommand(CommandTest):
             [["-r"], ["knuthwebsite", "latexcompanion", "einstein"], False],
             [["-s", "year"], ["knuthwebsite", "einstein", "latexcompanion"], False],
             [["-r", "-s", "year"], ["latexcompanion", "einstein", "knuthwebsite"], False],
+            [["--sort=-year"], ["latexcompanion", "einstein", "knuthwebsite"], False],
+            [["-s", "ENTRYTYPE,-label"], ["einstein", "latexcompanion", "knuthwebsite"], False],
+            [["--limit", "2"], ["einstein", "latexcompanion"], False],
+            [["--offset", "1", "--limit", "1"], ["latexcompanion"], False],
+            [["-r", "--limit", "2"], ["knuthwebsite", "latexcompanion"], False],
+            [["-r", "--offset", "1"], ["latexcompanion", "einstein"], False],
+            [["-r", "-s", "year", "--limit", "1"], ["latexcompanion"], False],
+            [
+                ["-s", "year", "--offset", "1", "--limit", "5"],
+                ["einstein", "latexcompanion"],
+                False,
+            ],
+            [["--limit", "0"], [], False],
             [["++author", "Einstein"], ["einstein"], False],
             [["++author", "einstein", "-i"], ["einstein"], False],
             [["++author", "einstein", "-I"], [], True],
@@ -81,6 +95,8 @@ class TestListCommand(CommandTest):
             [["++author", "einstein", "-I"], [], {"author"}, True],
             [["--author", "Einstein"], ["latexcompanion", "knuthwebsite"], {"author"}, False],
             [["++author", "Einstein", "++author", "Knuth"], [], {"author"}, False],
+            [["++year", "1900..1950"], ["einstein"], {"year"}, False],
+            [["--year", "..1950"], ["latexcompanion", "knuthwebsite"], {"year"}, False],
             [
                 ["-x", "++author", "Einstein", "++author", "Knuth"],
                 ["einstein", "knuthwebsite"],
@@ -108,9 +124,12 @@ class TestListCommand(CommandTest):
         """
         config.commands.list_.ignore_case = config_overwrite
 
-        filtered_entries, filtered_keys = ListCommand(*args).filter_entries()
+        cmd = ListCommand(*args)
+        filtered_entries, filtered_keys = cmd.filter_entries()
         assert filtered_keys == expected_keys
         assert [entry.label for entry in filtered_entries] == expected_labels
+        assert cmd.filter_plan is not None
+        assert set(cmd.filter_plan.fields) == expected_keys
 
     def test_missing_keys(self, setup: Any) -> None:
         """Asserts issue #1 is fixed.
@@ -125,6 +144,94 @@ class TestListCommand(CommandTest):
         assert [entry.label for entry in filtered_entries] == ["einstein"]
         assert filtered_keys == {"year"}
 
+    def test_new_field(self, setup: Any) -> None:
+        """Test that a field which gets added at runtime becomes filterable.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        with pytest.raises(SystemExit):
+            ListCommand("++note", "new")
+        bib = Database()
+        entry = bib["einstein"]
+        entry.data["note"] = "Something new"
+        bib.update({"einstein": entry})
+        filtered_entries, filtered_keys = ListCommand("++note", "new").filter_entries()
+        assert [entry.label for entry in filtered_entries] == ["einstein"]
+        assert filtered_keys == {"note"}
+
+    @pytest.mark.parametrize("field", ["limit", "offset", "json", "sort", "OR", "ignore-case"])
+    def test_reserved_field(self, setup: Any, caplog: pytest.LogCaptureFixture, field: str) -> None:
+        """Test that a field which is named like one of the options does not break the parser.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            caplog: the built-in pytest fixture.
+            field: the name of the field.
+        """
+        bib = Database()
+        entry = bib["einstein"]
+        entry.data[field] = "1"
+        bib.update({"einstein": entry})
+        cmd = ListCommand("--limit", "1", "--offset", "1", "++label", "e")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["latexcompanion"]
+        assert (
+            "cobib.commands.list_",
+            30,
+            f"Not registering the filter arguments of the '{field}' field because they would "
+            "collide with the options of the list command.",
+        ) in caplog.record_tuples
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            [],
+            ["-r"],
+            ["-s", "year"],
+            ["-r", "-s", "ENTRYTYPE,-year"],
+            ["++author", "Einstein"],
+            ["-x", "++author", "Einstein", "++year", "..1990"],
+        ],
+    )
+    def test_patch_labels(self, setup: Any, args: List[str]) -> None:
+        """Test patching the changes of the database into previously listed labels.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            args: the arguments to pass to the command.
+        """
+        cmd = ListCommand(*args)
+        cmd.execute()
+        labels = [entry.label for entry in cmd.entries]
+
+        bib = Database()
+        Database.pop_changes()
+        einstein = bib["einstein"]
+        einstein.data["year"] = 2000
+        bib.update({"einstein": einstein})
+        bib.pop("knuthwebsite")
+        bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "author": "A. Einstein"})})
+        latex = bib["latexcompanion"]
+        latex.label = "latex"
+        bib.update({"latex": latex})
+        bib.rename("latexcompanion", "latex")
+        changes = Database.pop_changes()
+        assert changes is not None
+
+        patched = ListCommand(*args).patch_labels(labels, changes)
+        cmd = ListCommand(*args)
+        cmd.execute()
+        assert patched == [entry.label for entry in cmd.entries]
+
+    def test_patch_labels_limit(self, setup: Any) -> None:
+        """Test that labels which were listed with a limit do not get patched.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        assert ListCommand("--limit", "2").patch_labels(["einstein"], {"einstein": None}) is None
+
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "expected",
@@ -158,6 +265,61 @@ class TestListCommand(CommandTest):
         for line, truth in zip_longest(stdout, expected):
             assert line.split("::") == truth
 
+    @pytest.mark.asyncio
+    async def test_cmdline_json(
+        self, setup: Any, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test the JSON lines output of the command.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            monkeypatch: the built-in pytest fixture.
+            capsys: the built-in pytest fixture.
+        """
+        args = ["cobib", "--porcelain", "list", "--json", "-s", "year", "--limit", "2"]
+        await self.run_module(monkeypatch, "main", args)
+        stdout = capsys.readouterr().out.strip().split("\n")
+        assert [json.loads(line) for line in stdout] == [
+            {"label": "knuthwebsite", "title": "Knuth: Computers and Typesetting", "year": ""},
+            {
+                "label": "einstein",
+                "title": r"Zur Elektrodynamik bewegter K{\"o}rper",
+                "year": "1905",
+            },
+        ]
+
+    def test_stream_porcelain(self, setup: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that unsorted entries get accessed only while their lines are being streamed.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            monkeypatch: the built-in pytest fixture.
+        """
+        accessed: List[str] = []
+        getitem = Database.__getitem__
+
+        def track(bib: Database, label: str) -> Entry:
+            accessed.append(label)
+            return getitem(bib, label)
+
+        cmd = ListCommand("--offset", "1")
+        monkeypatch.setattr(Database, "__getitem__", track)
+        cmd.execute()
+        assert not accessed
+        lines = cmd.stream_porcelain()
+        assert next(lines) == "label::title"
+        assert next(lines).startswith("latexcompanion::")
+        assert accessed == ["latexcompanion"]
+        assert next(lines).startswith("knuthwebsite::")
+        assert accessed == ["latexcompanion", "knuthwebsite"]
+        assert not cmd.entries
+
+        # accessing the entries collects them
+        cmd = ListCommand("--offset", "1")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["latexcompanion", "knuthwebsite"]
+        assert len(cmd.render_porcelain()) == 3
+
     @pytest.mark.parametrize(
         ["args", "expected_cols", "expected_rows"],
         [
@@ -173,6 +335,11 @@ class TestListCommand(CommandTest):
                 ["label", "title", "year"],
                 ["latexcompanion", "einstein", "knuthwebsite"],
             ],
+            [
+                ["-s", "year,-author"],
+                ["label", "title", "year", "author"],
+                ["knuthwebsite", "einstein", "latexcompanion"],
+            ],
             [["++author", "Einstein"], ["label", "title", "author"], ["einstein"]],
             [
                 ["--author", "Einstein"],
@@ -209,6 +376,39 @@ class TestListCommand(CommandTest):
         assert renderable.columns[0]._cells == expected_rows
 
     # manually overwrite this test because we must populate the database with actual data
+    def test_refresh_filter_arguments(self, setup: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the filter arguments are only refreshed when the schema changes.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            monkeypatch: the built-in pytest fixture.
+        """
+        ListCommand._get_argparser()  # pylint: disable=protected-access
+        calls: List[None] = []
+        original = ListCommand.init_argparser.__func__  # type: ignore[attr-defined]
+
+        def init_argparser(cls: Type[ListCommand]) -> None:
+            calls.append(None)
+            original(cls)
+
+        def fields(_: Database) -> None:
+            raise AssertionError("The fields should not have been compared.")
+
+        monkeypatch.setattr(Database, "fields", property(fields))
+        ListCommand("++year", "1905")
+        monkeypatch.undo()
+
+        monkeypatch.setattr(ListCommand, "init_argparser", classmethod(init_argparser))
+
+        bib = Database()
+        bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "note": "new"})})
+        cmd = ListCommand("++note", "new")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["dummy"]
+        assert len(calls) == 1
+        ListCommand("++note", "new")
+        assert len(calls) == 1
+
     def test_handle_argument_error(self, caplog: pytest.LogCaptureFixture) -> None:
         """Test handling of ArgumentError.
 
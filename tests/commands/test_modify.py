@@ -192,7 +192,7 @@ class TestModifyCommand(CommandTest):
             path = RelPath(tmpdirname + "/knuthwebsite.pdf")
             open(path.path, "w", encoding="utf-8").close()  # pylint: disable=consider-using-with
 
-            Database()["knuthwebsite"].file = str(path)
+            Database()["knuthwebsite"].file = [str(path)]
 
             args = ["label:dummy", "-s", "--", "knuthwebsite"]
             if preserve_files is not None:
@@ -15,6 +15,7 @@ from typing_extensions import override
 
 from cobib.commands import SearchCommand
 from cobib.config import Event, config
+from cobib.database import Database
 
 from .command_test import CommandTest
 
@@ -247,3 +248,132 @@ class TestSearchCommand(CommandTest):
             cmd = SearchCommand("einstein")
             cmd.execute()
             assert file.getvalue().strip() == "1 ['einstein']"
+
+    def test_rebuild_text_cache(self, setup: Any) -> None:
+        """Test the `--rebuild-text-cache` argument.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        config.commands.search.text_cache = str(self.COBIB_TEST_DIR / "text_cache")
+        config.commands.search.text_extractors[".txt"] = ["cat", "{}"]
+        path = self.COBIB_TEST_DIR / "einstein.txt"
+        path.write_text("Zur Elektrodynamik\nbewegter Koerper\nvon A. Einstein\n", encoding="utf-8")
+        Database()["einstein"].file = str(path)  # type: ignore[assignment]
+
+        cmd = SearchCommand("--rebuild-text-cache")
+        cmd.execute()
+        assert cmd.entries == []
+        cached = list((self.COBIB_TEST_DIR / "text_cache").iterdir())
+        assert len(cached) == 1
+        mtime = cached[0].stat().st_mtime_ns
+
+        cmd = SearchCommand("Koerper")
+        cmd.execute()
+        self._assert(
+            cmd.render_porcelain(),
+            ["einstein::1", "1::Zur Elektrodynamik", "1::bewegter Koerper", "1::von A. Einstein"],
+        )
+        # the search used the cached text
+        assert cached[0].stat().st_mtime_ns == mtime
+
+    def test_missing_query(self, setup: Any, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that the query may only be omitted when rebuilding the text cache.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+            caplog: the built-in pytest fixture.
+        """
+        with pytest.raises(SystemExit):
+            SearchCommand("--", "++label", "einstein")
+        assert (
+            "cobib.commands.search",
+            40,
+            "Error: the following arguments are required: query",
+        ) in caplog.record_tuples
+
+    def test_jobs(self, setup: Any) -> None:
+        """Test that searching concurrently retains the order of the entries.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        bib = Database()
+        for label, entry in bib.items():
+            path = self.COBIB_TEST_DIR / f"{label}.txt"
+            path.write_text(f"{label}\nis searched\nconcurrently\n", encoding="utf-8")
+            entry.file = str(path)  # type: ignore[assignment]
+
+        outputs = []
+        for jobs in ["1", "3"]:
+            cmd = SearchCommand("searched", "-j", jobs)
+            cmd.execute()
+            assert [entry.label for entry in cmd.entries] == list(bib.keys())
+            assert cmd.hits == 3
+            outputs.append(cmd.render_porcelain())
+        assert outputs[0] == outputs[1]
+
+    def test_ranked(self, setup: Any) -> None:
+        """Test the `--ranked` argument.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        bib = Database()
+        bib["latexcompanion"].data["note"] = "Einstein, Einstein and Einstein"
+        bib.update({"latexcompanion": bib["latexcompanion"]})
+
+        cmd = SearchCommand("--ranked", "Einstein", "--skip-files")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["latexcompanion", "einstein"]
+        assert cmd.scores == sorted(cmd.scores, reverse=True)
+        assert cmd.render_porcelain()[0] == "latexcompanion::1"
+
+        tree = cmd.render_rich()
+        assert isinstance(tree, Tree)
+        assert str(tree.children[0].label).startswith(
+            f"latexcompanion - 1 match (score: {cmd.scores[0]:.2f})"
+        )
+
+        cmd = SearchCommand("--ranked", "--limit", "1", "Einstein", "--skip-files")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["latexcompanion"]
+
+        cmd = SearchCommand("--ranked", "Einstein", "--skip-files", "--", "++ENTRYTYPE", "article")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["einstein"]
+
+    def test_fuzzy(self, setup: Any) -> None:
+        """Test the `--fuzzy` argument.
+
+        Args:
+            setup: the `tests.commands.command_test.CommandTest.setup` fixture.
+        """
+        cmd = SearchCommand("--fuzzy", "Einstien", "--skip-files")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["einstein"]
+        assert 0.3 <= cmd.scores[0] < 1
+        self._assert(
+            cmd.render_porcelain(),
+            [
+                "einstein::2",
+                "1::@article{einstein,",
+                "2::author = {Albert Einstein},",
+                "2::doi = {http://dx.doi.org/10.1002/andp.19053221004},",
+            ],
+        )
+
+        cmd = SearchCommand("--fuzzy", "Goosens", "Mitelbach", "--skip-files")
+        cmd.execute()
+        assert [entry.label for entry in cmd.entries] == ["latexcompanion"]
+
+        cmd = SearchCommand("--fuzzy", "--threshold", "0.9", "Einstien", "--skip-files")
+        cmd.execute()
+        assert not cmd.entries
+
+        cmd = SearchCommand("--fuzzy", "einstein", "--skip-files", "--", "++ENTRYTYPE", "book")
+        cmd.execute()
+        assert not cmd.entries
+
+        with pytest.raises(SystemExit):
+            SearchCommand("--fuzzy", "--ranked", "einstein")
@@ -8,7 +8,7 @@ from typing import Any, Generator
 import pytest
 
 from cobib.config import config
-from cobib.config.config import Config
+from cobib.config.config import Config, TagMarkup
 
 from .. import get_resource
 
@@ -105,6 +105,24 @@ def setup() -> Generator[Any, None, None]:
     config.defaults()
 
 
+def test_config_revision(setup: Any) -> None:
+    """Test that modifying the configuration increases its revision.
+
+    Args:
+        setup: a local pytest fixture.
+    """
+    revision = config.revision
+    config.database.stringify.list_separator.tags = "; "
+    assert config.revision > revision
+    revision = config.revision
+    config.theme.tags.user_tags["custom"] = TagMarkup(50, "red")
+    assert config.revision > revision
+    revision = config.revision
+    config.defaults()
+    assert config.revision > revision
+    assert "revision" not in vars(config)
+
+
 def test_config_validation(setup: Any) -> None:
     """Test that the initial configuration passes all validation checks.
 
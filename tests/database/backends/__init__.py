@@ -0,0 +1 @@
+"""coBib's storage backend tests."""
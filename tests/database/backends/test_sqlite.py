@@ -0,0 +1,123 @@
+"""Tests for coBib's SQLite storage backend."""
+
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generator, List
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.backends import SQLiteBackend, YAMLBackend, get_backend
+from cobib.database.backends.sqlite import SQLiteRow
+
+from ... import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+DUMMY_ENTRY = Entry(
+    "dummy",
+    {
+        "ENTRYTYPE": "misc",
+        "author": "D. Dummy",
+        "title": "Something dumb",
+    },
+)
+
+
+class TestSQLiteBackend:
+    """Tests for coBib's SQLite storage backend."""
+
+    PATH = TMPDIR / "cobib_test_database.db"
+    """Path to the temporary SQLite copy of the example database."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup an SQLite copy of the example database.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        SQLiteBackend(self.PATH).write_documents(
+            YAMLBackend(Path(EXAMPLE_LITERATURE)).iter_documents()
+        )
+        config.database.file = str(self.PATH)
+        yield
+        os.remove(self.PATH)
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    def _labels(self) -> List[str]:
+        """Returns the labels stored in the SQLite file in order.
+
+        Returns:
+            The list of labels.
+        """
+        with sqlite3.connect(self.PATH) as connection:
+            return [row[0] for row in connection.execute("SELECT label FROM entries ORDER BY id")]
+
+    def test_get_backend(self) -> None:
+        """Test the choice of the storage backend."""
+        assert isinstance(get_backend(Path("literature.db")), SQLiteBackend)
+        assert isinstance(get_backend(Path("literature.SQLite3")), SQLiteBackend)
+        assert isinstance(get_backend(Path("literature.yaml")), YAMLBackend)
+
+    def test_read(self) -> None:
+        """Test reading an SQLite database lazily."""
+        bib = Database()
+        bib.read()
+        assert list(bib.keys()) == self._labels() == ["einstein", "latexcompanion", "knuthwebsite"]
+        assert all(isinstance(entry, SQLiteRow) for entry in OrderedDict.values(bib))
+        assert bib["einstein"].data["title"] == 'Zur Elektrodynamik bewegter K{\\"o}rper'
+        # bypass the lazy parsing of `cobib.database.Database.__getitem__`
+        rows: Dict[str, Any] = dict(OrderedDict.items(bib))
+        assert isinstance(rows["einstein"], Entry)
+        assert isinstance(rows["latexcompanion"], SQLiteRow)
+
+    def test_read_missing_file(self) -> None:
+        """Test that reading a missing SQLite file raises a FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            SQLiteBackend(TMPDIR / "cobib_test_missing.db").read()
+
+    def test_save(self) -> None:
+        """Test saving changes to an SQLite database."""
+        bib = Database()
+        bib.read()
+        Database.pop_written_files()
+
+        entry = bib["latexcompanion"]
+        entry.data["tags"] = ["test"]
+        bib.update({"latexcompanion": entry})
+        einstein = bib["einstein"]
+        einstein.label = "albert"
+        bib.update({"albert": einstein})
+        bib.rename("einstein", "albert")
+        bib.pop("knuthwebsite")
+        bib.update({"dummy": DUMMY_ENTRY})
+        bib.save()
+
+        assert Database.pop_written_files() == [self.PATH]
+        # changed entries keep their position while new ones are appended
+        assert self._labels() == ["albert", "latexcompanion", "dummy"]
+
+        bib.read()
+        assert bib["latexcompanion"].tags == ["test"]
+        assert bib["dummy"] == DUMMY_ENTRY
+
+    def test_roundtrip(self) -> None:
+        """Test that converting YAML to SQLite and back is lossless."""
+        target = TMPDIR / "cobib_test_roundtrip.yaml"
+        try:
+            YAMLBackend(target).write_documents(SQLiteBackend(self.PATH).iter_documents())
+            with open(target, "rb") as file, open(EXAMPLE_LITERATURE, "rb") as expected:
+                assert file.read() == expected.read()
+        finally:
+            os.remove(target)
@@ -4,14 +4,17 @@ import copy
 import logging
 import os
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from shutil import copyfile
-from typing import Any, Generator, Tuple
+from typing import Any, Dict, Generator, List, Tuple
 
 import pytest
 
 from cobib.config import LabelSuffix, config
 from cobib.database import Database, Entry
+from cobib.database.backends.yaml import YAMLDocument
+from cobib.database.schema import Schema
 
 from .. import get_resource
 
@@ -245,3 +248,289 @@ def test_database_save_delete() -> None:
     finally:
         os.remove(config.database.file)
         config.database.file = EXAMPLE_LITERATURE
+
+
+def test_database_read_lazily() -> None:
+    """Test the `cobib.database.Database.read` method with lazy reading enabled."""
+    config.database.lazy = True
+    eager = {label: copy.deepcopy(entry) for label, entry in Database().items()}
+
+    bib = Database()
+    bib.read()
+    assert list(bib.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+    assert all(isinstance(entry, YAMLDocument) for entry in OrderedDict.values(bib))
+
+    einstein = bib["einstein"]
+    assert einstein == eager["einstein"]
+    # the entry only gets parsed once
+    assert bib["einstein"] is einstein
+    assert bib.get("einstein") is einstein
+    assert bib.get("missing") is None
+
+    assert dict(bib.items()) == eager
+    assert list(bib.values()) == list(eager.values())
+    assert bib.pop("knuthwebsite") == eager["knuthwebsite"]
+
+
+def test_read_lazily_duplicate(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that reading lazily warns about duplicate labels and saves the last occurrence.
+
+    Args:
+        caplog: the built-in pytest fixture.
+    """
+    config.database.lazy = True
+    config.database.file = TMPDIR / "cobib_test_database_file.yaml"
+    copyfile(EXAMPLE_LITERATURE, config.database.file)
+    with open(config.database.file, "a", encoding="utf-8") as file:
+        file.write(DUMMY_ENTRY_YAML.replace("dummy:", "einstein:"))
+
+    try:
+        bib = Database()
+        bib.read()
+        assert list(bib.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+        assert bib["einstein"].data["author"] == "D. Dummy"
+        assert (
+            "cobib.parsers.yaml",
+            logging.WARNING,
+            "An entry with label 'einstein' was already encountered earlier on in the YAML file! "
+            "Please check the file manually as this cannot be resolved automatically by coBib.",
+        ) in caplog.record_tuples
+
+        entry = bib["einstein"]
+        entry.data["title"] = "Something smart"
+        bib.update({"einstein": entry})
+        bib.save()
+        # the earlier occurrence remains untouched
+        with open(config.database.file, "r", encoding="utf-8") as file:
+            with open(EXAMPLE_LITERATURE, "r", encoding="utf-8") as expected:
+                contents = file.read()
+                assert contents.startswith(expected.read())
+                assert contents.endswith("title: Something smart\n...\n")
+        bib.read()
+        assert bib["einstein"].data["title"] == "Something smart"
+    finally:
+        os.remove(config.database.file)
+        config.database.file = EXAMPLE_LITERATURE
+
+
+def test_database_save_lazily() -> None:
+    """Test the `cobib.database.Database.save` method after reading lazily."""
+    config.database.lazy = True
+    config.database.file = TMPDIR / "cobib_test_database_file.yaml"
+    copyfile(EXAMPLE_LITERATURE, config.database.file)
+
+    try:
+        bib = Database()
+        bib.read()
+        bib.update({"dummy": DUMMY_ENTRY})
+        bib.save()
+        assert all(
+            isinstance(entry, YAMLDocument)
+            for label, entry in OrderedDict.items(bib)
+            if label != "dummy"
+        )
+
+        with open(config.database.file, "r", encoding="utf-8") as file:
+            with open(EXAMPLE_LITERATURE, "r", encoding="utf-8") as expected:
+                assert file.read().startswith(expected.read())
+    finally:
+        os.remove(config.database.file)
+        config.database.file = EXAMPLE_LITERATURE
+
+
+def test_database_transaction() -> None:
+    """Test the `cobib.database.Database.transaction` method."""
+    config.database.file = TMPDIR / "cobib_test_database_file.yaml"
+    copyfile(EXAMPLE_LITERATURE, config.database.file)
+
+    try:
+        bib = Database()
+        bib.read()
+        with Database.transaction() as transaction:
+            assert transaction is bib
+            bib.update({"dummy": DUMMY_ENTRY})
+            bib.save()
+            with Database.transaction():
+                bib.pop("knuthwebsite")
+            # the saving is deferred until the end of the outermost transaction
+            with open(config.database.file, "r", encoding="utf-8") as file:
+                with open(EXAMPLE_LITERATURE, "r", encoding="utf-8") as expected:
+                    assert file.read() == expected.read()
+
+        # pylint: disable=protected-access
+        assert not Database._unsaved_entries
+        bib.read()
+        assert list(bib.keys()) == ["einstein", "latexcompanion", "dummy"]
+    finally:
+        os.remove(config.database.file)
+        config.database.file = EXAMPLE_LITERATURE
+
+
+def test_transaction_rollback() -> None:
+    """Test that a failing `cobib.database.Database.transaction` restores the runtime state."""
+    bib = Database()
+    bib.read()
+    expected = {label: copy.deepcopy(entry) for label, entry in bib.items()}
+
+    with pytest.raises(RuntimeError):
+        with Database.transaction():
+            einstein = bib["einstein"]
+            einstein.data["year"] = 1906
+            bib.update({"einstein": einstein})
+            einstein.label = "albert"
+            bib.update({"albert": einstein})
+            bib.rename("einstein", "albert")
+            bib.pop("knuthwebsite")
+            bib.update({"dummy": DUMMY_ENTRY})
+            # pylint: disable=protected-access
+            Database._journaled_entries["dummy"] = "dummy"
+            raise RuntimeError
+
+    assert list(bib.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+    assert dict(bib.items()) == expected
+    assert bib.field_index.match("year", "^1905$") == {"einstein"}
+    # pylint: disable=protected-access
+    assert not Database._unsaved_entries
+    assert not Database._journaled_entries
+    assert Database._transaction is None
+
+
+def test_rollback_removals() -> None:
+    """Test that a failing `cobib.database.Database.transaction` restores removed entries."""
+    bib = Database()
+    bib.read()
+    expected = {label: copy.deepcopy(entry) for label, entry in bib.items()}
+
+    with pytest.raises(RuntimeError):
+        with Database.transaction():
+            del bib["einstein"]
+            bib.popitem()
+            raise RuntimeError
+    assert dict(bib.items()) == expected
+
+    with pytest.raises(RuntimeError):
+        with Database.transaction():
+            bib["latexcompanion"].data["year"] = 2000
+            bib.read()
+            bib.clear()
+            raise RuntimeError
+    assert dict(bib.items()) == expected
+
+
+def test_transaction_backup_lazily(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a `cobib.database.Database.transaction` only copies the data which gets modified.
+
+    Args:
+        monkeypatch: the built-in pytest fixture.
+    """
+    bib = Database()
+    bib.read()
+    copied: List[Dict[str, Any]] = []
+    deepcopy = copy.deepcopy
+
+    def track(obj: Any, *args: Any) -> Any:
+        copied.append(obj)
+        return deepcopy(obj, *args)
+
+    monkeypatch.setattr("cobib.database.database.copy.deepcopy", track)
+    with pytest.raises(RuntimeError):
+        with Database.transaction():
+            for entry in bib.values():
+                assert entry.label
+            assert not copied
+            einstein = bib["einstein"]
+            einstein.tags = ["reviewed"]
+            einstein.data["year"] = 1906
+            assert [data["year"] for data in copied] == [1905]
+            raise RuntimeError
+    assert bib["einstein"].data["year"] == 1905
+    assert not bib["einstein"].tags
+
+
+def test_rollback_fields() -> None:
+    """Test that a failing `cobib.database.Database.transaction` discards the fields it added."""
+    config.logging.cache = str(TMPDIR / "cobib_test_cache")
+
+    try:
+        bib = Database()
+        bib.read()
+        version = bib.schema_version
+        assert "note" not in bib.fields
+        with pytest.raises(RuntimeError):
+            with Database.transaction():
+                bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "note": "Discarded"})})
+                assert "note" in bib.fields
+                raise RuntimeError
+        assert bib.schema_version != version
+        assert "note" not in bib.fields
+    finally:
+        os.remove(config.logging.cache)
+
+
+def test_database_fields() -> None:
+    """Test the `cobib.database.Database.fields` property."""
+    config.logging.cache = str(TMPDIR / "cobib_test_cache")
+
+    try:
+        bib = Database()
+        bib.read()
+        assert {"ENTRYTYPE", "author", "title", "year"} <= bib.fields
+        assert "note" not in bib.fields
+        bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "note": "Something new"})})
+        assert "note" in bib.fields
+        bib.pop("dummy")
+        # fields never get removed
+        assert "note" in bib.fields
+    finally:
+        os.remove(config.logging.cache)
+
+
+def test_database_fields_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the `cobib.database.Database.fields` get cached and loaded without a scan.
+
+    Args:
+        monkeypatch: the built-in pytest fixture.
+    """
+    config.logging.cache = str(TMPDIR / "cobib_test_cache")
+    config.database.file = TMPDIR / "cobib_test_database_file.yaml"
+    copyfile(EXAMPLE_LITERATURE, config.database.file)
+
+    try:
+        bib = Database()
+        bib.read()
+        expected = bib.fields | {"note"}
+        bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "note": "Something new"})})
+        bib.save()
+
+        def scan(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("The database should not have been scanned.")
+
+        monkeypatch.setattr(Schema, "build", scan)
+        config.database.lazy = True
+        bib.read()
+        assert bib.fields == expected
+        assert all(isinstance(entry, YAMLDocument) for entry in OrderedDict.values(bib))
+
+        # a change behind coBib's back invalidates the cached fields
+        monkeypatch.undo()
+        with open(config.database.file, "a", encoding="utf-8") as file:
+            file.write(DUMMY_ENTRY_YAML.replace("dummy", "other").replace("author", "editor"))
+        bib.read()
+        assert bib.fields == expected | {"editor"}
+    finally:
+        os.remove(config.database.file)
+        os.remove(config.logging.cache)
+        config.database.file = EXAMPLE_LITERATURE
+
+
+def test_database_pop_changes() -> None:
+    """Test the `cobib.database.Database.pop_changes` method."""
+    bib = Database()
+    bib.read()
+    assert Database.pop_changes() is None
+    assert Database.pop_changes() == {}  # pylint: disable=C1803
+    bib.update({"dummy": DUMMY_ENTRY})
+    bib.pop("knuthwebsite")
+    bib.rename("einstein", "albert")
+    assert Database.pop_changes() == {"dummy": "dummy", "knuthwebsite": None, "einstein": "albert"}
+    assert Database.pop_changes() == {}  # pylint: disable=C1803
@@ -1,9 +1,11 @@
 """Tests for coBib's Entry class."""
 
+import copy
 from typing import Any, Dict, List, Tuple
 
 import pytest
 
+from cobib.config import TagMarkup, config
 from cobib.database import Entry
 from cobib.parsers.bibtex import BibtexParser
 from cobib.utils.rel_path import RelPath
@@ -31,14 +33,22 @@ EXAMPLE_ENTRY_DICT = {
 }
 
 
-def test_init_logging(caplog: pytest.LogCaptureFixture) -> None:
+def test_init_logging(caplog: pytest.LogCaptureFixture, monkeypatch: pytest.MonkeyPatch) -> None:
     """Test init logging for linting purposes.
 
     Args:
         caplog: the built-in pytest fixture.
+        monkeypatch: the built-in pytest fixture.
     """
     entry = Entry("dummy", {"ID": "dummy", "number": "1"})
     assert entry.data["number"] == 1
+    assert "ID" not in entry.data
+    # the lint messages are only generated while linting
+    assert not any(source == "cobib.database.entry" for source, *_ in caplog.record_tuples)
+
+    monkeypatch.setattr(Entry, "lint", True)
+    entry = Entry("dummy", {"ID": "dummy", "number": "1"})
+    assert entry.data["number"] == 1
     assert (
         "cobib.database.entry",
         20,
@@ -64,6 +74,24 @@ def test_equality() -> None:
     assert entry_1 == entry_2
 
 
+def test_compact_layout() -> None:
+    """Test the compact memory layout of entries."""
+    entry_1 = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    entry_2 = Entry("Cao2019", {"".join(["jour", "nal"]): "Chemical Reviews"})
+    assert not hasattr(entry_1, "__dict__")
+    # the field names are shared among all entries
+    key_1 = next(key for key in entry_1.data if key == "journal")
+    key_2 = next(key for key in entry_2.data if key == "journal")
+    assert key_1 is key_2
+
+
+def test_methods_are_not_fields() -> None:
+    """Test that fields named like methods of the entry are stored as data."""
+    entry = Entry("dummy", {"search": "value", "label": "other"})
+    assert entry.data == {"search": "value"}
+    assert entry.label == "other"
+
+
 def test_entry_set_label() -> None:
     """Test label changing."""
     # this test may fail if the input dict is not copied
@@ -458,6 +486,89 @@ def test_stringify() -> None:
     assert entry.stringify() == expected
 
 
+def _fresh_stringify(entry: Entry, markup: bool = False) -> Dict[str, str]:
+    """Stringifies an uncached copy of the provided entry.
+
+    Args:
+        entry: the entry which to stringify.
+        markup: whether or not to add markup based on the configured special tags.
+
+    Returns:
+        The stringified entry.
+    """
+    return Entry(entry.label, dict(entry.data)).stringify(markup=markup)
+
+
+def test_stringify_cache() -> None:
+    """Test that the cached result of `cobib.database.Entry.stringify` gets invalidated."""
+    entry = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    first = entry.stringify()
+    # every call returns a copy which may be modified safely
+    first["label"] = "modified"
+    assert entry.stringify()["label"] == "Cao_2019"
+
+    entry.data["note"] = "something"
+    assert entry.stringify()["note"] == "something"
+    entry.data.pop("note")
+    assert "note" not in entry.stringify()
+    entry.data.update({"year": 2020})
+    assert entry.stringify()["year"] == "2020"
+    del entry.data["year"]
+    assert "year" not in entry.stringify()
+    entry.tags = ["a", "b"]
+    assert entry.stringify()["tags"] == "a, b"
+    entry.label = "Cao2019"
+    assert entry.stringify()["label"] == "Cao2019"
+    entry.data = {"ENTRYTYPE": "misc"}
+    assert entry.stringify() == {"label": "Cao2019", "ENTRYTYPE": "misc"}
+    assert entry.matches({("ENTRYTYPE", True): ["misc"]}, or_=False)
+
+    entry.tags = ["a", "b"]
+    try:
+        config.database.stringify.list_separator.tags = "; "
+        assert entry.stringify() == _fresh_stringify(entry)
+        assert entry.stringify()["tags"] == "a; b"
+    finally:
+        config.defaults()
+
+
+def test_markup_label_cache() -> None:
+    """Test that the cached markup gets invalidated when the special tags change."""
+    entry = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    entry.tags = ["new", "custom"]
+    assert entry.markup_label() == "[tag.new]Cao_2019[/tag.new]"
+    try:
+        config.theme.tags.user_tags["custom"] = TagMarkup(50, "red")
+        assert entry.markup_label() == "[tag.new][tag.custom]Cao_2019[/tag.custom][/tag.new]"
+        assert entry.stringify(markup=True) == _fresh_stringify(entry, markup=True)
+    finally:
+        config.defaults()
+
+
+def test_entry_data_pickling() -> None:
+    """Test that copies of an entry do not share its data or cache."""
+    entry = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    _ = entry.stringify()
+    duplicate = copy.deepcopy(entry)
+    assert duplicate == entry
+    duplicate.data["year"] = 2020
+    assert entry.stringify()["year"] == "2019"
+    assert duplicate.stringify()["year"] == "2020"
+
+
+def test_entry_data_version() -> None:
+    """Test that the version of the entry data identifies its state across all entries."""
+    entry = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    other = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
+    assert entry.data.version != other.data.version
+    version = entry.data.version
+    entry.data["year"] = 2020
+    assert entry.data.version != version
+    version = entry.data.version
+    entry.data = dict(entry.data)
+    assert entry.data.version != version
+
+
 def test_markup_label() -> None:
     """Test the `cobib.database.Entry.markup_label` method."""
     entry = Entry("Cao_2019", EXAMPLE_ENTRY_DICT)
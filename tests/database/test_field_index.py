@@ -0,0 +1,297 @@
+"""Tests for coBib's field-value index."""
+
+import math
+from typing import Dict, Generator, List, Optional, Tuple
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.field_index import FieldIndex, parse_range, sort_key
+
+from .. import get_resource
+
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+ENTRIES = {
+    "a": Entry("a", {"ENTRYTYPE": "article", "year": 2015, "tags": ["new", "read"]}),
+    "b": Entry("b", {"ENTRYTYPE": "book", "year": 2020, "tags": ["new"]}),
+    "c": Entry("c", {"ENTRYTYPE": "article", "year": 1905, "author": "A. Einstein"}),
+    "d": Entry("d", {"ENTRYTYPE": "misc", "year": 2020, "note": "line\n"}),
+}
+
+
+class TestFieldIndex:
+    """Tests for coBib's field-value index."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        yield
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    @pytest.fixture
+    def index(self) -> FieldIndex:
+        """Builds an index of the test entries.
+
+        Returns:
+            The field-value index.
+        """
+        field_index = FieldIndex()
+        field_index.build(ENTRIES.items())
+        return field_index
+
+    @pytest.mark.parametrize(
+        ["filter_", "or_", "ignore_case"],
+        [
+            [{("year", True): ["2020"]}, False, False],
+            [{("year", True): ["20"]}, False, False],
+            [{("year", True): ["^20"]}, False, False],
+            [{("year", True): ["^2020$"]}, False, False],
+            [{("year", False): ["2020"]}, False, False],
+            [{("year", True): ["2015", "2020"]}, True, False],
+            [{("year", True): ["2015", "2020"]}, False, False],
+            [{("year", True): ["20[12]"]}, False, False],
+            [{("tags", True): ["new"]}, False, False],
+            [{("tags", True): ["new, read"]}, False, False],
+            [{("tags", False): ["read"]}, False, False],
+            [{("author", True): ["einstein"]}, False, True],
+            [{("author", True): ["einstein"]}, False, False],
+            [{("author", False): ["Einstein"]}, False, False],
+            [{("note", True): ["^line$"]}, False, False],
+            [{("ENTRYTYPE", True): ["article"], ("year", True): ["^19"]}, False, False],
+            [{("ENTRYTYPE", True): ["book"], ("year", True): ["^19"]}, True, False],
+            [{("label", True): ["^[ab]$"]}, False, False],
+            [{("year", True): ["2015..2020"]}, False, False],
+            [{("year", True): ["..2010"]}, False, False],
+            [{("year", True): ["2016.."]}, False, False],
+            [{("year", False): ["..2015"]}, False, False],
+            [{("author", True): ["0.."]}, False, False],
+            [{("year", True): ["2015..2015", "1900..1910"]}, True, False],
+            [{("year", True): [".."]}, False, False],
+            [{}, False, False],
+            [{}, True, False],
+        ],
+    )
+    def test_filter(
+        self,
+        index: FieldIndex,
+        filter_: Dict[Tuple[str, bool], List[str]],
+        or_: bool,
+        ignore_case: bool,
+    ) -> None:
+        """Test that `FieldIndex.filter` is equivalent to `Entry.matches`.
+
+        Args:
+            index: the local index fixture.
+            filter_: the filter.
+            or_: whether to combine the filter with logical ORs.
+            ignore_case: whether to match case-insensitively.
+        """
+        expected = {
+            label for label, entry in ENTRIES.items() if entry.matches(filter_, or_, ignore_case)
+        }
+        assert index.filter(filter_, or_, ignore_case) == expected
+
+    def test_add_and_remove(self, index: FieldIndex) -> None:
+        """Test updating the index.
+
+        Args:
+            index: the local index fixture.
+        """
+        index.add("b", Entry("b", {"ENTRYTYPE": "book", "year": 2021}))
+        assert index.match("year", "^2021$") == {"b"}
+        assert index.match("year", "2020") == {"d"}
+        assert index.match("tags", "new") == {"a"}
+        # the sorted values get updated, too
+        assert index.match("year", "^202") == {"b", "d"}
+        index.remove("d")
+        assert index.match("year", "^202") == {"b"}
+        assert index.labels() == {"a", "b", "c"}
+
+    @pytest.mark.parametrize(
+        ["pattern", "expected"],
+        [
+            ["2015..2020", (2015, 2020)],
+            ["..2010", (-math.inf, 2010)],
+            ["1.5..", (1.5, math.inf)],
+            ["-3..-1", (-3, -1)],
+            ["..", None],
+            ["2015", None],
+            ["20..20..", None],
+        ],
+    )
+    def test_parse_range(self, pattern: str, expected: Optional[Tuple[float, float]]) -> None:
+        """Test the parsing of range filters.
+
+        Args:
+            pattern: the filter pattern.
+            expected: the expected bounds.
+        """
+        assert parse_range(pattern) == expected
+
+    def test_range_updates(self, index: FieldIndex) -> None:
+        """Test that the sorted numeric values get updated incrementally.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.match("year", "2016..") == {"b", "d"}
+        index.add("e", Entry("e", {"year": 2018}))
+        index.add("b", Entry("b", {"year": "unknown"}))
+        index.remove("d")
+        assert index.match("year", "2016..") == {"e"}
+        assert index.match("year", "..2016") == {"a", "c"}
+
+    @pytest.mark.parametrize(
+        ["keys", "reverse", "expected"],
+        [
+            [[("year", False)], False, ["c", "a", "b", "d"]],
+            [[("year", True)], False, ["b", "d", "a", "c"]],
+            [[("year", False)], True, ["b", "d", "a", "c"]],
+            [[("ENTRYTYPE", False), ("year", True)], False, ["a", "c", "b", "d"]],
+            [[("author", False)], False, ["a", "b", "d", "c"]],
+            [[("label", True)], False, ["d", "c", "b", "a"]],
+            [[], False, ["a", "b", "c", "d"]],
+        ],
+    )
+    def test_sort(
+        self, index: FieldIndex, keys: List[Tuple[str, bool]], reverse: bool, expected: List[str]
+    ) -> None:
+        """Test sorting the indexed entries.
+
+        Args:
+            index: the local index fixture.
+            keys: the fields by which to sort.
+            reverse: whether to reverse the entire order.
+            expected: the expected order of labels.
+        """
+        assert index.sort(ENTRIES.keys(), keys, reverse=reverse) == expected
+        assert index.sort(ENTRIES.keys(), keys, reverse=reverse, limit=2) == expected[:2]
+
+    @pytest.mark.parametrize(
+        ["values", "expected"],
+        [
+            [["10", "9", "-1.5", "", "b", "A"], ["", "-1.5", "9", "10", "A", "b"]],
+            [["Knuth", "einstein", "Goossens"], ["einstein", "Goossens", "Knuth"]],
+        ],
+    )
+    def test_sort_key(self, values: List[str], expected: List[str]) -> None:
+        """Test that numeric values are sorted numerically and strings case-insensitively.
+
+        Args:
+            values: the stringified field values.
+            expected: the expected order.
+        """
+        assert sorted(values, key=sort_key) == expected
+
+    def test_sort_updates(self, index: FieldIndex) -> None:
+        """Test that the cached ranks get updated when the distinct values change.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.sort(ENTRIES.keys(), [("year", False)]) == ["c", "a", "b", "d"]
+        index.add("e", Entry("e", {"year": 1999}))
+        index.add("b", Entry("b", {"year": 2015}))
+        assert index.sort(["a", "b", "c", "d", "e"], [("year", False)]) == ["c", "e", "a", "b", "d"]
+        index.remove("c")
+        assert index.sort(["a", "b", "d", "e"], [("year", True)]) == ["d", "a", "b", "e"]
+
+    def test_sort_incremental(self, index: FieldIndex) -> None:
+        """Test that new distinct values get ranked without recomputing the cached sort keys.
+
+        Args:
+            index: the local index fixture.
+        """
+        # pylint: disable=protected-access
+        keys = [("year", False)]
+        assert index.sort(ENTRIES.keys(), keys) == ["c", "a", "b", "d"]
+        ranks, sort_keys = index._ranks["year"], index._sort_keys[tuple(keys)]
+        labels = list(ENTRIES.keys())
+        for idx in range(3):
+            label = f"e{idx}"
+            index.add(label, Entry(label, {"year": 2010 + idx}))
+            labels.append(label)
+        index.add("f", Entry("f", {"year": 2050}))
+        index.add("g", Entry("g", {"year": 1800}))
+        labels += ["f", "g"]
+        assert index.sort(labels, keys) == ["g", "c", "e0", "e1", "e2", "a", "b", "d", "f"]
+        index.remove("e1")
+        labels.remove("e1")
+        index.add("e3", Entry("e3", {"year": 2011}))
+        labels.append("e3")
+        assert index.sort(labels, keys) == ["g", "c", "e0", "e3", "e2", "a", "b", "d", "f"]
+        assert index._ranks["year"] is ranks
+        assert index._sort_keys[tuple(keys)] is sort_keys
+
+    def test_sort_precision(self, index: FieldIndex) -> None:
+        """Test that the values get ranked anew once the precision of their ranks is exhausted.
+
+        Args:
+            index: the local index fixture.
+        """
+        keys = [("note", True)]
+        index.add("e", Entry("e", {"note": "a"}))
+        labels = [*ENTRIES.keys(), "e"]
+        index.sort(labels, keys)
+        # every value gets ranked in between "a" and the previously added one
+        for idx in range(100, 0, -1):
+            label = f"e{idx}"
+            index.add(label, Entry(label, {"note": "a" + "-" * idx}))
+            labels.append(label)
+        expected = ["d"] + [f"e{idx}" for idx in range(100, 0, -1)] + ["e", "a", "b", "c"]
+        assert index.sort(labels, keys) == expected
+
+    def test_sort_missing(self, index: FieldIndex) -> None:
+        """Test that missing and empty values are sorted equally.
+
+        Args:
+            index: the local index fixture.
+        """
+        index.add("e", Entry("e", {"year": ""}))
+        index.add("f", Entry("f", {}))
+        assert index.sort(["e", "f", "a"], [("year", False)]) == ["e", "f", "a"]
+        assert index.sort(["f", "e", "a"], [("year", False)]) == ["f", "e", "a"]
+
+    def test_separator_change(self, index: FieldIndex) -> None:
+        """Test that the index becomes invalid when the list separators change.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.built
+        config.database.stringify.list_separator.tags = "; "
+        assert not index.built
+
+    def test_database_maintains_index(self) -> None:
+        """Test that `Database.update`, `Database.pop` and `Database.rename` maintain the index."""
+        bib = Database()
+        bib.read()
+        assert bib.field_index.match("year", "^1905$") == {"einstein"}
+
+        entry = bib["latexcompanion"]
+        entry.data["year"] = 1905
+        bib.update({"latexcompanion": entry})
+        assert bib.field_index.match("year", "^1905$") == {"einstein", "latexcompanion"}
+
+        einstein = bib["einstein"]
+        einstein.label = "albert"
+        bib.update({"albert": einstein})
+        bib.rename("einstein", "albert")
+        assert bib.field_index.match("year", "^1905$") == {"albert", "latexcompanion"}
+
+        bib.pop("latexcompanion")
+        assert bib.field_index.match("year", "^1905$") == {"albert"}
+
+        bib.read()
+        assert bib.field_index.match("year", "^1905$") == {"einstein"}
@@ -0,0 +1,129 @@
+"""Tests for coBib's compiled filters."""
+
+import re
+from typing import Dict, List, Tuple
+
+import pytest
+
+from cobib.database import Entry
+from cobib.database.field_index import in_range, parse_range
+from cobib.database.filter_plan import FilterClause, FilterPlan
+
+ENTRIES = [
+    Entry("a", {"ENTRYTYPE": "article", "year": 2015, "tags": ["new", "read"]}),
+    Entry("b", {"ENTRYTYPE": "book", "year": 2020, "tags": ["new"]}),
+    Entry("c", {"ENTRYTYPE": "article", "year": 1905, "author": "A. Einstein"}),
+]
+
+
+def _reference(
+    entry: Entry, filter_: Dict[Tuple[str, bool], List[str]], or_: bool, ignore_case: bool
+) -> bool:
+    """Evaluates every item of a filter without compiling it.
+
+    Args:
+        entry: the entry to check.
+        filter_: the filter.
+        or_: whether to combine the filter with logical ORs.
+        ignore_case: whether to match case-insensitively.
+
+    Returns:
+        Whether the entry matches.
+    """
+    values = entry.stringify()
+    match_list = []
+    for (field, positive), patterns in filter_.items():
+        if field not in values:
+            match_list.append(not positive)
+            continue
+        for pattern in patterns:
+            bounds = parse_range(pattern)
+            if bounds is not None:
+                matched = in_range(values[field], bounds)
+            else:
+                flags = re.IGNORECASE if ignore_case else 0
+                matched = re.search(pattern, values[field], flags=flags) is not None
+            match_list.append(matched if positive else not matched)
+    return any(match_list) if or_ else all(match_list)
+
+
+class TestFilterPlan:
+    """Tests for coBib's compiled filters."""
+
+    @pytest.mark.parametrize(
+        ["filter_", "or_", "ignore_case"],
+        [
+            [{("year", True): ["2020"]}, False, False],
+            [{("year", False): ["2020"]}, False, False],
+            [{("year", True): ["2015", "2020"]}, True, False],
+            [{("year", True): ["2015", "2020"]}, False, False],
+            [{("tags", True): ["^new"]}, False, False],
+            [{("author", True): ["einstein"]}, False, True],
+            [{("author", True): ["einstein"]}, True, False],
+            [{("author", False): ["Einstein"]}, False, False],
+            [{("author", False): []}, False, False],
+            [{("author", True): []}, True, False],
+            [{("ENTRYTYPE", True): ["article"], ("year", True): ["..1950"]}, False, False],
+            [{("ENTRYTYPE", True): ["book"], ("year", True): ["1900.."]}, True, False],
+            [{}, False, False],
+            [{}, True, False],
+        ],
+    )
+    def test_evaluate(
+        self, filter_: Dict[Tuple[str, bool], List[str]], or_: bool, ignore_case: bool
+    ) -> None:
+        """Test that a compiled plan is equivalent to evaluating every filter item.
+
+        Args:
+            filter_: the filter.
+            or_: whether to combine the filter with logical ORs.
+            ignore_case: whether to match case-insensitively.
+        """
+        plan = FilterPlan(filter_, or_, ignore_case)
+        for entry in ENTRIES:
+            expected = _reference(entry, filter_, or_, ignore_case)
+            assert plan.matches(entry) == expected
+            assert entry.matches(filter_, or_, ignore_case) == expected
+
+    def test_compile(self) -> None:
+        """Test the compilation of a filter."""
+        plan = FilterPlan(
+            {("year", True): ["2015..", "^20"], ("tags", False): ["new"]}, False, True
+        )
+        assert plan.fields == ("year", "tags")
+        year_range, year_regex = plan.clauses[("year", True)]
+        assert year_range.bounds == (2015, float("inf"))
+        assert year_range.regex is None
+        assert year_regex.bounds is None
+        assert year_regex.regex == re.compile("^20", flags=re.IGNORECASE)
+
+    @pytest.mark.parametrize(
+        ["or_", "expected"],
+        [
+            [False, False],
+            [True, True],
+        ],
+    )
+    def test_short_circuit(
+        self, or_: bool, expected: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the evaluation stops once its outcome is known.
+
+        Args:
+            or_: whether to combine the filter with logical ORs.
+            expected: whether the entry is expected to match.
+            monkeypatch: the built-in pytest fixture.
+        """
+        searched: List[str] = []
+        search = FilterClause.search
+
+        def _search(clause: FilterClause, value: str) -> bool:
+            searched.append(clause.pattern)
+            return search(clause, value)
+
+        monkeypatch.setattr(FilterClause, "search", _search)
+        # the first clause fails for AND and succeeds for OR
+        pattern = "book" if not or_ else "article"
+        plan = FilterPlan({("ENTRYTYPE", True): [pattern], ("year", True): ["2015"]}, or_)
+        assert plan.matches(ENTRIES[0]) is expected
+        assert searched == [pattern]
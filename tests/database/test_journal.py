@@ -0,0 +1,134 @@
+"""Tests for coBib's database journal."""
+
+import os
+import tempfile
+from pathlib import Path
+from shutil import copyfile
+from typing import Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.journal import Journal, Mutation
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+DUMMY_ENTRY = Entry(
+    "dummy",
+    {
+        "ENTRYTYPE": "misc",
+        "author": "D. Dummy",
+        "title": "Something dumb",
+    },
+)
+
+
+class TestJournal:
+    """Tests for coBib's database journal."""
+
+    @pytest.fixture
+    def file(self) -> Generator[Path, None, None]:
+        """Setup a temporary database file with an enabled journal.
+
+        Yields:
+            The path to the database file.
+        """
+        path = TMPDIR / "cobib_test_journal_database.yaml"
+        config.load(get_resource("debug.py"))
+        copyfile(EXAMPLE_LITERATURE, path)
+        config.database.file = str(path)
+        config.database.journal = True
+        Database().read()
+        yield path
+        Journal(path).remove()
+        os.remove(path)
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    @staticmethod
+    def _mutate() -> None:
+        """Applies some mutations to the database and saves them after each one."""
+        bib = Database()
+        entry = bib["einstein"]
+        entry.data["tags"] = ["first"]
+        bib.update({"einstein": entry})
+        bib.save()
+        entry.data["tags"] = ["second"]
+        bib.update({"einstein": entry})
+        bib.save()
+        bib.pop("knuthwebsite")
+        bib.save()
+        bib.update({"dummy": DUMMY_ENTRY})
+        bib.save()
+
+    def test_append_and_read(self) -> None:
+        """Test appending to and reading from a journal."""
+        journal = Journal(TMPDIR / "cobib_test_journal.yaml")
+        try:
+            mutations = [Mutation("a", "b", "b:\n  ENTRYTYPE: misc\n"), Mutation("c", None, None)]
+            journal.append(mutations[:1])
+            journal.append(mutations[1:])
+            assert journal.exists()
+            assert journal.read() == mutations
+        finally:
+            journal.remove()
+        assert not journal.exists()
+
+    def test_truncated_line(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a truncated line of the journal gets ignored.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        journal = Journal(TMPDIR / "cobib_test_journal.yaml")
+        try:
+            journal.append([Mutation("c", None, None)])
+            with open(journal.path, "a", encoding="utf-8") as stream:
+                stream.write('{"label": "a", "ne')
+            assert journal.read() == [Mutation("c", None, None)]
+            assert "Ignoring the corrupted line 2" in caplog.text
+        finally:
+            journal.remove()
+
+    def test_save_journals(self, file: Path) -> None:
+        """Test that saving only appends to the journal until it gets compacted.
+
+        Args:
+            file: the local file fixture.
+        """
+        self._mutate()
+
+        with open(file, "r", encoding="utf-8") as database:
+            with open(EXAMPLE_LITERATURE, "r", encoding="utf-8") as expected:
+                assert database.read() == expected.read()
+        assert len(Journal(file).read()) == 4
+
+        Database.compact()
+        assert not Journal(file).exists()
+
+        Database().read()
+        assert list(Database().keys()) == ["einstein", "latexcompanion", "dummy"]
+        assert Database()["einstein"].tags == ["second"]
+
+    def test_replay(self, file: Path) -> None:
+        """Test that a journal which was not compacted gets replayed upon reading.
+
+        Args:
+            file: the local file fixture.
+        """
+        self._mutate()
+        # this discards the runtime state, just like a crashed process would
+        Database().read()
+
+        assert not Journal(file).exists()
+        assert list(Database().keys()) == ["einstein", "latexcompanion", "dummy"]
+        assert Database()["einstein"].tags == ["second"]
+        assert Database()["dummy"] == DUMMY_ENTRY
+
+        with open(file, "r", encoding="utf-8") as database:
+            assert "dummy:" in database.read()
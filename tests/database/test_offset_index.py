@@ -0,0 +1,156 @@
+"""Tests for coBib's database OffsetIndex."""
+
+import os
+import tempfile
+from pathlib import Path
+from shutil import copyfile
+from typing import Generator
+
+import pytest
+
+from cobib.database.offset_index import OffsetIndex
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+DUMMY_ENTRY_YAML = """---
+dummy:
+  ENTRYTYPE: misc
+...
+"""
+
+
+class TestOffsetIndex:
+    """Tests for coBib's database OffsetIndex."""
+
+    @pytest.fixture
+    def database(self) -> Generator[Path, None, None]:
+        """Setup a temporary copy of the example database.
+
+        Yields:
+            The path to the temporary database file.
+        """
+        file = TMPDIR / "cobib_test_offset_index.yaml"
+        copyfile(EXAMPLE_LITERATURE, file)
+        yield file
+        os.remove(file)
+
+    def test_scan(self, database: Path) -> None:
+        """Test scanning the document offsets of a database file.
+
+        Args:
+            database: the local database fixture.
+        """
+        index = OffsetIndex.scan(database)
+        assert list(index.documents.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+        raw = database.read_bytes()
+        for label, (start, end) in index.documents.items():
+            document = raw[start:end]
+            assert document.startswith(f"---\n{label}:\n".encode())
+            assert document.endswith(b"...\n")
+
+    def test_scan_duplicate(self, database: Path) -> None:
+        """Test that only the last document of a duplicate label gets indexed.
+
+        Args:
+            database: the local database fixture.
+        """
+        original = database.read_bytes()
+        duplicate = DUMMY_ENTRY_YAML.replace("dummy:", "einstein:")
+        with open(database, "a", encoding="utf-8") as file:
+            file.write(duplicate)
+        index = OffsetIndex.scan(database)
+        assert list(index.documents.keys()) == ["latexcompanion", "knuthwebsite", "einstein"]
+        assert index.documents["einstein"] == (len(original), os.stat(database).st_size)
+
+        # replacing the entry rewrites its last occurrence
+        replacement = duplicate.replace("misc", "book")
+        index.splice({"einstein": ("einstein", replacement)}, [])
+        assert database.read_bytes() == original + replacement.encode()
+        assert index.documents == OffsetIndex.scan(database).documents
+
+    def test_scan_empty_file(self) -> None:
+        """Test scanning an empty database file."""
+        file = TMPDIR / "cobib_test_offset_index_empty.yaml"
+        open(file, "w", encoding="utf-8").close()  # pylint: disable=consider-using-with
+        try:
+            assert len(OffsetIndex.scan(file)) == 0
+        finally:
+            os.remove(file)
+
+    def test_iter_documents(self) -> None:
+        """Test the extraction of labels from documents, including quoted and unterminated ones."""
+        buffer = (
+            b"---\n'1234':\n  year: 2020\n...\n---\n\"a: b\":\n  year: 2021\n...\n"
+            b"---\ntrue:\n  year: 2022\n---\nlast:\n  a: 1\n"
+        )
+        documents = list(OffsetIndex.iter_documents(buffer))
+        assert [doc[0] for doc in documents] == ["1234", "a: b", "True", "last"]
+        assert documents[2][2] == documents[3][1]
+        assert documents[3][2] == len(buffer)
+
+    def test_is_valid(self, database: Path) -> None:
+        """Test that an external modification invalidates the index.
+
+        Args:
+            database: the local database fixture.
+        """
+        index = OffsetIndex.scan(database)
+        assert index.is_valid(database)
+        assert not index.is_valid(TMPDIR / "some_other_file.yaml")
+        with open(database, "a", encoding="utf-8") as file:
+            file.write(DUMMY_ENTRY_YAML)
+        assert not index.is_valid(database)
+
+    def test_splice(self, database: Path) -> None:
+        """Test splicing replaced, removed and appended documents into the database file.
+
+        Args:
+            database: the local database fixture.
+        """
+        original = database.read_bytes()
+        index = OffsetIndex.scan(database)
+        einstein = original[slice(*index.documents["einstein"])].decode()
+        knuth = original[slice(*index.documents["knuthwebsite"])].decode()
+
+        renamed = einstein.replace("einstein:", "albert:").replace("1905", "1906")
+        index.splice(
+            {"einstein": ("albert", renamed), "latexcompanion": None},
+            [("dummy", DUMMY_ENTRY_YAML)],
+        )
+
+        assert database.read_text() == renamed + knuth + DUMMY_ENTRY_YAML
+        assert index.is_valid(database)
+        # the updated offsets must be identical to those of a fresh scan
+        assert index.documents == OffsetIndex.scan(database).documents
+        assert list(index.documents.keys()) == ["albert", "knuthwebsite", "dummy"]
+
+    def test_splice_preserves_mode(self, database: Path) -> None:
+        """Test that splicing preserves the permissions of the database file.
+
+        Args:
+            database: the local database fixture.
+        """
+        os.chmod(database, 0o640)
+        index = OffsetIndex.scan(database)
+        index.splice({}, [("dummy", DUMMY_ENTRY_YAML)])
+        assert os.stat(database).st_mode & 0o777 == 0o640
+
+    def test_splice_mismatch(self, database: Path) -> None:
+        """Test that splicing into a shifted database file fails without touching it.
+
+        Args:
+            database: the local database fixture.
+        """
+        index = OffsetIndex.scan(database)
+        with open(database, "r+", encoding="utf-8") as file:
+            contents = file.read()
+            file.seek(0)
+            file.write("\n" + contents)
+        before = database.read_bytes()
+        with pytest.raises(ValueError):
+            index.splice({"einstein": None}, [])
+        assert database.read_bytes() == before
+        assert not any(path.name.startswith(f".{database.name}.") for path in TMPDIR.iterdir())
@@ -0,0 +1,232 @@
+"""Tests for coBib's ranked search index."""
+
+import os
+import tempfile
+from pathlib import Path
+from shutil import copyfile
+from typing import Any, Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.search_index import SearchIndex
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+ENTRIES = {
+    "a": Entry("a", {"title": "Quantum error correction", "author": "A. Author"}),
+    "b": Entry("b", {"title": "Quantum computing", "abstract": "Quantum quantum quantum."}),
+    "c": Entry("c", {"title": "Classical error correction codes", "note": "see also: quantum"}),
+    "d": Entry("d", {"title": "Something unrelated", "journal": "Quantum"}),
+}
+
+
+class TestSearchIndex:
+    """Tests for coBib's ranked search index."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        yield
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    @pytest.fixture
+    def index(self) -> SearchIndex:
+        """Builds an index of the test entries.
+
+        Returns:
+            The search index.
+        """
+        search_index = SearchIndex()
+        search_index.build(ENTRIES.items())
+        return search_index
+
+    def test_tokenize(self) -> None:
+        """Test the `cobib.database.search_index.SearchIndex.tokenize` method."""
+        assert SearchIndex.tokenize('Zur Elektrodynamik bewegter K{\\"o}rper, A. Einstein') == [
+            "zur",
+            "elektrodynamik",
+            "bewegter",
+            "rper",
+            "einstein",
+        ]
+
+    def test_search(self, index: SearchIndex) -> None:
+        """Test the ranking of the indexed entries.
+
+        Args:
+            index: the local index fixture.
+        """
+        # the non-indexed journal field is ignored
+        assert [label for label, _ in index.search(["quantum"])] == ["b", "a", "c"]
+        assert [label for label, _ in index.search(["error correction"])][:2] == ["a", "c"]
+        assert [label for label, _ in index.search(["quantum", "error"], limit=2)] == ["a", "c"]
+        assert [label for label, _ in index.search(["quantum"], labels={"a", "d"})] == ["a"]
+        assert not index.search(["nothing"])
+        assert not index.search(["a"])
+        scores = [score for _, score in index.search(["quantum error"])]
+        assert scores == sorted(scores, reverse=True)
+        assert all(score > 0 for score in scores)
+
+    def test_add_and_remove(self, index: SearchIndex) -> None:
+        """Test updating the index.
+
+        Args:
+            index: the local index fixture.
+        """
+        index.add("b", Entry("b", {"title": "Classical computing"}))
+        assert [label for label, _ in index.search(["quantum"])] == ["a", "c"]
+        assert [label for label, _ in index.search(["computing"])] == ["b"]
+        index.remove("a")
+        index.remove("unknown")
+        assert [label for label, _ in index.search(["quantum"])] == ["c"]
+        assert len(index) == 3
+        assert "author" not in index._postings  # pylint: disable=protected-access
+        index.clear()
+        assert not index.loaded
+        index.add("a", ENTRIES["a"])
+        assert len(index) == 0
+
+    def test_ranked_fields(self, index: SearchIndex) -> None:
+        """Test the `config.commands.search.ranked_fields` setting.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.loaded
+        config.commands.search.ranked_fields = ["journal"]
+        assert not index.loaded
+        index.build(ENTRIES.items())
+        assert [label for label, _ in index.search(["quantum"])] == ["d"]
+
+    def test_dump_and_load(self, index: SearchIndex) -> None:
+        """Test persisting the index.
+
+        Args:
+            index: the local index fixture.
+        """
+        file = TMPDIR / "cobib_test_search_index.yaml"
+        file.write_text("", encoding="utf-8")
+        try:
+            index.dump(file)
+            assert SearchIndex.path(file).exists()
+            loaded = SearchIndex()
+            assert loaded.load(file)
+            assert loaded.search(["quantum"]) == index.search(["quantum"])
+
+            # a change of the database file invalidates the index
+            file.write_text("---\n", encoding="utf-8")
+            assert not SearchIndex().load(file)
+        finally:
+            os.remove(file)
+            os.remove(SearchIndex.path(file))
+
+    def test_load_unreadable(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that an unreadable index gets ignored.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        file = TMPDIR / "cobib_test_search_index.yaml"
+        SearchIndex.path(file).write_text("garbage", encoding="utf-8")
+        try:
+            search_index = SearchIndex()
+            assert not search_index.load(file)
+            assert not search_index.loaded
+            assert any(
+                message.startswith("Ignoring the unreadable search index")
+                for source, _, message in caplog.record_tuples
+                if source == "cobib.database.search_index"
+            )
+        finally:
+            os.remove(SearchIndex.path(file))
+
+    def test_database_search_index(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the `cobib.database.Database.search_index` gets persisted and kept up-to-date.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        config.database.file = str(TMPDIR / "cobib_test_search_index.yaml")
+        copyfile(EXAMPLE_LITERATURE, config.database.file)
+        path = SearchIndex.path(Path(config.database.file))
+
+        try:
+            bib = Database()
+            bib.read()
+            assert [label for label, _ in bib.search_index.search(["einstein"])] == ["einstein"]
+            assert path.exists()
+
+            bib.update({"dummy": Entry("dummy", {"title": "Einstein's dummy"})})
+            entry = bib["einstein"]
+            entry.label = "albert"
+            bib.update({"albert": entry})
+            bib.rename("einstein", "albert")
+            bib.pop("knuthwebsite")
+            assert {label for label, _ in bib.search_index.search(["einstein"])} == {
+                "albert",
+                "dummy",
+            }
+            assert not bib.search_index.search(["knuth"])
+            bib.save()
+
+            def build(*args: Any, **kwargs: Any) -> None:
+                raise AssertionError("The search index should not have been rebuilt.")
+
+            monkeypatch.setattr(SearchIndex, "build", build)
+            bib.read()
+            assert {label for label, _ in bib.search_index.search(["einstein"])} == {
+                "albert",
+                "dummy",
+            }
+            assert not bib.search_index.search(["knuth"])
+        finally:
+            os.remove(config.database.file)
+            path.unlink(missing_ok=True)
+
+    def test_transaction_rollback(self) -> None:
+        """Test that a failing `cobib.database.Database.transaction` restores the search index."""
+        config.database.file = str(TMPDIR / "cobib_test_search_index.yaml")
+        copyfile(EXAMPLE_LITERATURE, config.database.file)
+        path = SearchIndex.path(Path(config.database.file))
+
+        try:
+            bib = Database()
+            bib.read()
+            assert bib.search_index.search(["einstein"])
+            with pytest.raises(RuntimeError):
+                with Database.transaction():
+                    einstein = bib["einstein"]
+                    einstein.data["title"] = "zzqqxx unique"
+                    bib.update({"einstein": einstein})
+                    assert [label for label, _ in bib.search_index.search(["zzqqxx"])] == [
+                        "einstein"
+                    ]
+                    raise RuntimeError
+            assert not bib.search_index.search(["zzqqxx"])
+
+            # nothing stale gets persisted either
+            bib.update({"dummy": Entry("dummy", {"title": "Something dumb"})})
+            bib.save()
+            bib.read()
+            assert not bib.search_index.search(["zzqqxx"])
+            assert [label for label, _ in bib.search_index.search(["dumb"])] == ["dummy"]
+            assert [label for label, _ in bib.search_index.search(["elektrodynamik"])] == [
+                "einstein"
+            ]
+        finally:
+            os.remove(config.database.file)
+            path.unlink(missing_ok=True)
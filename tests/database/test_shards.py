@@ -0,0 +1,208 @@
+"""Tests for coBib's sharded database layout."""
+
+import tempfile
+from pathlib import Path
+from shutil import rmtree
+from typing import Dict, Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.backends.yaml import YAMLBackend
+from cobib.database.shards import MANIFEST, ORDER, Shards
+from cobib.parsers.yaml import YAMLParser
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+
+class TestShards:
+    """Tests for coBib's sharded database layout."""
+
+    DIRECTORY = TMPDIR / "cobib_test_shards"
+    """Path to the temporary directory of the sharded database."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration pointing to a temporary sharded database.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        config.database.file = str(self.DIRECTORY)
+        yield
+        rmtree(self.DIRECTORY, ignore_errors=True)
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    def _create(self, bucket: str) -> Shards:
+        """Creates a sharded copy of the example database.
+
+        Args:
+            bucket: the bucket of the sharded database.
+
+        Returns:
+            The sharded layout.
+        """
+        shards = Shards.create(self.DIRECTORY, bucket, shards=4)
+        yml = YAMLParser()
+        for entry in YAMLParser().parse(EXAMPLE_LITERATURE).values():
+            with open(shards.shard_of(entry), "a", encoding="utf-8") as file:
+                file.write(entry.save(parser=yml))
+        return shards
+
+    @staticmethod
+    def _origins() -> Dict[str, Path]:
+        """Returns the shard files of all entries as tracked by the storage backend.
+
+        Returns:
+            The dictionary mapping every label to its shard file.
+        """
+        # pylint: disable=protected-access
+        backend = Database._backend
+        assert isinstance(backend, YAMLBackend)
+        return backend.origins
+
+    def test_create(self) -> None:
+        """Test creating a sharded database."""
+        shards = Shards.create(self.DIRECTORY, "hash", shards=32)
+        assert Shards.is_sharded(self.DIRECTORY)
+        assert (self.DIRECTORY / MANIFEST).exists()
+        assert shards.bucket == "hash"
+        assert shards.shards == 32
+        assert not shards.paths()
+
+    def test_invalid_manifest(self) -> None:
+        """Test that an invalid manifest is rejected."""
+        self.DIRECTORY.mkdir()
+        with open(self.DIRECTORY / MANIFEST, "w", encoding="utf-8") as file:
+            file.write("---\nbucket: author\n...\n")
+        with pytest.raises(ValueError):
+            Shards(self.DIRECTORY)
+
+    def test_shard_of(self) -> None:
+        """Test the assignment of entries to shards."""
+        by_year = Shards.create(self.DIRECTORY, "year")
+        assert by_year.shard_of(Entry("a", {"year": 2019})).name == "2019.yaml"
+        assert by_year.shard_of(Entry("a", {"year": "../x"})).name == "unknown.yaml"
+        assert by_year.shard_of(Entry("a", {})).name == "unknown.yaml"
+
+        by_hash = Shards.create(self.DIRECTORY, "hash", shards=16)
+        names = {by_hash.shard_of(Entry(str(idx), {})).name for idx in range(100)}
+        assert names == {f"{idx:x}.yaml" for idx in range(16)}
+        # the assignment must be stable
+        assert by_hash.shard_of(Entry("einstein", {})) == by_hash.shard_of(Entry("einstein", {}))
+
+    @pytest.mark.parametrize("bucket", ["hash", "year"])
+    def test_read(self, bucket: str) -> None:
+        """Test reading a sharded database.
+
+        Args:
+            bucket: the bucket of the sharded database.
+        """
+        shards = self._create(bucket)
+        Database().read()
+        assert set(Database().keys()) == {"einstein", "latexcompanion", "knuthwebsite"}
+        assert self._origins() == {
+            label: shards.shard_of(entry) for label, entry in Database().items()
+        }
+
+    def test_save_changed_shards(self) -> None:
+        """Test that saving a sharded database only rewrites the changed shards."""
+        self._create("year")
+        Database().read()
+        Database.pop_written_files()
+        before = {path: path.read_text() for path in self.DIRECTORY.glob("*.yaml")}
+
+        entry = Database()["einstein"]
+        entry.data["tags"] = ["test"]
+        Database().update({"einstein": entry})
+        Database().save()
+
+        assert Database.pop_written_files() == [self.DIRECTORY / "1905.yaml"]
+        for path, contents in before.items():
+            if path.name != "1905.yaml":
+                assert path.read_text() == contents
+        assert "tags:\n  - test\n" in (self.DIRECTORY / "1905.yaml").read_text()
+        assert not (self.DIRECTORY / ORDER).exists()
+
+    def test_save_moves_entries(self) -> None:
+        """Test that saving a sharded database moves entries between shards."""
+        self._create("year")
+        Database().read()
+
+        entry = Database()["einstein"]
+        entry.data["year"] = 1906
+        Database().update({"einstein": entry})
+        Database().pop("knuthwebsite")
+        Database().update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "year": 1993})})
+        Database().save()
+
+        assert set(Database.pop_written_files()) == {
+            self.DIRECTORY / "1905.yaml",
+            self.DIRECTORY / "1906.yaml",
+            self.DIRECTORY / "1993.yaml",
+            self.DIRECTORY / "unknown.yaml",
+            self.DIRECTORY / ORDER,
+        }
+        assert (self.DIRECTORY / "1905.yaml").read_text() == ""
+        assert (self.DIRECTORY / "unknown.yaml").read_text() == ""
+
+        Database().read()
+        assert set(Database().keys()) == {"einstein", "latexcompanion", "dummy"}
+        assert Database()["einstein"].data["year"] == 1906
+        assert self._origins()["dummy"] == self.DIRECTORY / "1993.yaml"
+
+    def test_save_rename(self) -> None:
+        """Test that renaming an entry in a hash-sharded database moves it to its new shard."""
+        shards = self._create("hash")
+        Database().read()
+
+        entry = Database()["einstein"]
+        entry.label = "albert"
+        Database().update({"albert": entry})
+        Database().rename("einstein", "albert")
+        Database().save()
+
+        Database().read()
+        assert "einstein" not in Database().keys()
+        assert self._origins()["albert"] == shards.shard_of(entry)
+        assert all("einstein:" not in path.read_text() for path in shards.paths())
+
+    def test_order(self) -> None:
+        """Test that a sharded database preserves the order in which the entries were added."""
+        shards = Shards.create(self.DIRECTORY, "hash", shards=16)
+        labels = ["knuthwebsite", "einstein", "latexcompanion"]
+        # the hash buckets order these labels differently
+        assert sorted(labels, key=lambda label: shards.shard_of(Entry(label, {}))) != labels
+        Database().read()
+        for label in labels:
+            Database().update({label: Entry(label, {"ENTRYTYPE": "misc"})})
+        Database().save()
+        Database().read()
+        assert list(Database().keys()) == labels
+        assert list(self._origins().keys()) == labels
+
+        # a renamed entry keeps its position while new entries get appended
+        entry = Database()["einstein"]
+        entry.label = "albert"
+        Database().update({"albert": entry})
+        Database().rename("einstein", "albert")
+        Database().pop("knuthwebsite")
+        Database().update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc"})})
+        Database().save()
+        Database().read()
+        assert list(Database().keys()) == ["albert", "latexcompanion", "dummy"]
+
+        # entries which are missing from the order file follow the listed ones
+        (self.DIRECTORY / ORDER).write_text("dummy\n", encoding="utf-8")
+        Database().read()
+        assert list(Database().keys())[0] == "dummy"
+        assert set(Database().keys()) == {"albert", "latexcompanion", "dummy"}
@@ -0,0 +1,211 @@
+"""Tests for coBib's database Snapshot."""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from shutil import copyfile
+from typing import Any, Dict, Generator
+
+import pytest
+
+from cobib.config import Event, config
+from cobib.database import Database, Entry
+from cobib.database.snapshot import Snapshot
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir())
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+
+class TestSnapshot:
+    """Tests for coBib's database Snapshot."""
+
+    FILE = TMPDIR / "cobib_test_snapshot_database.yaml"
+    """Path to the temporary database file."""
+
+    CACHE = TMPDIR / "cobib_test_snapshot_database.pickle"
+    """Path to the temporary snapshot file."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup a temporary database with an enabled snapshot.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        copyfile(EXAMPLE_LITERATURE, self.FILE)
+        config.database.file = str(self.FILE)
+        config.database.cache = str(self.CACHE)
+        yield
+        for path in (self.FILE, self.CACHE):
+            if path.exists():
+                os.remove(path)
+        config.events.clear()
+        config.database.cache = None
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    def test_roundtrip(self) -> None:
+        """Test dumping and loading a snapshot."""
+        entries = {"dummy": Entry("dummy", {"ENTRYTYPE": "misc", "tags": ["a", "b"]})}
+        Snapshot.dump(self.FILE, entries)
+        assert self.CACHE.exists()
+        assert Snapshot.load(self.FILE) == entries
+
+    def test_missing(self) -> None:
+        """Test loading a non-existent snapshot."""
+        assert Snapshot.load(self.FILE) is None
+
+    def test_outdated(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a snapshot gets ignored after the database file changed.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        Snapshot.dump(self.FILE, {})
+        assert Snapshot.is_current(self.FILE)
+        with open(self.FILE, "a", encoding="utf-8") as file:
+            file.write("\n")
+        assert not Snapshot.is_current(self.FILE)
+        assert Snapshot.load(self.FILE) is None
+        assert (
+            "cobib.database.snapshot",
+            logging.INFO,
+            f"The database snapshot at {self.CACHE} is outdated.",
+        ) in caplog.record_tuples
+
+    def test_config_change(self) -> None:
+        """Test that a snapshot gets ignored after a relevant configuration change."""
+        Snapshot.dump(self.FILE, {})
+        config.database.stringify.list_separator.tags = "; "
+        assert not Snapshot.is_current(self.FILE)
+        assert Snapshot.load(self.FILE) is None
+
+    def test_corrupt(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a corrupt snapshot gets ignored.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        with open(self.CACHE, "wb") as file:
+            file.write(b"garbage")
+        assert Snapshot.load(self.FILE) is None
+        for source, level, message in caplog.record_tuples:
+            if ("cobib.database.snapshot", logging.WARNING) == (source, level) and (
+                "Ignoring the unreadable database snapshot" in message
+            ):
+                break
+        else:
+            pytest.fail("No warning was logged for the unreadable snapshot.")
+
+    def test_database_read(self) -> None:
+        """Test that `Database.read` writes and then uses the snapshot."""
+        Database().read()
+        assert self.CACHE.exists()
+        assert list(Database().keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+
+        # inject a fake entry into the snapshot to ensure it gets used instead of the YAML file
+        entries = dict(Database().items())
+        entries["dummy"] = Entry("dummy", {"ENTRYTYPE": "misc"})
+        Snapshot.dump(self.FILE, entries)
+
+        Database().read()
+        assert list(Database().keys()) == ["einstein", "latexcompanion", "knuthwebsite", "dummy"]
+
+    def test_database_save(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that `Database.save` appends the changes to the snapshot.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        Database().read()
+        size = self.CACHE.stat().st_size
+
+        def dump(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("The snapshot should not have been rewritten.")
+
+        monkeypatch.setattr(Snapshot, "dump", dump)
+        bib = Database()
+        einstein = bib["einstein"]
+        einstein.label = "albert"
+        bib.update({"albert": einstein})
+        bib.rename("einstein", "albert")
+        bib.pop("latexcompanion")
+        bib.update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc"})})
+        bib.save()
+        knuth = bib["knuthwebsite"]
+        knuth.data["tags"] = ["test"]
+        bib.update({"knuthwebsite": knuth})
+        bib.save()
+        assert self.CACHE.stat().st_size > size
+
+        entries = Snapshot.load(self.FILE)
+        assert entries is not None
+        # the renamed entry keeps its position while the new one got appended
+        assert list(entries.keys()) == ["albert", "knuthwebsite", "dummy"]
+        assert entries["knuthwebsite"].tags == ["test"]
+        assert Snapshot.is_current(self.FILE)
+
+    def test_database_save_compaction(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the snapshot gets compacted after too many appended changes.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        monkeypatch.setattr("cobib.database.snapshot._MAX_CHANGES", 2)
+        Database().read()
+        sizes = []
+        for idx in range(3):
+            Database().update({f"dummy{idx}": Entry(f"dummy{idx}", {"ENTRYTYPE": "misc"})})
+            Database().save()
+            sizes.append(self.CACHE.stat().st_size)
+        assert sizes[0] < sizes[1]
+        assert sizes[2] < sizes[1]
+        entries = Snapshot.load(self.FILE)
+        assert entries is not None
+        assert list(entries.keys())[-3:] == ["dummy0", "dummy1", "dummy2"]
+
+    def test_database_save_outdated(self) -> None:
+        """Test that `Database.save` rewrites a snapshot which did not match the database file."""
+        Database().read()
+        # modify the database file behind the back of the snapshot
+        with open(self.FILE, "a", encoding="utf-8") as file:
+            file.write("\n")
+        Database().update({"dummy": Entry("dummy", {"ENTRYTYPE": "misc"})})
+        Database().save()
+
+        entries = Snapshot.load(self.FILE)
+        assert entries is not None
+        assert list(entries.keys()) == ["einstein", "latexcompanion", "knuthwebsite", "dummy"]
+
+    def test_disabled_by_hooks(self) -> None:
+        """Test that the snapshot is bypassed when YAML parsing hooks are registered."""
+
+        @Event.PostYAMLParse.subscribe
+        def hook(bib: Dict[str, Entry]) -> None:  # pylint: disable=unused-argument
+            pass
+
+        assert not Snapshot.enabled()
+        Database().read()
+        assert not self.CACHE.exists()
+
+    def test_disabled_while_linting(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the snapshot is bypassed while the entries are being linted.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        assert Snapshot.enabled()
+        monkeypatch.setattr(Entry, "lint", True)
+        assert not Snapshot.enabled()
+
+    def test_disabled_by_default(self) -> None:
+        """Test that the snapshot is disabled by default."""
+        config.database.cache = None
+        assert not Snapshot.enabled()
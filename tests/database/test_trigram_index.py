@@ -0,0 +1,168 @@
+"""Tests for coBib's fuzzy search index."""
+
+from typing import Any, Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.database import Database, Entry
+from cobib.database.trigram_index import TrigramIndex, trigrams
+
+from .. import get_resource
+
+EXAMPLE_LITERATURE = get_resource("example_literature.yaml")
+
+ENTRIES = {
+    "einstein": Entry("einstein", {"title": "Zur Elektrodynamik", "author": "Albert Einstein"}),
+    "knuth": Entry("knuth", {"title": "Computers and Typesetting", "author": "Donald Knuth"}),
+    "other": Entry("other", {"title": "Einsteins Theorie", "journal": "Knuth Quarterly"}),
+}
+
+
+class TestTrigramIndex:
+    """Tests for coBib's fuzzy search index."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        yield
+        config.database.file = EXAMPLE_LITERATURE
+        Database().read()
+        config.defaults()
+
+    @pytest.fixture
+    def index(self) -> TrigramIndex:
+        """Builds an index of the test entries.
+
+        Returns:
+            The fuzzy search index.
+        """
+        trigram_index = TrigramIndex()
+        trigram_index.build(ENTRIES.items())
+        return trigram_index
+
+    def test_trigrams(self) -> None:
+        """Test the `cobib.database.trigram_index.trigrams` function."""
+        assert trigrams("cat") == {"  c", " ca", "cat", "at "}
+        assert trigrams("aaaa") == {"  a", " aa", "aaa", "aa "}
+
+    def test_similar_words(self, index: TrigramIndex) -> None:
+        """Test the similarity of words.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.similar_words("einstein", 1.0) == {"einstein": 1.0}
+        similar = index.similar_words("einstain", 0.3)
+        assert set(similar) == {"einstein", "einsteins"}
+        assert similar["einstein"] > similar["einsteins"]
+        assert not index.similar_words("xyz", 0.1)
+
+    def test_search(self, index: TrigramIndex) -> None:
+        """Test finding the indexed entries.
+
+        Args:
+            index: the local index fixture.
+        """
+        scores, words = index.search(["Einstain"], 0.3)
+        assert [label for label, _ in scores] == ["einstein", "other"]
+        assert words == {"einstein", "einsteins"}
+        # the label is indexed, too, but the non-indexed journal field is ignored
+        assert [label for label, _ in index.search(["knut"], 0.3)[0]] == ["knuth"]
+        # the similarity is averaged over all query words
+        scores, _ = index.search(["einstein", "elektrodynamik"], 0.3)
+        assert scores[0] == ("einstein", 1.0)
+        assert scores[1][0] == "other"
+        assert scores[1][1] < 0.5
+        assert [label for label, _ in index.search(["einstein", "elektrodynamik"], 0.6)[0]] == [
+            "einstein"
+        ]
+        assert [label for label, _ in index.search(["einstein"], 0.3, labels={"other"})[0]] == [
+            "other"
+        ]
+        assert index.search(["!"], 0.3) == ([], set())
+
+    def test_add_and_remove(self, index: TrigramIndex) -> None:
+        """Test updating the index.
+
+        Args:
+            index: the local index fixture.
+        """
+        index.add("knuth", Entry("knuth", {"title": "Fundamental Algorithms"}))
+        assert not index.search(["typesetting"], 0.5)[0]
+        assert [label for label, _ in index.search(["algorithms"], 0.5)[0]] == ["knuth"]
+        index.remove("other")
+        index.remove("unknown")
+        assert len(index) == 2
+        assert not index.similar_words("einsteins", 1.0)
+        assert "ns " not in index._trigrams  # pylint: disable=protected-access
+        index.clear()
+        assert not index.built
+        index.add("knuth", ENTRIES["knuth"])
+        assert len(index) == 0
+
+    def test_fuzzy_fields(self, index: TrigramIndex) -> None:
+        """Test the `config.commands.search.fuzzy_fields` setting.
+
+        Args:
+            index: the local index fixture.
+        """
+        assert index.built
+        config.commands.search.fuzzy_fields = ["journal"]
+        assert not index.built
+        index.build(ENTRIES.items())
+        assert [label for label, _ in index.search(["knuth"], 0.3)[0]] == ["other"]
+
+    def test_database_trigram_index(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the `cobib.database.Database.trigram_index` is kept up-to-date.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+        bib = Database()
+        bib.read()
+        assert [label for label, _ in bib.trigram_index.search(["Einstien"], 0.3)[0]] == [
+            "einstein"
+        ]
+
+        def build(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("The trigram index should not have been rebuilt.")
+
+        monkeypatch.setattr(TrigramIndex, "build", build)
+        bib.update({"dummy": Entry("dummy", {"title": "Einstein's dummy"})})
+        entry = bib["einstein"]
+        entry.label = "albert"
+        bib.update({"albert": entry})
+        bib.rename("einstein", "albert")
+        bib.pop("knuthwebsite")
+        assert {label for label, _ in bib.trigram_index.search(["Einstien"], 0.3)[0]} == {
+            "albert",
+            "dummy",
+        }
+        assert not bib.trigram_index.search(["knuth"], 0.3)[0]
+
+    def test_transaction_rollback(self) -> None:
+        """Test that a failing `cobib.database.Database.transaction` restores the trigram index."""
+        bib = Database()
+        bib.read()
+        assert bib.trigram_index.search(["einstein"], 0.3)[0]
+        with pytest.raises(RuntimeError):
+            with Database.transaction():
+                einstein = bib["einstein"]
+                einstein.data["title"] = "zzqqxx unique"
+                bib.update({"einstein": einstein})
+                assert [label for label, _ in bib.trigram_index.search(["zzqqxy"], 0.3)[0]] == [
+                    "einstein"
+                ]
+                raise RuntimeError
+        assert not bib.trigram_index.search(["zzqqxy"], 0.3)[0]
+        assert [label for label, _ in bib.trigram_index.search(["elektrodynamik"], 0.3)[0]] == [
+            "einstein"
+        ]
@@ -9,6 +9,8 @@ config.logging.version = None
 root = Path(__file__).parent
 config.database.file = str((root / "example_literature.yaml").resolve())
 
+config.commands.search.text_cache = None
+
 config.utils.file_downloader.url_map[
     r"(.+)://quantum-journal.org/papers/([^/]+)"
 ] = r"\1://quantum-journal.org/papers/\2/pdf/"
@@ -16,6 +16,9 @@ class ParserTest:
     EXAMPLE_YAML_FILE = get_resource("example_entry.yaml")
     """Path to the example YAML file (matching the BibTeX file)."""
 
+    EXAMPLE_LITERATURE_FILE = get_resource("example_literature.yaml")
+    """Path to the example YAML database file."""
+
     EXAMPLE_ENTRY_DICT = {
         "ENTRYTYPE": "article",
         "author": "Yudong Cao and Jonathan Romero and Jonathan P. Olson and Matthias Degroote and "
@@ -1,13 +1,16 @@
 """Tests for coBib's YAMLParser."""
 # pylint: disable=unused-argument
 
+import logging
 import tempfile
-from typing import Dict, Optional, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, cast
 
 import pytest
 
 from cobib.config import Event, config
 from cobib.database import Entry
+from cobib.database.offset_index import OffsetIndex
 from cobib.parsers import YAMLParser
 
 from .parser_test import ParserTest
@@ -59,6 +62,108 @@ class TestYAMLParser(ParserTest):
             "Please check the file manually as this cannot be resolved automatically by coBib.",
         ) in caplog.record_tuples
 
+    @pytest.mark.parametrize("use_c_lib_yaml", [False, True])
+    def test_from_yaml_file_parallel(
+        self,
+        use_c_lib_yaml: bool,
+        monkeypatch: pytest.MonkeyPatch,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        """Test parsing a yaml file in parallel.
+
+        Args:
+            use_c_lib_yaml: the configuration setting.
+            monkeypatch: the built-in pytest fixture.
+            caplog: the built-in pytest fixture.
+        """
+        monkeypatch.setattr("cobib.parsers.yaml._available_cpus", lambda: 2)
+        caplog.set_level(logging.DEBUG, logger="cobib.parsers.yaml")
+        try:
+            config.parsers.yaml.use_c_lib_yaml = use_c_lib_yaml
+            config.parsers.yaml.parallel_threshold = None
+            sequential = YAMLParser().parse(self.EXAMPLE_LITERATURE_FILE)
+            config.parsers.yaml.parallel_threshold = 1
+            parallel = YAMLParser().parse(self.EXAMPLE_LITERATURE_FILE)
+            assert list(parallel.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+            assert parallel == sequential
+            assert any("speedup" in message for message in caplog.messages)
+        finally:
+            config.defaults()
+
+    def test_parallel_below_threshold(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a yaml file below the configured threshold gets parsed sequentially.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+            caplog: the built-in pytest fixture.
+        """
+        monkeypatch.setattr("cobib.parsers.yaml._available_cpus", lambda: 2)
+        caplog.set_level(logging.DEBUG, logger="cobib.parsers.yaml")
+        config.parsers.yaml.parallel_threshold = 4
+        entries = YAMLParser().parse(self.EXAMPLE_LITERATURE_FILE)
+        assert len(entries) == 3
+        assert not any("speedup" in message for message in caplog.messages)
+
+    def test_parallel_size_check(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a yaml file which is too small to reach the threshold does not get scanned.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+        """
+
+        def iter_ranges(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("The yaml file should not have been scanned.")
+
+        monkeypatch.setattr("cobib.parsers.yaml._available_cpus", lambda: 2)
+        monkeypatch.setattr(OffsetIndex, "iter_ranges", iter_ranges)
+        config.parsers.yaml.parallel_threshold = 1000
+        entries = YAMLParser().parse(self.EXAMPLE_LITERATURE_FILE)
+        assert list(entries.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+
+    def test_parallel_from_thread(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test parsing a yaml file in parallel from outside of the main thread.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+            caplog: the built-in pytest fixture.
+        """
+        monkeypatch.setattr("cobib.parsers.yaml._available_cpus", lambda: 2)
+        caplog.set_level(logging.DEBUG, logger="cobib.parsers.yaml")
+        config.parsers.yaml.parallel_threshold = 1
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            entries = executor.submit(YAMLParser().parse, self.EXAMPLE_LITERATURE_FILE).result()
+        assert list(entries.keys()) == ["einstein", "latexcompanion", "knuthwebsite"]
+        assert any("speedup" in message for message in caplog.messages)
+
+    def test_parallel_duplicate_label(
+        self, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Tests a warning is logged for duplicate labels when parsing in parallel.
+
+        Args:
+            monkeypatch: the built-in pytest fixture.
+            caplog: the built-in pytest fixture.
+        """
+        monkeypatch.setattr("cobib.parsers.yaml._available_cpus", lambda: 2)
+        config.parsers.yaml.parallel_threshold = 1
+        with tempfile.NamedTemporaryFile("w") as file:
+            for _ in range(2):
+                with open(self.EXAMPLE_YAML_FILE, "r", encoding="utf-8") as existing:
+                    file.writelines(existing.readlines())
+            file.flush()
+            entries = YAMLParser().parse(file.name)
+        assert list(entries.keys()) == ["Cao_2019"]
+        assert (
+            "cobib.parsers.yaml",
+            30,
+            "An entry with label 'Cao_2019' was already encountered earlier on in the YAML file! "
+            "Please check the file manually as this cannot be resolved automatically by coBib.",
+        ) in caplog.record_tuples
+
     def test_raise_missing_file(self) -> None:
         """Test assertion is raised for missing file."""
         with pytest.raises(FileNotFoundError):
@@ -0,0 +1,110 @@
+"""Tests for coBib's batched search of associated files."""
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.utils import grep
+
+TMPDIR = Path(tempfile.gettempdir()).resolve()
+
+
+class TestGrep:
+    """Tests for coBib's batched search of associated files."""
+
+    PATHS = [TMPDIR / "cobib_test_grep_1.txt", TMPDIR / "cobib_test_grep_2.txt"]
+    """Paths to the temporary associated files."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration and some associated files.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(Path(__file__).parent.parent / "debug.py")
+        self.PATHS[0].write_text("one\ntwo\nthree\nfour\nfive\nsix\nseven\n", encoding="utf-8")
+        self.PATHS[1].write_text("the first line\nthe second line\n", encoding="utf-8")
+        yield
+        for path in self.PATHS:
+            path.unlink()
+        config.defaults()
+
+    def test_output_format(self) -> None:
+        """Test the `cobib.utils.grep.output_format` method."""
+        assert grep.output_format("grep") == "null"
+        assert grep.output_format("cat") is None
+        assert grep.output_format("cobib_non_existent_grep") is None
+
+    def test_grep_files(self) -> None:
+        """Test the `cobib.utils.grep.grep_files` method."""
+        paths = self.PATHS
+        matches = grep.grep_files(paths, ["t", "second"], context=0, jobs=2)
+        assert matches == {
+            "t": {
+                paths[0]: [["two", "three"]],
+                paths[1]: [["the first line", "the second line"]],
+            },
+            "second": {
+                paths[1]: [["the second line"]],
+            },
+        }
+
+    def test_grep_files_context(self) -> None:
+        """Test that the context lines are grouped like the output of a separate search."""
+        paths = self.PATHS
+        matches = grep.grep_files(paths, ["one", "five"], context=1)
+        assert matches is not None
+        assert matches["one"] == {paths[0]: [["one", "two"]]}
+        assert matches["five"] == {paths[0]: [["four", "five", "six"]]}
+        matches = grep.grep_files(paths, ["o"], context=0)
+        assert matches is not None
+        assert matches["o"] == {
+            paths[0]: [["one", "two"], ["four"]],
+            paths[1]: [["the second line"]],
+        }
+
+    def test_grep_files_fallback(self) -> None:
+        """Test that unsupported or failing search tools fall back to separate searches."""
+        config.commands.search.grep = "cat"
+        assert grep.grep_files(self.PATHS, ["one"], context=0) is None
+        config.commands.search.grep = "grep"
+        config.commands.search.grep_args = ["--cobib-non-existent-option"]
+        assert grep.grep_files(self.PATHS, ["one"], context=0) is None
+
+    def test_parse_json(self) -> None:
+        """Test the parsing of the JSON output of ripgrep."""
+
+        def message(kind: str, path: str, line_number: int, text: str) -> str:
+            data = {
+                "path": {"text": path},
+                "lines": {"text": text + "\n"},
+                "line_number": line_number,
+            }
+            return json.dumps({"type": kind, "data": data})
+
+        stdout = "\n".join(
+            [
+                json.dumps({"type": "begin", "data": {"path": {"text": "a.txt"}}}),
+                message("match", "a.txt", 1, "one"),
+                message("context", "a.txt", 2, "two"),
+                message("context", "a.txt", 4, "four"),
+                message("match", "a.txt", 5, "five"),
+                json.dumps({"type": "end", "data": {"path": {"text": "a.txt"}}}),
+                message("match", "b.txt", 6, "six"),
+                json.dumps({"type": "summary", "data": {}}),
+            ]
+        ).encode("utf-8")
+        assert grep._parse_json(stdout) == {
+            Path("a.txt"): [["one", "two"], ["four", "five"]],
+            Path("b.txt"): [["six"]],
+        }
@@ -384,3 +384,27 @@ class TestUnifyLabels(ShellHelperTest):
         finally:
             rmtree(cobib_test_dir)
             Database().clear()
+
+
+def test_convert_database() -> None:
+    """Test the `cobib.utils.shell_helper.convert_database` method."""
+    tmp_dir = Path(tempfile.gettempdir())
+    sqlite_file = tmp_dir / "cobib_convert_test.db"
+    yaml_file = tmp_dir / "cobib_convert_test.yaml"
+    source = get_resource("example_literature.yaml")
+
+    try:
+        assert shell_helper.convert_database(str(sqlite_file), "--source", source) == [
+            f"Converted 3 entries from the yaml database at {source} to the sqlite database at "
+            f"{sqlite_file}."
+        ]
+        shell_helper.convert_database(str(yaml_file), "--source", str(sqlite_file))
+        with open(yaml_file, "rb") as file, open(source, "rb") as expected:
+            assert file.read() == expected.read()
+
+        assert shell_helper.convert_database(str(yaml_file), "--source", str(yaml_file)) == [
+            "The source and target of the conversion must be different."
+        ]
+    finally:
+        sqlite_file.unlink(missing_ok=True)
+        yaml_file.unlink(missing_ok=True)
@@ -0,0 +1,148 @@
+"""Tests for coBib's text cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from cobib.config import config
+from cobib.utils.text_cache import TextCache
+
+from .. import get_resource
+
+TMPDIR = Path(tempfile.gettempdir()).resolve()
+
+
+class TestTextCache:
+    """Tests for coBib's text cache."""
+
+    DIRECTORY = TMPDIR / "cobib_test_text_cache"
+    """Path to the temporary cache directory."""
+
+    PATH = TMPDIR / "cobib_test_text_cache_file.txt"
+    """Path to the temporary associated file."""
+
+    @pytest.fixture(autouse=True)
+    def setup(self) -> Generator[None, None, None]:
+        """Setup debugging configuration and an associated file.
+
+        This fixture is automatically enabled for all tests in this class.
+
+        Yields:
+            Access to the local fixture variables.
+        """
+        config.load(get_resource("debug.py"))
+        config.commands.search.text_cache = str(self.DIRECTORY)
+        config.commands.search.text_extractors[".txt"] = ["cat", "{}"]
+        self.PATH.write_text("first line\nsecond line\n", encoding="utf-8")
+        yield
+        self.PATH.unlink()
+        TextCache(self.DIRECTORY).clear()
+        config.defaults()
+
+    def test_from_config(self) -> None:
+        """Test the `cobib.utils.text_cache.TextCache.from_config` method."""
+        text_cache = TextCache.from_config()
+        assert text_cache is not None
+        assert text_cache.directory == self.DIRECTORY
+        config.commands.search.text_cache = None
+        assert TextCache.from_config() is None
+
+    def test_get(self) -> None:
+        """Test that the text gets extracted only once."""
+        text_cache = TextCache(self.DIRECTORY)
+        cached = text_cache.get(self.PATH)
+        assert cached is not None
+        assert cached.read_text(encoding="utf-8") == "first line\nsecond line\n"
+        mtime = os.stat(cached).st_mtime_ns
+        assert text_cache.get(self.PATH) == cached
+        assert os.stat(cached).st_mtime_ns == mtime
+
+    def test_get_without_extractor(self) -> None:
+        """Test that files without a text extractor are not cached."""
+        del config.commands.search.text_extractors[".txt"]
+        text_cache = TextCache(self.DIRECTORY)
+        assert text_cache.get(self.PATH) == self.PATH
+        assert not text_cache.directory.exists()
+
+    def test_get_stale(self) -> None:
+        """Test that a stale text gets invalidated."""
+        text_cache = TextCache(self.DIRECTORY)
+        stale = text_cache.get(self.PATH)
+        self.PATH.write_text("changed line\n", encoding="utf-8")
+        cached = text_cache.get(self.PATH)
+        assert cached is not None
+        assert cached != stale
+        assert cached.read_text(encoding="utf-8") == "changed line\n"
+        assert list(text_cache.directory.iterdir()) == [cached]
+
+    def test_get_with_extractor(self) -> None:
+        """Test the `config.commands.search.text_extractors` setting."""
+        config.commands.search.text_extractors[".txt"] = [
+            sys.executable,
+            "-c",
+            "import sys; print(open(sys.argv[1]).read().upper(), end='')",
+            "{}",
+        ]
+        cached = TextCache(self.DIRECTORY).get(self.PATH)
+        assert cached is not None
+        assert cached.read_text(encoding="utf-8") == "FIRST LINE\nSECOND LINE\n"
+
+    def test_get_with_failing_extractor(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a failing text extractor gets logged.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        config.commands.search.text_extractors[".txt"] = ["false", "{}"]
+        assert TextCache(self.DIRECTORY).get(self.PATH) is None
+        assert (
+            "cobib.utils.text_cache",
+            30,
+            f"Could not extract the text of {self.PATH}: "
+            "Command '['false', '" + str(self.PATH) + "']' returned non-zero exit status 1.",
+        ) in caplog.record_tuples
+
+    def test_get_with_missing_extractor(self, caplog: pytest.LogCaptureFixture) -> None:
+        """Test that a missing text extractor is only reported once and not as a warning.
+
+        Args:
+            caplog: the built-in pytest fixture.
+        """
+        config.commands.search.text_extractors[".txt"] = ["cobib_non_existent_extractor", "{}"]
+        TextCache.available.cache_clear()
+        text_cache = TextCache(self.DIRECTORY)
+        assert text_cache.get(self.PATH) is None
+        assert text_cache.get(self.PATH) is None
+        messages = [
+            (level, message)
+            for source, level, message in caplog.record_tuples
+            if source == "cobib.utils.text_cache"
+        ]
+        assert messages == [
+            (
+                10,
+                "The text extractor cobib_non_existent_extractor is not installed. Searching the "
+                "files directly.",
+            )
+        ]
+
+    def test_rebuild(self) -> None:
+        """Test the `cobib.utils.text_cache.TextCache.rebuild` method."""
+        text_cache = TextCache(self.DIRECTORY)
+        cached = text_cache.get(self.PATH)
+        assert cached is not None
+        orphan = text_cache.directory / "orphan.txt"
+        orphan.write_text("orphan", encoding="utf-8")
+
+        assert text_cache.rebuild([self.PATH]) == [cached]
+        assert orphan.exists()
+
+        assert text_cache.rebuild([self.PATH], prune=True) == [cached]
+        assert not orphan.exists()
+        assert cached.exists()